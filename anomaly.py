@@ -0,0 +1,121 @@
+"""Streaming anomaly detection over telemetry channels."""
+from collections import namedtuple
+
+import numpy as np
+
+from startup import lazy_import
+
+Anomaly = namedtuple("Anomaly", ["channel", "severity", "value", "zscore"])
+
+# Detector level -> overall system status
+STATUS_LEVELS = ("Nominal", "Warning", "Critical")
+
+
+class StreamingAnomalyDetector:
+    """Rolling z-scores for several channels, updated incrementally.
+
+    Each channel keeps an exponentially weighted mean and variance (O(1) state
+    per channel). A block of samples is scored in one vectorized pass: both
+    recursions run as first-order IIR filters over the block, each sample
+    scored against the statistics before it. Samples far outside the current
+    band are clipped before they update the statistics, so a fault does not
+    quickly become the new normal.
+
+    Blocks longer than the half-life are scored in half-life sized chunks, so
+    the clipping band and the alarm states never lag far behind the data.
+
+    A channel escalates as soon as a sample crosses warning_z or critical_z,
+    and returns to normal only after `hold` consecutive samples within
+    clear_z, so a noisy channel does not flap between states.
+    """
+
+    def __init__(self, channels, halflife=60, warning_z=4.0, critical_z=6.0, clear_z=3.0,
+                 hold=10, warmup=30, min_std=None):
+        self.channels = list(channels)
+        self.halflife = halflife
+        self.alpha = 1 - 0.5 ** (1 / halflife)
+        self.warning_z = warning_z
+        self.critical_z = critical_z
+        self.clear_z = clear_z
+        self.hold = hold
+        self.warmup = warmup
+        count = len(self.channels)
+        self.min_var = np.square(np.full(count, 1e-9) if min_std is None else np.asarray(min_std, dtype=np.float64))
+        self.mean = np.zeros(count)
+        self.var = np.zeros(count)
+        self.samples = np.zeros(count, dtype=np.int64)
+        self.levels = np.zeros(count, dtype=np.int8)
+        self.calm = np.zeros(count, dtype=np.int64)
+
+    @property
+    def status(self):
+        """Overall status: Nominal, Warning or Critical."""
+        return STATUS_LEVELS[self.levels.max(initial=0)]
+
+    def update(self, values):
+        """Score a (samples, channels) block of readings and return new Anomaly events."""
+        values = np.atleast_2d(np.asarray(values, dtype=np.float64))
+        return self._update(values, np.arange(len(self.channels)))
+
+    def update_channel(self, channel, values):
+        """Score a sequence of readings from one channel and return new Anomaly events."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, 1)
+        return self._update(values, np.array([self.channels.index(channel)]))
+
+    def _update(self, x, columns):
+        events = []
+        for start in range(0, len(x), self.halflife):
+            events.extend(self._update_chunk(x[start:start + self.halflife], columns))
+        return events
+
+    def _update_chunk(self, x, columns):
+        signal = lazy_import("scipy.signal")
+        a = self.alpha
+        fresh = self.samples[columns] == 0
+        mean0 = np.where(fresh, x[0], self.mean[columns])
+        var0 = self.var[columns]
+        std0 = np.sqrt(np.maximum(var0, self.min_var[columns]))
+        warm = self.samples[columns] >= self.warmup
+        # Winsorize against the statistics at the start of the block
+        limit = np.where(warm, self.critical_z * std0, np.inf)
+        clipped = np.clip(x, mean0 - limit, mean0 + limit)
+
+        # mean[t] = (1 - a) * mean[t-1] + a * x[t]
+        mean, _ = signal.lfilter([a], [1, a - 1], clipped, axis=0, zi=((1 - a) * mean0)[np.newaxis])
+        previous_mean = np.vstack([mean0[np.newaxis], mean[:-1]])
+        # var[t] = (1 - a) * (var[t-1] + a * (x[t] - mean[t-1]) ** 2)
+        deviation = clipped - previous_mean
+        var, _ = signal.lfilter([a * (1 - a)], [1, a - 1], deviation ** 2, axis=0, zi=((1 - a) * var0)[np.newaxis])
+        previous_var = np.vstack([var0[np.newaxis], var[:-1]])
+
+        z = (x - previous_mean) / np.sqrt(np.maximum(previous_var, self.min_var[columns]))
+        seen = self.samples[columns][np.newaxis] + np.arange(len(x))[:, np.newaxis]
+        z[seen < self.warmup] = 0
+        self.mean[columns] = mean[-1]
+        self.var[columns] = var[-1]
+        self.samples[columns] += len(x)
+        return self._classify(x, z, columns)
+
+    def _classify(self, x, z, columns):
+        magnitude = np.abs(z)
+        raw = (magnitude >= self.warning_z).astype(np.int8) + (magnitude >= self.critical_z)
+        peak = raw.max(axis=0)
+        # Samples since the last one outside clear_z, carried across blocks
+        loud = magnitude >= self.clear_z
+        last_loud = np.where(loud.any(axis=0), len(x) - 1 - np.argmax(loud[::-1], axis=0), -1)
+        calm = np.where(last_loud < 0, self.calm[columns] + len(x), len(x) - 1 - last_loud)
+        self.calm[columns] = calm
+
+        events = []
+        levels = self.levels[columns]
+        for i in np.flatnonzero(peak > levels):
+            # Report the first sample that reached the new level
+            first = np.argmax(raw[:, i] >= peak[i])
+            events.append(Anomaly(self.channels[columns[i]], STATUS_LEVELS[peak[i]].lower(),
+                                  float(x[first, i]), float(z[first, i])))
+            levels[i] = peak[i]
+        for i in np.flatnonzero((levels > 0) & (peak == 0) & (calm >= self.hold)):
+            events.append(Anomaly(self.channels[columns[i]], "info", float(x[-1, i]), float(z[-1, i])))
+            levels[i] = 0
+        self.levels[columns] = levels
+        return events
@@ -0,0 +1,334 @@
+"""Augmented-reality viewport compositing.
+
+Overlay layers (grid, schematics, component labels, highlight masks, mode
+HUD) are drawn once per viewport size and kept as 8-bit RGBA. Every
+combination of layers in use is flattened once into a single premultiplied
+(color, inverse alpha) pair in 8.8 fixed point, so compositing a frame is one
+integer multiply-add into buffers allocated when the compositor is created.
+Both caches are shared by every compositor in the process and bounded by
+bytes.
+
+ARCompositor runs that on a worker thread. Camera frames are offered with
+submit(), which keeps only the newest one; a still background (the equipment
+bay or a local image) is recomposited whenever the active layers change. The
+worker exits after idle_timeout seconds without work and is started again on
+the next change, so an abandoned compositor holds no thread.
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from gestures import LatestFrame
+from startup import lazy_import
+
+VIEWPORT_SIZE = (800, 600)
+
+# Components in the maintenance bay: name -> (left, top, right, bottom) as fractions of the viewport
+AR_COMPONENTS = {
+    "HVAC-2305": (0.30, 0.22, 0.70, 0.70),
+    "Air Filter": (0.36, 0.30, 0.52, 0.46),
+    "Power Coupling": (0.56, 0.52, 0.66, 0.64),
+    "Access Panel A-7": (0.10, 0.30, 0.24, 0.78),
+    "Temp Sensors": (0.76, 0.18, 0.90, 0.34),
+}
+# Component highlighted when a scan locks on
+SCAN_TARGET = "Power Coupling"
+
+HUD_COLORS = {"Inspect": (0, 200, 255), "Repair": (255, 159, 0), "Diagnostic": (0, 204, 150)}
+
+
+def _canvas(size):
+    Image = lazy_import("PIL.Image")
+    ImageDraw = lazy_import("PIL.ImageDraw")
+    image = Image.new("RGBA", size, (0, 0, 0, 0))
+    return image, ImageDraw.Draw(image)
+
+
+def _box(size, fractions):
+    width, height = size
+    left, top, right, bottom = fractions
+    return int(left * width), int(top * height), int(right * width), int(bottom * height)
+
+
+def draw_layer(name, size):
+    """Draw one overlay layer as an RGBA PIL image."""
+    image, draw = _canvas(size)
+    width, height = size
+    if name == "grid":
+        for x in range(0, width, 50):
+            draw.line([(x, 0), (x, height)], fill=(80, 140, 255, 28))
+        for y in range(0, height, 50):
+            draw.line([(0, y), (width, y)], fill=(80, 140, 255, 28))
+        cx, cy = width // 2, height // 2
+        draw.line([(cx - 15, cy), (cx + 15, cy)], fill=(120, 200, 255, 160), width=2)
+        draw.line([(cx, cy - 15), (cx, cy + 15)], fill=(120, 200, 255, 160), width=2)
+    elif name == "schematics":
+        for component, fractions in AR_COMPONENTS.items():
+            box = _box(size, fractions)
+            draw.rectangle(box, outline=(0, 220, 255, 200), width=2)
+            # Cross-bracing marks the internal structure
+            draw.line([box[:2], box[2:]], fill=(0, 220, 255, 70))
+            draw.line([(box[0], box[3]), (box[2], box[1])], fill=(0, 220, 255, 70))
+        # Ducting between the filter, HVAC unit and sensors
+        filter_box, sensor_box = _box(size, AR_COMPONENTS["Air Filter"]), _box(size, AR_COMPONENTS["Temp Sensors"])
+        draw.line([(filter_box[2], filter_box[1] + 10), (sensor_box[0], filter_box[1] + 10),
+                   (sensor_box[0], sensor_box[3])], fill=(0, 220, 255, 150), width=3)
+    elif name == "labels":
+        for component, fractions in AR_COMPONENTS.items():
+            left, top, _, _ = _box(size, fractions)
+            text_box = draw.textbbox((left + 4, top - 18), component)
+            draw.rectangle(text_box, fill=(10, 20, 40, 180))
+            draw.text((left + 4, top - 18), component, fill=(255, 255, 255, 255))
+    elif name == "highlight":
+        box = _box(size, AR_COMPONENTS[SCAN_TARGET])
+        draw.rectangle(box, fill=(255, 60, 60, 90), outline=(255, 60, 60, 230), width=3)
+        draw.text((box[0], box[3] + 6), f"SCAN LOCK: {SCAN_TARGET}", fill=(255, 90, 90, 255))
+    elif name.startswith("hud:"):
+        mode = name[4:]
+        color = HUD_COLORS.get(mode, (255, 255, 255))
+        draw.rectangle([(0, 0), (width, 28)], fill=(10, 20, 40, 170))
+        draw.text((12, 8), f"AR {mode.upper()} MODE", fill=(*color, 255))
+        for x0, y0, dx, dy in ((8, 36, 1, 1), (width - 9, 36, -1, 1), (8, height - 9, 1, -1), (width - 9, height - 9, -1, -1)):
+            draw.line([(x0, y0), (x0 + 30 * dx, y0)], fill=(*color, 220), width=2)
+            draw.line([(x0, y0), (x0, y0 + 30 * dy)], fill=(*color, 220), width=2)
+    else:
+        raise ValueError(f"Unknown AR layer {name!r}")
+    return image
+
+
+class ArrayCache:
+    """Thread-safe LRU of read-only array tuples bounded by total size in bytes."""
+
+    def __init__(self, build, max_bytes):
+        self.build = build
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __call__(self, *key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self.build(*key)
+        for array in entry:
+            array.setflags(write=False)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = entry
+                self.size += sum(array.nbytes for array in entry)
+            while self.size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= sum(array.nbytes for array in evicted)
+        return entry
+
+
+def _layer_rgba(name, size):
+    return (np.asarray(draw_layer(name, size), dtype=np.uint8),)
+
+
+def _flatten(layers, size):
+    width, height = size
+    color = np.zeros((height, width, 3), dtype=np.float32)
+    coverage = np.zeros((height, width, 1), dtype=np.float32)
+    # Porter-Duff "over" of premultiplied layers, bottom to top
+    for name in layers:
+        rgba, = layer_rgba(name, size)
+        layer_alpha = rgba[..., 3:] / np.float32(255)
+        color = rgba[..., :3] / np.float32(255) * layer_alpha + color * (1 - layer_alpha)
+        coverage = layer_alpha + coverage * (1 - layer_alpha)
+    # 8.8 fixed point: out = (frame * inverse + color) >> 8 with inverse + alpha = 256
+    inverse = np.rint((1 - coverage) * 256).astype(np.uint16)
+    # Stored per channel: a broadcast multiply per frame is several times slower
+    return np.rint(color * 255 * 256).astype(np.uint16), np.broadcast_to(inverse, color.shape).copy()
+
+
+# layer_rgba(name, size) -> (uint8 RGBA,), about 1.9 MB at 800x600
+layer_rgba = ArrayCache(_layer_rgba, max_bytes=16 * 1024 * 1024)
+# flattened_overlay(layers, size) -> (uint16 premultiplied color, uint16 inverse alpha),
+# about 5.8 MB at 800x600
+flattened_overlay = ArrayCache(_flatten, max_bytes=32 * 1024 * 1024)
+
+
+@functools.lru_cache(maxsize=4)
+def equipment_bay_background(size):
+    """Return a synthetic maintenance-bay frame to overlay when no camera is used."""
+    image, draw = _canvas(size)
+    width, height = size
+    rows = np.linspace(0, 1, height, dtype=np.float32)[:, np.newaxis, np.newaxis]
+    base = (np.array([18, 22, 40], dtype=np.float32) * (1 - rows) + np.array([40, 44, 60], dtype=np.float32) * rows)
+    frame = np.broadcast_to(base, (height, width, 3)).astype(np.uint8)
+    Image = lazy_import("PIL.Image")
+    background = Image.fromarray(frame).convert("RGBA")
+    for fractions in AR_COMPONENTS.values():
+        draw.rectangle(_box(size, fractions), fill=(70, 78, 96, 255), outline=(95, 104, 125, 255))
+    background.alpha_composite(image)
+    frame = np.asarray(background.convert("RGB"))
+    frame.setflags(write=False)
+    return frame
+
+
+class ARCompositor:
+    """Blends cached overlay layers onto camera frames or a still background on a worker thread."""
+
+    def __init__(self, size=VIEWPORT_SIZE, max_samples=300, idle_timeout=30):
+        self.size = size
+        width, height = size
+        self.idle_timeout = idle_timeout
+        self.composed = 0
+        self.version = 0
+        self._layers = ()
+        # Most recent camera frame or still background, recomposed on layer changes
+        self._source = None
+        self._dirty = False
+        self._frames = LatestFrame()
+        # Working buffers, allocated once and reused for every frame
+        self._resized = np.empty((height, width, 3), dtype=np.uint8)
+        self._accumulator = np.empty((height, width, 3), dtype=np.uint16)
+        # Each composed frame is a new read-only array, so readers can keep it without copying
+        self._output = np.zeros((height, width, 3), dtype=np.uint8)
+        self._output.setflags(write=False)
+        self._compose_ms = deque(maxlen=max_samples)
+        self._completed = deque(maxlen=max_samples)
+        self._composed = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def set_layers(self, layers):
+        """Select the overlay layers, bottom to top; return whether they changed."""
+        layers = tuple(layers)
+        if layers == self._layers:
+            return False
+        self._layers = layers
+        self._dirty = True
+        self._notify()
+        return True
+
+    def set_background(self, frame):
+        """Compose a still RGB frame until camera frames arrive; return whether the source changed.
+
+        The same frame again is a no-op.
+        """
+        if frame is self._source:
+            return False
+        self._source = frame
+        self._dirty = True
+        self._notify()
+        return True
+
+    def submit(self, frame):
+        """Offer an RGB camera frame; only the newest pending frame is composed."""
+        self._frames.put(frame)
+        self._notify()
+
+    @property
+    def running(self):
+        """Whether the worker thread is alive."""
+        return self._thread is not None
+
+    def latest(self, newer_than=None, timeout=0.5):
+        """Return (version, latest composed RGB frame), a read-only array.
+
+        With newer_than, first wait up to timeout for a frame composed after
+        that version.
+        """
+        with self._composed:
+            if newer_than is not None:
+                self._composed.wait_for(lambda: self.version > newer_than, timeout)
+            return self.version, self._output
+
+    def stats(self):
+        """Return compositing counters, frame rate and per-frame cost in milliseconds."""
+        compose = np.array(self._compose_ms) if self._compose_ms else np.array([np.nan])
+        completed = list(self._completed)
+        span = completed[-1] - completed[0] if len(completed) > 1 else 0
+        return {
+            "composed": self.composed,
+            "dropped": self._frames.dropped,
+            "fps": (len(completed) - 1) / span if span else 0.0,
+            "compose_ms_p50": float(np.percentile(compose, 50)),
+            "compose_ms_p95": float(np.percentile(compose, 95)),
+            "overlays_cached": len(flattened_overlay),
+        }
+
+    def stop(self):
+        """Stop the worker thread for good."""
+        self._stop.set()
+        self._wake.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _notify(self):
+        """Wake the worker, starting it again if it went idle."""
+        with self._lock:
+            self._wake.set()
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(target=self._run, name="ar-compositor", daemon=True)
+                self._thread.start()
+
+    def compose(self, frame):
+        """Blend the active layers onto frame and publish the result as the latest frame."""
+        color, inverse = flattened_overlay(self._layers, self.size)
+        # Flattening a new layer stack is a one-off cache miss, not part of the per-frame cost
+        start = time.perf_counter()
+        source = self._fit(frame)
+        np.multiply(source, inverse, out=self._accumulator)
+        np.add(self._accumulator, color, out=self._accumulator)
+        np.right_shift(self._accumulator, 8, out=self._accumulator)
+        output = self._accumulator.astype(np.uint8)
+        output.setflags(write=False)
+        with self._composed:
+            self._output = output
+            self.version += 1
+            self._composed.notify_all()
+        finished = time.perf_counter()
+        self.composed += 1
+        self._compose_ms.append((finished - start) * 1000)
+        self._completed.append(finished)
+
+    def _fit(self, frame):
+        """Return frame at viewport size, resizing into the reusable buffer if needed."""
+        width, height = self.size
+        if frame.shape[:2] == (height, width):
+            return frame[..., :3]
+        try:
+            cv2 = lazy_import("cv2")
+        except ImportError:
+            # Nearest-neighbour fallback; allocates, unlike cv2.resize into dst
+            rows = np.arange(height) * frame.shape[0] // height
+            columns = np.arange(width) * frame.shape[1] // width
+            self._resized[...] = frame[rows[:, np.newaxis], columns, :3]
+        else:
+            cv2.resize(np.ascontiguousarray(frame[..., :3]), self.size, dst=self._resized, interpolation=cv2.INTER_LINEAR)
+        return self._resized
+
+    def _run(self):
+        while not self._stop.is_set():
+            if not self._wake.wait(self.idle_timeout):
+                with self._lock:
+                    # Exit unless work arrived while taking the lock
+                    if not self._wake.is_set():
+                        self._thread = None
+                        return
+            self._wake.clear()
+            frame = self._frames.take(timeout=0)
+            if frame is not None:
+                self._source = frame
+            elif self._dirty:
+                frame = self._source
+            if frame is None:
+                continue
+            self._dirty = False
+            self.compose(frame)
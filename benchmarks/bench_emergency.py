@@ -0,0 +1,55 @@
+"""Run time of the Monte Carlo emergency simulator.
+
+Times a cold (uncached) run of every scenario at each trial count, serially
+and, for the larger counts, across worker processes.
+
+    python benchmarks/bench_emergency.py --trials 10000 100000 1000000 --output bench_emergency.json
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from emergency import SCENARIOS, EmergencySimulator  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trials", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--severity", default="High")
+    parser.add_argument("--location", default="Engineering")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_emergency.json")
+    args = parser.parse_args()
+
+    serial = EmergencySimulator(parallel_threshold=float("inf"), seed=args.seed)
+    parallel = EmergencySimulator(workers=args.workers, parallel_threshold=0, seed=args.seed)
+    # Start the worker processes before timing
+    parallel.run(next(iter(SCENARIOS)), args.severity, args.location, trials=2 * parallel.batch_size)
+    results = []
+    print(f"{'trials':>9} {'serial ms':>10} {'parallel ms':>12}")
+    for trials in args.trials:
+        timings = {"serial": [], "parallel": []}
+        for scenario in SCENARIOS:
+            timings["serial"].append(serial.run(scenario, args.severity, args.location, trials).elapsed_ms)
+            if trials > parallel.batch_size:
+                timings["parallel"].append(parallel.run(scenario, args.severity, args.location, trials).elapsed_ms)
+        result = {"trials": trials, **{mode: float(np.median(values)) if values else None
+                                       for mode, values in timings.items()}}
+        results.append(result)
+        parallel_ms = "-" if result["parallel"] is None else f"{result['parallel']:.1f}"
+        print(f"{trials:9,d} {result['serial']:10.1f} {parallel_ms:>12}")
+    parallel.close()
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "cores": os.cpu_count(), "severity": args.severity,
+                   "location": args.location, "results": results}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
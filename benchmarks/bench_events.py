@@ -0,0 +1,57 @@
+"""Build and query time of the predicted-event store.
+
+For each store size, times building the indexes once and the two page
+queries (events overlapping the next `--hours`, most probable event per
+category), against a plain NumPy scan over all events.
+
+    python benchmarks/bench_events.py --events 1000 100000 1000000 --output bench_events.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from events import synthetic_events  # noqa: E402
+from timing import timed  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--hours", type=float, default=72)
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_events.json")
+    args = parser.parse_args()
+
+    now = time.time()
+    results = []
+    print(f"{'events':>9} {'build ms':>9} {'upcoming us':>12} {'most likely us':>15} {'scan us':>9}")
+    for count in args.events:
+        start = time.perf_counter()
+        store = synthetic_events(count, now, seed=args.seed)
+        build_ms = (time.perf_counter() - start) * 1000
+        # Query a window in the middle of the horizon
+        at = now + 180 * 86400
+        end = at + args.hours * 3600
+        result = {
+            "events": count,
+            "build_ms": build_ms,
+            "upcoming_us": timed(lambda: store.upcoming(args.hours, at), args.repeat, scale=1e6),
+            "most_likely_us": timed(lambda: store.most_likely(at), args.repeat, scale=1e6),
+            "scan_us": timed(lambda: np.flatnonzero((store.starts <= end) & (store.ends >= at)), args.repeat, scale=1e6),
+        }
+        results.append(result)
+        print(f"{count:9,d} {build_ms:9.1f} {result['upcoming_us']:12.1f} {result['most_likely_us']:15.1f} {result['scan_us']:9.1f}")
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "hours": args.hours, "results": results}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
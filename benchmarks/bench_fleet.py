@@ -0,0 +1,65 @@
+"""Scaling of fleet mode with the number of habitats and worker processes.
+
+For each fleet size, times FleetSimulator.tick() with one worker and with
+one worker per core, and reports habitat-ticks per second. Throughput should
+grow with the worker count up to the number of cores.
+
+    python benchmarks/bench_fleet.py --habitats 8 16 32 64 128 --output bench_fleet.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleet import FleetSimulator  # noqa: E402
+
+
+def time_fleet(habitats, workers, ticks, batch, seed):
+    simulator = FleetSimulator(habitats, workers, seed=seed)
+    try:
+        # Warm up: worker start-up and first-tick imports are not steady state
+        simulator.tick(batch)
+        start = time.perf_counter()
+        for _ in range(ticks):
+            simulator.tick(batch)
+        elapsed = time.perf_counter() - start
+    finally:
+        simulator.close()
+    return {
+        "habitats": habitats,
+        "workers": simulator.workers,
+        "tick_ms": elapsed / ticks * 1000,
+        "habitat_ticks_per_s": habitats * batch * ticks / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--habitats", type=int, nargs="+", default=[8, 16, 32, 64, 128])
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="worker counts to compare (default: 1 and the number of cores)")
+    parser.add_argument("--ticks", type=int, default=50, help="timed fleet ticks per run")
+    parser.add_argument("--batch", type=int, default=1, help="simulation steps per fleet tick")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_fleet.json")
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({1, cores})
+    results = []
+    print(f"{'habitats':>8} {'workers':>7} {'tick ms':>9} {'habitat-ticks/s':>16}")
+    for habitats in args.habitats:
+        for workers in worker_counts:
+            result = time_fleet(habitats, workers, args.ticks, args.batch, args.seed)
+            results.append(result)
+            print(f"{habitats:8d} {result['workers']:7d} {result['tick_ms']:9.2f} {result['habitat_ticks_per_s']:16,.0f}")
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "cores": cores, "batch": args.batch, "results": results}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
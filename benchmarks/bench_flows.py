@@ -0,0 +1,60 @@
+"""Solve time of the resource flow network as the habitat grows.
+
+Builds networks of `--modules` copies of the habitat network, then times a
+full factorization and re-solves after a few edge capacities change.
+
+    python benchmarks/bench_flows.py --modules 1 10 50 100 --changes 3 --output bench_flows.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flows import modular_flow_network  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--changes", type=int, default=3, help="edge capacities changed per update")
+    parser.add_argument("--updates", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_flows.json")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    results = []
+    print(f"{'nodes':>6} {'edges':>6} {'full ms':>8} {'update ms':>10}")
+    for modules in args.modules:
+        network, supply, capacities, consumption = modular_flow_network(modules, seed=args.seed)
+        network.update(supply, capacities, consumption)
+        network.solve()
+        edges = list(capacities)
+        timings = {"full": [], "update": []}
+        for _ in range(args.updates):
+            chosen = rng.choice(len(edges), args.changes, replace=False)
+            network.update(capacities={edges[i]: capacities[edges[i]] * rng.uniform(0.5, 1.5) for i in chosen})
+            # Alternate forced refactorizations with incremental re-solves
+            for mode, rank in (("update", network.max_update_rank), ("full", -1)):
+                network.max_update_rank = rank
+                network._result = None
+                start = time.perf_counter()
+                network.solve()
+                timings[mode].append((time.perf_counter() - start) * 1000)
+            network.max_update_rank = 16
+        result = {"nodes": len(network.nodes), "edges": len(network.edges),
+                  **{f"{mode}_ms": float(np.median(values)) for mode, values in timings.items()}}
+        results.append(result)
+        print(f"{result['nodes']:6d} {result['edges']:6d} {result['full_ms']:8.3f} {result['update_ms']:10.3f}")
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "changes": args.changes, "results": results}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Benchmark of the assistant intent matcher as the number of intents grows.
+
+A seeded corpus of spoken-style commands (the supported phrasings wrapped in
+filler words, plus commands no intent understands) is matched against the
+habitat intents and against the same intents padded with synthetic ones.
+
+    python benchmarks/bench_intents.py --commands 5000 --output bench_intents.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from intents import HABITAT_INTENTS, HABITAT_SLOTS, IntentEngine  # noqa: E402
+
+PREFIXES = ["", "", "please", "computer", "hey habitat", "could you", "i need you to"]
+SUFFIXES = ["", "", "please", "now", "right away", "thanks"]
+COMMANDS = [
+    "status report", "system status", "how are the systems doing", "give me a report",
+    "switch to the {module} page", "open {module}", "show me the {module} view", "take me to {module}",
+    "activate emergency protocols", "turn the emergency mode off", "disable emergency", "emergency mode on",
+    "dark mode", "switch to light theme", "use the night theme",
+    "make me a sandwich", "what is the meaning of life", "play some music",
+]
+
+
+def build_corpus(count, rng):
+    """Return `count` transcripts drawn from COMMANDS with random filler."""
+    modules = list(HABITAT_SLOTS["module"])
+    corpus = []
+    for _ in range(count):
+        command = rng.choice(COMMANDS).format(module=rng.choice(modules))
+        corpus.append(" ".join(part for part in (rng.choice(PREFIXES), command, rng.choice(SUFFIXES)) if part))
+    return corpus
+
+
+def synthetic_intents(count, rng):
+    """Return `count` extra intents, each with a few patterns over made-up words."""
+    def word():
+        return "".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(3))
+
+    intents = dict(HABITAT_INTENTS)
+    for i in range(count):
+        verb, noun, other = word(), word(), word()
+        intents[f"synthetic_{i}"] = [
+            f"({verb}|{other}) [the] {noun} [now]",
+            f"{noun} {verb} {{module}}",
+            f"{other} {{state}} {noun}",
+        ]
+    return intents
+
+
+def run(extra_intents, corpus, rng):
+    """Compile an engine with extra intents and time single and batch matching."""
+    start = time.perf_counter()
+    engine = IntentEngine(synthetic_intents(extra_intents, rng), HABITAT_SLOTS)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    matches = [engine.match(text) for text in corpus]
+    single_s = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.match_batch(corpus)
+    batch_s = time.perf_counter() - start
+    return {
+        "extra_intents": extra_intents,
+        "patterns": engine.patterns,
+        "compile_ms": compile_ms,
+        "match_us": single_s / len(corpus) * 1e6,
+        "batch_us": batch_s / len(corpus) * 1e6,
+        "matched": sum(match is not None for match in matches) / len(corpus),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--commands", type=int, default=5000, help="transcripts in the corpus")
+    parser.add_argument("--extra-intents", type=int, nargs="+", default=[0, 100, 500, 1000])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_intents.json")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = build_corpus(args.commands, rng)
+    results = []
+    for extra in args.extra_intents:
+        result = run(extra, corpus, rng)
+        results.append(result)
+        print(f"{result['patterns']:6d} patterns   compile {result['compile_ms']:8.1f} ms   "
+              f"match {result['match_us']:6.1f} us   batch {result['batch_us']:6.1f} us   "
+              f"matched {result['matched']:.0%}")
+
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "commands": args.commands, "seed": args.seed,
+                   "results": results}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Headless rerun-latency benchmark for every module page of frontend.py.
+
+Each page runs in a fresh interpreter, so the first run really is cold: no
+modules imported, no st.cache_resource entries, and no telemetry producer.
+The same AppTest session is then rerun to measure warm latency. Third-party
+components are replaced with the offline stand-ins in stubs.py.
+
+    python benchmarks/bench_pages.py --reruns 10 --output bench_results.json
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "frontend.py")
+PAGES = ["Dashboard", "3D View", "Crew", "Resources", "Environmental", "Maintenance", "Quantum",
+         "Emergency", "AR"]
+
+
+def peak_rss_mb():
+    """Return this process's peak resident set size in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_page(page, reruns, timeout):
+    """Benchmark one page in this process and return its measurements."""
+    import stubs
+    stubs.install(page)
+    from streamlit.testing.v1 import AppTest
+
+    baseline_mb = peak_rss_mb()
+    app = AppTest.from_file(APP, default_timeout=timeout)
+    start = time.perf_counter()
+    app.run()
+    cold_ms = (time.perf_counter() - start) * 1000
+    cold_peak_mb = peak_rss_mb()
+
+    warm_ms = []
+    for _ in range(reruns):
+        start = time.perf_counter()
+        app.run()
+        warm_ms.append((time.perf_counter() - start) * 1000)
+
+    warm = np.array(warm_ms) if warm_ms else np.array([np.nan])
+    return {
+        "page": page,
+        "cold_ms": cold_ms,
+        "warm_ms_p50": float(np.percentile(warm, 50)),
+        "warm_ms_p95": float(np.percentile(warm, 95)),
+        "warm_ms_max": float(warm.max()),
+        "warm_ms": warm_ms,
+        "baseline_rss_mb": baseline_mb,
+        "cold_peak_rss_mb": cold_peak_mb,
+        "peak_rss_mb": peak_rss_mb(),
+        "exceptions": [str(exception.value) for exception in app.exception],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", nargs="+", default=PAGES, choices=PAGES)
+    parser.add_argument("--reruns", type=int, default=5, help="warm reruns per page")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds allowed per run")
+    parser.add_argument("--seed", type=int, default=0, help="simulation seed")
+    parser.add_argument("--backfill-days", type=float, default=0, help="days of simulated history to preload")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--worker", choices=PAGES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_page(args.worker, args.reruns, args.timeout)))
+        return
+
+    env = dict(os.environ, HABITAT_SIMULATION_SEED=str(args.seed), HABITAT_BACKFILL_DAYS=str(args.backfill_days))
+    results = []
+    for page in args.pages:
+        # A fresh telemetry log per page, so nothing is restored from earlier runs
+        data_dir = tempfile.mkdtemp(prefix="habitat-bench-")
+        try:
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--worker", page,
+                 "--reruns", str(args.reruns), "--timeout", str(args.timeout)],
+                env=dict(env, HABITAT_DATA_DIR=data_dir), capture_output=True, text=True, check=True,
+            )
+        finally:
+            shutil.rmtree(data_dir, ignore_errors=True)
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(f"{page:<14} cold {result['cold_ms']:8.1f} ms   warm p50 {result['warm_ms_p50']:8.1f} ms   "
+              f"p95 {result['warm_ms_p95']:8.1f} ms   peak RSS {result['peak_rss_mb']:7.1f} MB"
+              + ("   EXCEPTIONS" if result["exceptions"] else ""))
+
+    with open(args.output, "w") as f:
+        json.dump({
+            "python": sys.version.split()[0],
+            "reruns": args.reruns,
+            "seed": args.seed,
+            "backfill_days": args.backfill_days,
+            "pages": results,
+        }, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
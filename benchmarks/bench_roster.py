@@ -0,0 +1,54 @@
+"""Build and page time of the columnar crew roster.
+
+For each crew size, times building the roster, then a status and location
+filter plus materializing one page of cards, against filtering the list of
+member dicts.
+
+    python benchmarks/bench_roster.py --crew 8 1000 10000 100000 --output bench_roster.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from roster import CrewRoster, synthetic_crew  # noqa: E402
+from timing import timed  # noqa: E402
+
+PAGE_SIZE = 16
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--crew", type=int, nargs="+", default=[8, 1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_roster.json")
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'crew':>7} {'build ms':>9} {'page ms':>8} {'list ms':>8}")
+    for count in args.crew:
+        crew = synthetic_crew(count, seed=args.seed)
+        start = time.perf_counter()
+        roster = CrewRoster(crew)
+        build_ms = (time.perf_counter() - start) * 1000
+        result = {
+            "crew": count,
+            "build_ms": build_ms,
+            "page_ms": timed(lambda: roster.records(roster.filter("On Duty", "Engine Room")[:PAGE_SIZE]), args.repeat),
+            "list_ms": timed(lambda: [member for member in crew
+                                      if member["status"] == "On Duty" and member["location"] == "Engine Room"][:PAGE_SIZE],
+                             args.repeat),
+        }
+        results.append(result)
+        print(f"{count:7,d} {build_ms:9.2f} {result['page_ms']:8.3f} {result['list_ms']:8.3f}")
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "page_size": PAGE_SIZE, "results": results}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
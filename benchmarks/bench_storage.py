@@ -0,0 +1,82 @@
+"""Write and read throughput of the persistent telemetry log.
+
+Writes `--days` of simulated history into a temporary log, first in bulk
+batches and then one tick at a time as the producer does, and times reading
+the whole window back through the memory-mapped segments.
+
+    python benchmarks/bench_storage.py --days 30 --interval 1 --output bench_storage.json
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation import TELEMETRY_CHANNELS, SimulationEngine  # noqa: E402
+from telemetry_log import TelemetryLog  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=30, help="days of history to write")
+    parser.add_argument("--interval", type=float, default=30, help="seconds between samples")
+    parser.add_argument("--batch", type=int, default=10000, help="samples per bulk write")
+    parser.add_argument("--ticks", type=int, default=20000, help="single-sample appends to time")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_storage.json")
+    args = parser.parse_args()
+
+    rows = int(args.days * 86400 / args.interval)
+    values = SimulationEngine(tick_seconds=args.interval, seed=args.seed).step(rows)[:, 0]
+    end = time.time() - args.interval * args.ticks
+    timestamps = end - args.interval * np.arange(rows, 0, -1)
+    channels = len(TELEMETRY_CHANNELS)
+    directory = tempfile.mkdtemp(prefix="habitat-log-")
+    try:
+        log = TelemetryLog(directory, TELEMETRY_CHANNELS)
+        start = time.perf_counter()
+        for i in range(0, rows, args.batch):
+            log.extend(timestamps[i:i + args.batch], values[i:i + args.batch])
+        log.flush()
+        bulk_s = time.perf_counter() - start
+
+        tick_times = end + args.interval * np.arange(args.ticks)
+        start = time.perf_counter()
+        for timestamp, row in zip(tick_times, values[:args.ticks]):
+            log.extend([timestamp], row[np.newaxis])
+        log.flush()
+        tick_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        times, window = log.window(start=timestamps[0])
+        read_ms = (time.perf_counter() - start) * 1000
+        assert len(times) == rows + args.ticks
+        log.close()
+        disk_mb = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 1e6
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    result = {
+        "rows": rows,
+        "channels": channels,
+        "bulk_samples_per_s": rows * channels / bulk_s,
+        "tick_samples_per_s": args.ticks * channels / tick_s,
+        "read_window_ms": read_ms,
+        "disk_mb": disk_mb,
+    }
+    print(f"bulk writes   {result['bulk_samples_per_s']:14,.0f} samples/s")
+    print(f"tick appends  {result['tick_samples_per_s']:14,.0f} samples/s")
+    print(f"read {args.days:g} days  {read_ms:10.1f} ms ({rows + args.ticks:,} rows, {disk_mb:.1f} MB on disk)")
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "days": args.days, "interval": args.interval, **result}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
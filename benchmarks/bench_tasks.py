@@ -0,0 +1,66 @@
+"""Query and re-planning time of the maintenance task store and scheduler.
+
+For each store size, times building the indexes, a filtered query, a full
+assignment plan, and a re-plan after one task changes status.
+
+    python benchmarks/bench_tasks.py --tasks 100 1000 5000 --output bench_tasks.json
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation import generate_crew_data  # noqa: E402
+from tasks import MaintenanceScheduler, TaskStore, synthetic_tasks  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, nargs="+", default=[100, 1000, 5000])
+    parser.add_argument("--replans", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="bench_tasks.json")
+    args = parser.parse_args()
+
+    crew = generate_crew_data()
+    today = datetime.date.today().isoformat()
+    results = []
+    print(f"{'tasks':>6} {'build ms':>9} {'query ms':>9} {'plan ms':>8} {'replan ms':>10}")
+    for count in args.tasks:
+        tasks = synthetic_tasks(count, seed=args.seed)
+        start = time.perf_counter()
+        store = TaskStore(tasks)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        store.query(priority="High", status="Pending", due_before=today)
+        query_ms = (time.perf_counter() - start) * 1000
+
+        scheduler = MaintenanceScheduler()
+        start = time.perf_counter()
+        plan = scheduler.plan(store, crew, today)
+        plan_ms = (time.perf_counter() - start) * 1000
+
+        replans = []
+        for assignment in plan[:args.replans]:
+            store.update(assignment.task_id, {"assigned_to": assignment.crew, "status": "In Progress"})
+            start = time.perf_counter()
+            scheduler.plan(store, crew, today)
+            replans.append((time.perf_counter() - start) * 1000)
+        result = {"tasks": count, "build_ms": build_ms, "query_ms": query_ms, "plan_ms": plan_ms,
+                  "replan_ms": float(np.median(replans)) if replans else None}
+        results.append(result)
+        print(f"{count:6d} {build_ms:9.1f} {query_ms:9.2f} {plan_ms:8.1f} {result['replan_ms'] or 0:10.1f}")
+    with open(args.output, "w") as f:
+        json.dump({"python": sys.version.split()[0], "crew": len(crew), "results": results}, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
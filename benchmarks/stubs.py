@@ -0,0 +1,41 @@
+"""Offline stand-ins for the third-party Streamlit components used by frontend.py.
+
+The real components render through the browser, which AppTest does not have.
+The stand-ins are installed into sys.modules before the app runs. They keep
+the call signatures and do no rendering work, so the benchmarks measure the
+app itself.
+"""
+import sys
+import types
+
+
+def _module(name, **attributes):
+    module = types.ModuleType(name)
+    module.__dict__.update(attributes)
+    sys.modules[name] = module
+    return module
+
+
+def install(page="Dashboard"):
+    """Install the stand-ins; option_menu always returns `page`."""
+    def option_menu(menu_title, options, *args, **kwargs):
+        return page if page in options else options[kwargs.get("default_index", 0)]
+
+    def st_autorefresh(interval=1000, limit=None, key=None):
+        return 0
+
+    def timeline(data, height=800):
+        return None
+
+    def showmol(view, height=500, width=500):
+        return None
+
+    def webrtc_streamer(key, mode=None, video_frame_callback=None, **kwargs):
+        return types.SimpleNamespace(state=types.SimpleNamespace(playing=False))
+
+    _module("streamlit_option_menu", option_menu=option_menu)
+    _module("streamlit_autorefresh", st_autorefresh=st_autorefresh)
+    _module("streamlit_timeline", timeline=timeline)
+    _module("stmol", showmol=showmol)
+    _module("streamlit_webrtc", webrtc_streamer=webrtc_streamer,
+            WebRtcMode=types.SimpleNamespace(SENDRECV="sendrecv", SENDONLY="sendonly", RECVONLY="recvonly"))
@@ -0,0 +1,13 @@
+"""Timing helper shared by the micro-benchmarks."""
+import time
+
+
+def timed(function, repeat, scale=1000):
+    """Return the mean wall time of `repeat` calls of function, in milliseconds by default.
+
+    Pass scale=1e6 for microseconds.
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat * scale
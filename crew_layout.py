@@ -0,0 +1,108 @@
+"""Cached, incrementally updated layout of the crew location graph."""
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+
+from startup import lazy_import
+
+# Iterations used when warm-starting from the previous layout
+WARM_ITERATIONS = 10
+# Above this many crew members only location nodes are labelled
+MAX_LABELLED_CREW = 40
+
+
+def crew_topology(crew_data):
+    """Return the hashable (crew member, location) edge set of the graph."""
+    return frozenset((member["name"], member["location"]) for member in crew_data)
+
+
+class CrewLayoutCache:
+    """Caches node positions and the rendered graph image per topology.
+
+    When the topology changes, the new layout warm-starts from the last one:
+    crew members that stayed put keep their positions, moved or new members
+    start next to their location, and only a few spring iterations are run.
+    """
+
+    def __init__(self, max_entries=32, seed=42):
+        self.max_entries = max_entries
+        self.seed = seed
+        self._entries = OrderedDict()  # topology -> (positions, PNG bytes)
+        self._last_positions = None
+        self._last_locations = {}
+        self._rng = np.random.default_rng(seed)
+        self._lock = threading.Lock()
+
+    def _graph(self, topology):
+        nx = lazy_import("networkx")
+        G = nx.Graph()
+        for location in sorted({location for _, location in topology}):
+            G.add_node(location, type="location")
+        for name, location in sorted(topology):
+            G.add_node(name, type="crew")
+            G.add_edge(name, location)
+        return G
+
+    def _layout(self, G, topology):
+        nx = lazy_import("networkx")
+        previous = self._last_positions
+        if previous is None:
+            return nx.spring_layout(G, seed=self.seed)
+
+        initial = {}
+        for node, attr in G.nodes(data=True):
+            if attr["type"] == "location":
+                initial[node] = previous[node] if node in previous else self._rng.uniform(-1, 1, 2)
+        for name, location in topology:
+            if name in previous and self._last_locations.get(name) == location:
+                initial[name] = previous[name]
+            else:
+                initial[name] = initial[location] + self._rng.normal(0, 0.05, 2)
+        return nx.spring_layout(G, pos=initial, iterations=WARM_ITERATIONS, seed=self.seed)
+
+    def _render(self, G, positions):
+        nx = lazy_import("networkx")
+        Figure = lazy_import("matplotlib.figure").Figure
+        fig = Figure(figsize=(10, 8))
+        ax = fig.add_subplot(111)
+
+        # Draw location nodes
+        location_nodes = [node for node, attr in G.nodes(data=True) if attr.get("type") == "location"]
+        nx.draw_networkx_nodes(G, positions, nodelist=location_nodes, node_color="skyblue", node_size=500, alpha=0.8, ax=ax)
+
+        # Draw crew nodes
+        crew_nodes = [node for node, attr in G.nodes(data=True) if attr.get("type") == "crew"]
+        nx.draw_networkx_nodes(G, positions, nodelist=crew_nodes, node_color="orange", node_size=300, alpha=0.8, ax=ax)
+
+        # Draw edges
+        nx.draw_networkx_edges(G, positions, width=1.0, alpha=0.5, ax=ax)
+
+        # Draw labels, skipping crew names once the graph gets crowded
+        labelled = location_nodes if len(crew_nodes) > MAX_LABELLED_CREW else list(G.nodes)
+        nx.draw_networkx_labels(G, positions, labels={node: node for node in labelled},
+                                font_size=10, font_family="sans-serif", ax=ax)
+
+        ax.axis("off")
+        buf = BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight")
+        return buf.getvalue()
+
+    def get(self, crew_data):
+        """Return (positions, PNG bytes) for the crew location graph."""
+        topology = crew_topology(crew_data)
+        with self._lock:
+            entry = self._entries.get(topology)
+            if entry is None:
+                G = self._graph(topology)
+                positions = self._layout(G, topology)
+                entry = (positions, self._render(G, positions))
+                self._entries[topology] = entry
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.move_to_end(topology)
+            self._last_positions = entry[0]
+            self._last_locations = dict(topology)
+            return entry
@@ -0,0 +1,130 @@
+"""Server-side downsampling of long telemetry series before they reach a chart."""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _minmax_buckets(times, values, size):
+    """Min/max of equal-sized buckets; len(times) must be a multiple of size."""
+    if size == 1:
+        return times, values
+    times = times.reshape(-1, size)
+    values = values.reshape(-1, size)
+    if np.isnan(values).any():
+        lo, hi = np.nanargmin(values, axis=1), np.nanargmax(values, axis=1)
+    else:
+        lo, hi = values.argmin(axis=1), values.argmax(axis=1)
+    rows = np.arange(len(values))
+    # Keep each bucket's extremes in the order they occurred
+    first = np.where(lo <= hi, values[rows, lo], values[rows, hi])
+    second = np.where(lo <= hi, values[rows, hi], values[rows, lo])
+    return (np.column_stack([times[:, 0], times[:, -1]]).ravel(),
+            np.column_stack([first, second]).ravel())
+
+
+def minmax_downsample(times, values, buckets):
+    """Reduce a series to the minimum and maximum of each of `buckets` buckets.
+
+    Each bucket contributes two points placed at its first and last
+    timestamps, so every series cut into the same buckets shares one x axis.
+    With one bucket per horizontal pixel the line looks the same as the full
+    series. Series with all-NaN buckets are not supported.
+    """
+    n = len(times)
+    if n <= 2 * buckets:
+        return times, values
+    size = -(-n // buckets)
+    whole = n - n % size
+    bulk = _minmax_buckets(times[:whole], values[:whole], size)
+    if whole == n:
+        return bulk
+    tail = _minmax_buckets(times[whole:], values[whole:], n - whole)
+    return np.concatenate([bulk[0], tail[0]]), np.concatenate([bulk[1], tail[1]])
+
+
+def lttb_downsample(times, values, points):
+    """Reduce a series to `points` samples with Largest-Triangle-Three-Buckets.
+
+    The first and last samples are kept and every bucket in between keeps the
+    sample forming the largest triangle with its neighbouring buckets. Each
+    triangle is anchored on the mean of the previous bucket rather than on
+    its selected sample, which removes the sequential dependency between
+    buckets so the whole series is processed in one vectorized pass.
+    """
+    n = len(times)
+    if n <= points or points < 3:
+        return times, values
+    x = times - times[0]
+    edges = np.linspace(1, n - 1, points - 1).astype(np.intp)
+    counts = np.diff(edges)
+    bucket_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    bucket_y = np.add.reduceat(values[1:n - 1], edges[:-1] - 1) / counts
+    # Anchors on either side of every bucket, repeated for each of its samples
+    ax = np.repeat(np.concatenate([[x[0]], bucket_x[:-1]]), counts)
+    ay = np.repeat(np.concatenate([[values[0]], bucket_y[:-1]]), counts)
+    cx = np.repeat(np.concatenate([bucket_x[1:], [x[-1]]]), counts)
+    cy = np.repeat(np.concatenate([bucket_y[1:], [values[-1]]]), counts)
+    bx = x[1:n - 1]
+    by = values[1:n - 1]
+    area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+    area[np.isnan(area)] = -np.inf
+    # First sample in each bucket whose area equals the bucket maximum
+    largest = np.repeat(np.maximum.reduceat(area, edges[:-1] - 1), counts)
+    bucket = np.repeat(np.arange(len(counts)), counts)
+    hits = np.flatnonzero(area == largest)
+    _, first_hit = np.unique(bucket[hits], return_index=True)
+    index = np.concatenate([[0], hits[first_hit] + 1, [n - 1]])
+    return times[index], values[index]
+
+
+DOWNSAMPLERS = {"minmax": minmax_downsample, "lttb": lttb_downsample}
+
+
+class HistoryDownsampler:
+    """Downsampled views of a TimeSeriesStore, cached per (channel, window, resolution).
+
+    Windows are anchored on the latest recorded sample, and cached series are
+    reused until the store receives new samples, so chart payloads stay the
+    same size however much history is kept.
+    """
+
+    def __init__(self, history, max_entries=256):
+        self.history = history
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._series = OrderedDict()
+        self._lock = threading.Lock()
+
+    def series(self, channel, days, width, method="minmax"):
+        """Return (times, values) of a channel over the last `days` reduced for a chart `width` pixels wide.
+
+        min/max keeps two samples per pixel column and LTTB one sample per
+        pixel. Channels reduced with min/max over the same window share
+        timestamps; LTTB picks different samples for every channel.
+        """
+        key = (channel, days, width, method)
+        last = self.history.last_timestamp()
+        data_version = (len(self.history), last)
+        with self._lock:
+            cached = self._series.get(key)
+            if cached is not None and cached[0] == data_version:
+                self._series.move_to_end(key)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        if last is None:
+            result = (np.empty(0), np.empty(0))
+        else:
+            times, values = self.history.series(channel, start=last - days * 86400)
+            times, values = DOWNSAMPLERS[method](times, values, width)
+            # Copy so the cached series never aliases the live ring buffer
+            result = (np.array(times), np.array(values))
+        with self._lock:
+            self._series[key] = (data_version, result)
+            self._series.move_to_end(key)
+            while len(self._series) > self.max_entries:
+                self._series.popitem(last=False)
+        return result
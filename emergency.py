@@ -0,0 +1,218 @@
+"""Monte Carlo simulation of habitat emergencies.
+
+Each trial draws one possible course of an emergency, in minutes from onset:
+
+    detection -> crew response (travel + suiting up) -> containment
+                                 \\-> failed containment -> evacuation
+
+Trials are simulated as columns of NumPy arrays, in fixed-size batches so
+memory stays bounded. Large runs are split across worker processes. Every
+batch gets its own child of one SeedSequence, so a seeded run gives the same
+result serially or in parallel.
+
+Outcomes per trial are the time until the crew is safe, the fraction of
+exposed crew who survive and the lowest remaining resource reserve.
+"""
+import math
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from fleet import without_main_script, worker_context
+from simulation import RESOURCE_SPECS
+
+# Per scenario:
+#   detect_min       mean time to detection
+#   contain_min      median time to contain once responders arrive
+#   contain_sigma    log-normal spread of the containment time
+#   hazard_per_min   chance per minute that an exposed crew member is fatally harmed
+#   escalation       chance that containment fails and the module is evacuated
+#   exposed          crew at risk; None uses the location's occupancy
+#   drain            resource -> % of reserves lost per minute until safe
+Scenario = namedtuple("Scenario", ["detect_min", "contain_min", "contain_sigma", "hazard_per_min",
+                                   "escalation", "exposed", "drain"])
+
+SCENARIOS = {
+    "Hull Breach": Scenario(0.5, 8, 0.5, 0.012, 0.25, None, {"Oxygen": 0.9, "Power": 0.1}),
+    "Fire": Scenario(1.0, 12, 0.6, 0.010, 0.30, None, {"Oxygen": 0.5, "Water": 0.4, "Power": 0.15}),
+    "Power Failure": Scenario(0.3, 25, 0.7, 0.001, 0.05, None, {"Power": 0.35, "Oxygen": 0.08, "Fuel": 0.15}),
+    "Medical Emergency": Scenario(2.0, 15, 0.5, 0.015, 0.02, 1, {"Water": 0.05}),
+    "Cosmic Radiation": Scenario(0.2, 30, 0.4, 0.002, 0.60, None, {"Power": 0.2}),
+}
+
+# Multiplies hazard, drain and containment time; escalation is capped at 95%
+SEVERITY_LEVELS = {"Low": 0.5, "Medium": 1.0, "High": 1.6, "Critical": 2.5}
+
+# Location -> (metres from the nearest responders to the module, mean crew inside)
+LOCATIONS = {
+    "Command Center": (20, 2.0),
+    "Crew Quarters": (60, 3.0),
+    "Engineering": (45, 1.5),
+    "Life Support": (35, 1.0),
+    "Research Lab": (50, 1.5),
+}
+
+# Crew leaving a module per minute through one hatch, and walking speed in m/s
+EVACUATION_RATE = 0.8
+WALKING_SPEED = (1.2, 0.2)
+# Minutes of continued drain while systems recover after the crew is safe
+RECOVERY_MIN = 10
+
+EmergencyResult = namedtuple("EmergencyResult", [
+    "scenario", "severity", "location", "trials",
+    "time_to_safe", "survival", "resource_margin", "evacuated", "elapsed_ms",
+])
+
+
+def _validate(scenario, severity, location):
+    for value, options, kind in ((scenario, SCENARIOS, "scenario"), (severity, SEVERITY_LEVELS, "severity"),
+                                 (location, LOCATIONS, "location")):
+        if value not in options:
+            raise ValueError(f"Unknown {kind} {value!r}; expected one of {', '.join(options)}")
+
+
+def _nbytes(result):
+    """Return the memory held by an EmergencyResult's per-trial arrays."""
+    return sum(array.nbytes for array in (result.time_to_safe, result.survival, result.resource_margin, result.evacuated))
+
+
+def default_reserves():
+    """Resource reserves (%) at the middle of their operating bands."""
+    return {name: (low + high) / 2 for name, (low, high, _) in RESOURCE_SPECS.items()}
+
+
+def simulate_batch(scenario, severity, location, size, seed, reserves):
+    """Simulate `size` trials and return (time_to_safe, survival, resource_margin, evacuated) arrays."""
+    spec = SCENARIOS[scenario]
+    factor = SEVERITY_LEVELS[severity]
+    distance, occupancy = LOCATIONS[location]
+    rng = np.random.default_rng(seed)
+
+    detection = rng.exponential(spec.detect_min, size)
+    speed = np.maximum(rng.normal(*WALKING_SPEED, size), 0.5)
+    response = detection + distance / speed / 60 + rng.lognormal(0.0, 0.3, size)
+    containment = rng.lognormal(math.log(spec.contain_min * factor), spec.contain_sigma, size)
+
+    # Failed containment is abandoned part way through and the module evacuated
+    evacuated = rng.random(size) < min(spec.escalation * factor, 0.95)
+    exposed = np.full(size, spec.exposed) if spec.exposed is not None else rng.poisson(occupancy, size)
+    abort = containment * rng.uniform(0.2, 0.8, size)
+    evacuation = exposed / EVACUATION_RATE + distance / speed / 60
+    time_to_safe = np.where(evacuated, response + abort + evacuation, response + containment)
+    # Evacuees leave one by one, so on average they are exposed for half the evacuation
+    exposure = np.where(evacuated, response + abort + evacuation / 2, time_to_safe)
+
+    fatal = -np.expm1(-spec.hazard_per_min * factor * exposure)
+    deaths = rng.binomial(exposed, fatal)
+    survival = np.where(exposed > 0, 1 - deaths / np.maximum(exposed, 1), 1.0)
+
+    names = list(spec.drain)
+    rates = np.array([spec.drain[name] for name in names]) * factor
+    # Per-trial variation in how fast each reserve drains
+    drain = rates * rng.lognormal(0.0, 0.25, (size, len(names))) * (time_to_safe + RECOVERY_MIN)[:, np.newaxis]
+    margin = (np.array([reserves[name] for name in names]) - drain).min(axis=1)
+
+    return (time_to_safe.astype(np.float32), survival.astype(np.float32),
+            margin.astype(np.float32), evacuated)
+
+
+def outcome_summary(result):
+    """Return headline statistics of an EmergencyResult."""
+    time_to_safe, margin = result.time_to_safe, result.resource_margin
+    return {
+        "survival_probability": float(np.mean(result.survival == 1)),
+        "crew_survival_rate": float(np.mean(result.survival)),
+        "time_to_safe_p50": float(np.percentile(time_to_safe, 50)),
+        "time_to_safe_p90": float(np.percentile(time_to_safe, 90)),
+        "resource_margin_p5": float(np.percentile(margin, 5)),
+        "resource_margin_p50": float(np.percentile(margin, 50)),
+        "resource_shortfall": float(np.mean(margin < 0)),
+        "evacuation_rate": float(np.mean(result.evacuated)),
+    }
+
+
+class EmergencySimulator:
+    """Runs and caches Monte Carlo emergency simulations.
+
+    Results are cached per (scenario, severity, location, trials) in an LRU
+    bounded by the total size of their arrays in bytes. With a seed, every
+    combination always draws the same trials.
+    """
+
+    def __init__(self, trials=10000, batch_size=65536, workers=None, parallel_threshold=500000,
+                 reserves=None, seed=None, max_bytes=64 * 1024 * 1024):
+        self.trials = trials
+        self.batch_size = batch_size
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
+        self.reserves = dict(reserves or default_reserves())
+        self.seed = seed
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def run(self, scenario, severity, location, trials=None):
+        """Return the EmergencyResult of `trials` simulated emergencies."""
+        _validate(scenario, severity, location)
+        trials = trials or self.trials
+        key = (scenario, severity, location, trials)
+        with self._lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+
+        start = time.perf_counter()
+        sizes = [min(self.batch_size, trials - offset) for offset in range(0, trials, self.batch_size)]
+        seeds = self._seed_sequence(key).spawn(len(sizes))
+        jobs = [(scenario, severity, location, size, seed, self.reserves) for size, seed in zip(sizes, seeds)]
+        if trials >= self.parallel_threshold and len(jobs) > 1:
+            # Workers start on demand while the batches are submitted
+            with without_main_script():
+                pending = self._executor().map(simulate_batch, *zip(*jobs))
+            batches = list(pending)
+        else:
+            batches = [simulate_batch(*job) for job in jobs]
+        columns = [np.concatenate(column) for column in zip(*batches)]
+        result = EmergencyResult(scenario, severity, location, trials, *columns,
+                                 elapsed_ms=(time.perf_counter() - start) * 1000)
+        for array in columns:
+            array.setflags(write=False)
+
+        with self._lock:
+            if key not in self._results:
+                self._results[key] = result
+                self.size += _nbytes(result)
+            while self.size > self.max_bytes and len(self._results) > 1:
+                _, evicted = self._results.popitem(last=False)
+                self.size -= _nbytes(evicted)
+        return result
+
+    def _seed_sequence(self, key):
+        if self.seed is None:
+            return np.random.SeedSequence()
+        scenario, severity, location, trials = key
+        return np.random.SeedSequence([
+            self.seed, list(SCENARIOS).index(scenario), list(SEVERITY_LEVELS).index(severity),
+            list(LOCATIONS).index(location), trials])
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(self.workers, mp_context=worker_context([__name__]))
+            return self._pool
+
+    def close(self):
+        """Shut down the worker processes, if any were started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
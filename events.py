@@ -0,0 +1,144 @@
+"""Time-indexed store of predicted space events.
+
+Events are kept as parallel NumPy columns sorted by start time. Two indexes
+are built once, when the store is created:
+
+* Overlap queries binary-search the start column. An event overlapping
+  [t0, t1] starts no later than t1 and no earlier than t0 minus the longest
+  event duration, so only that slice is checked against the end times.
+* For each category, events are also sorted by end time together with a
+  suffix argmax of their probabilities, so the most likely event that has not
+  ended yet is one binary search away.
+
+Queries therefore cost O(log n) plus the size of the answer, however many
+events are stored.
+"""
+import numpy as np
+
+CATEGORY_LABELS = {
+    "solar_storms": "Solar Storm",
+    "cosmic_radiation": "Cosmic Radiation",
+    "asteroid_threats": "Asteroid Threat",
+}
+CATEGORIES = list(CATEGORY_LABELS)
+
+# Assumed duration of events whose prediction has no duration, in hours
+DEFAULT_DURATION_HOURS = {"solar_storms": 6, "cosmic_radiation": 4, "asteroid_threats": 2}
+
+
+def parse_times(values):
+    """Parse ISO-8601 UTC strings into epoch seconds."""
+    return np.array(values, dtype="datetime64[s]").astype(np.int64).astype(np.float64)
+
+
+def _suffix_argmax(values):
+    """Return best[i] = index of the largest of values[i:], the first one on ties."""
+    reverse = values[::-1]
+    positions = np.arange(len(values))
+    is_max = reverse >= np.maximum.accumulate(reverse)
+    # Latest position (in reverse order) where a new maximum was reached
+    best_reverse = np.maximum.accumulate(np.where(is_max, positions, 0))
+    return (len(values) - 1 - best_reverse)[::-1]
+
+
+class EventStore:
+    """Predicted events as columns with start-time and per-category end-time indexes."""
+
+    def __init__(self, categories, starts, ends, probabilities, intensities=None, labels=None):
+        starts = np.asarray(starts, dtype=np.float64)
+        count = len(starts)
+        ends = np.asarray(ends, dtype=np.float64)
+        probabilities = np.asarray(probabilities, dtype=np.float64)
+        # Categories are given by name or as indexes into CATEGORIES
+        categories = np.asarray(categories)
+        if categories.dtype.kind in "iu":
+            codes = categories.astype(np.int8)
+        else:
+            codes = np.array([CATEGORIES.index(category) for category in categories.tolist()], dtype=np.int8)
+        intensities = np.full(count, np.nan) if intensities is None else np.asarray(intensities, dtype=np.float64)
+        labels = np.full(count, "", dtype=object) if labels is None else np.asarray(labels, dtype=object)
+        if not all(len(column) == count for column in (ends, probabilities, codes, intensities, labels)):
+            raise ValueError("Event columns must all have the same length")
+        if np.any(ends < starts):
+            raise ValueError("Events must not end before they start")
+
+        order = np.argsort(starts, kind="stable")
+        self.starts = starts[order]
+        self.ends = ends[order]
+        self.probabilities = probabilities[order]
+        self.categories = codes[order]
+        self.intensities = intensities[order]
+        self.labels = labels[order]
+        self.max_duration = float((self.ends - self.starts).max()) if count else 0.0
+
+        # Per category: event indices by end time and the best event ending at or after each
+        self._by_end = {}
+        for code, category in enumerate(CATEGORIES):
+            members = np.flatnonzero(self.categories == code)
+            members = members[np.argsort(self.ends[members], kind="stable")]
+            best = members[_suffix_argmax(self.probabilities[members])] if len(members) else members
+            self._by_end[category] = (self.ends[members], best)
+
+        for column in (self.starts, self.ends, self.probabilities, self.categories, self.intensities, self.labels):
+            column.setflags(write=False)
+
+    @classmethod
+    def from_predictions(cls, predictions):
+        """Build a store from the nested prediction lists of SimulationEngine.quantum_predictions()."""
+        categories, times, hours, probabilities, intensities, labels = [], [], [], [], [], []
+        for category in CATEGORIES:
+            for event in predictions.get(category, []):
+                categories.append(category)
+                times.append(event.get("time", event.get("closest_approach")))
+                duration = event.get("duration")
+                hours.append(float(duration.split()[0]) if duration else DEFAULT_DURATION_HOURS[category])
+                probabilities.append(event["probability"])
+                intensities.append(event.get("intensity", np.nan))
+                labels.append(event.get("object_id", CATEGORY_LABELS[category]))
+        starts = parse_times(times) if times else np.empty(0)
+        return cls(categories, starts, starts + np.array(hours) * 3600, probabilities, intensities, labels)
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlapping(self, start, end):
+        """Return indices, in start order, of the events overlapping [start, end]."""
+        lo = np.searchsorted(self.starts, start - self.max_duration, side="left")
+        hi = np.searchsorted(self.starts, end, side="right")
+        return lo + np.flatnonzero(self.ends[lo:hi] >= start)
+
+    def upcoming(self, hours, now):
+        """Return indices of the events overlapping the next `hours` from `now` (epoch seconds)."""
+        return self.overlapping(now, now + hours * 3600)
+
+    def most_likely(self, now):
+        """Return {category: index of its most probable event not over by `now`}, skipping empty categories."""
+        result = {}
+        for category, (ends, best) in self._by_end.items():
+            position = np.searchsorted(ends, now, side="left")
+            if position < len(ends):
+                result[category] = int(best[position])
+        return result
+
+    def records(self, indices):
+        """Return the given events as a dict of columns, ready for a DataFrame."""
+        indices = np.asarray(indices, dtype=np.int64)
+        return {
+            "category": [CATEGORY_LABELS[CATEGORIES[code]] for code in self.categories[indices]],
+            "label": self.labels[indices].tolist(),
+            "start": self.starts[indices],
+            "end": self.ends[indices],
+            "probability": self.probabilities[indices],
+            "intensity": self.intensities[indices],
+        }
+
+
+def synthetic_events(count, start, horizon_hours=24 * 365, seed=0):
+    """Return an EventStore of `count` random events spread over the horizon after `start`."""
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(0, len(CATEGORIES), count).astype(np.int8)
+    starts = start + rng.uniform(0, horizon_hours * 3600, count)
+    hours = np.array([DEFAULT_DURATION_HOURS[category] for category in CATEGORIES])[codes] * rng.uniform(0.25, 2, count)
+    labels = np.array([CATEGORY_LABELS[category] for category in CATEGORIES], dtype=object)[codes]
+    return EventStore(codes, starts, starts + hours * 3600, rng.beta(2, 5, count),
+                      rng.uniform(0.5, 7.5, count), labels)
@@ -0,0 +1,74 @@
+"""Reusable Plotly figure templates patched in place on each rerun.
+
+Building a go.Figure validates every nested property, and a default figure
+also embeds the full Plotly theme in its JSON. Templates build and serialize
+the static part of a figure once per process. Each session clones that spec
+once and afterwards only patches the live fields. The figures use the empty
+"none" Plotly theme, because Streamlit applies its own chart theme in the
+browser.
+"""
+from startup import lazy_import
+
+
+class FigureTemplate:
+    """Static figure spec, serialized once and cloned per session."""
+
+    def __init__(self, figure):
+        figure.update_layout(template="none")
+        self.spec = figure.to_plotly_json()
+
+    def instantiate(self):
+        """Return a new Figure built from the serialized spec."""
+        go = lazy_import("plotly.graph_objects")
+        return go.Figure(self.spec)
+
+
+def gauge_template(axis_range, reference, steps, threshold,
+                   increasing_color="red", decreasing_color="red", height=250):
+    """Build a gauge template with static axis, steps, threshold and colors."""
+    go = lazy_import("plotly.graph_objects")
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number+delta",
+        value=reference,
+        domain={'x': [0, 1], 'y': [0, 1]},
+        delta={'reference': reference, 'increasing': {'color': increasing_color}, 'decreasing': {'color': decreasing_color}},
+        gauge={
+            'axis': {'range': list(axis_range), 'tickwidth': 1, 'tickcolor': "darkblue"},
+            'bar': {'color': "darkblue"},
+            'bgcolor': "white",
+            'borderwidth': 2,
+            'bordercolor': "gray",
+            'steps': [{'range': list(step_range), 'color': color} for step_range, color in steps],
+            'threshold': {
+                'line': {'color': "red", 'width': 4},
+                'thickness': 0.75,
+                'value': threshold
+            }
+        }
+    ))
+    fig.update_layout(height=height)
+    return FigureTemplate(fig)
+
+
+class FigureSet:
+    """One session's figures, cloned from templates and patched on each rerun."""
+
+    def __init__(self, templates):
+        self.templates = templates
+        self._figures = {}
+
+    def figure(self, name):
+        """Return this session's figure for a template, cloning it on first use."""
+        fig = self._figures.get(name)
+        if fig is None:
+            fig = self._figures[name] = self.templates[name].instantiate()
+        return fig
+
+    def indicator(self, name, value, reference=None):
+        """Return an indicator figure with only its value and delta reference patched."""
+        fig = self.figure(name)
+        indicator = fig.data[0]
+        indicator.value = value
+        if reference is not None:
+            indicator.delta.reference = reference
+        return fig
@@ -0,0 +1,279 @@
+"""Fleet mode: many habitats simulated in parallel worker processes.
+
+Habitats are split into contiguous shards, one per worker process. Each
+worker owns a vectorized SimulationEngine and StreamingAnomalyDetector for its
+shard, so per-tick cost grows with shard size and shards run concurrently.
+Workers write their latest readings and alarm levels straight into one
+shared-memory block laid out as
+
+    values  float64 (habitats, channels)
+    levels  int8    (habitats,)        0 Nominal, 1 Warning, 2 Critical
+
+and send back only the (rare) anomaly events over their pipe. The parent
+reads the whole fleet from shared memory without copying per-habitat objects.
+"""
+import atexit
+import contextlib
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import types
+from collections import deque, namedtuple
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from anomaly import STATUS_LEVELS, StreamingAnomalyDetector
+from simulation import CHANNEL_SPECS, ENVIRONMENTAL_CHANNELS, TELEMETRY_CHANNELS, SimulationEngine
+from startup import lazy_import
+from telemetry import anomaly_message
+
+FleetSnapshot = namedtuple("FleetSnapshot", ["version", "timestamp", "names", "values", "levels", "alerts"])
+
+ENVIRONMENTAL_COLUMNS = [TELEMETRY_CHANNELS.index(name) for name in ENVIRONMENTAL_CHANNELS]
+
+
+def habitat_names(count):
+    """Return display names for a fleet of `count` habitats."""
+    return tuple(f"HAB-{i + 1:02d}" for i in range(count))
+
+
+def _fleet_arrays(buffer, habitats):
+    channels = len(TELEMETRY_CHANNELS)
+    values = np.ndarray((habitats, channels), dtype=np.float64, buffer=buffer)
+    levels = np.ndarray((habitats,), dtype=np.int8, buffer=buffer, offset=values.nbytes)
+    return values, levels
+
+
+def _shard_worker(connection, memory_name, habitats, start, stop, tick_seconds, seed):
+    """Simulate habitats[start:stop] for every tick request until told to stop."""
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        values, levels = _fleet_arrays(memory.buf, habitats)
+        values, levels = values[start:stop], levels[start:stop]
+        shard = stop - start
+        engine = SimulationEngine(habitats=shard, tick_seconds=tick_seconds,
+                                  seed=None if seed is None else [seed, start])
+        low, high, _ = np.array([CHANNEL_SPECS[name] for name in ENVIRONMENTAL_CHANNELS]).T
+        # One detector channel per (habitat, environmental channel), scored in one call
+        detector = StreamingAnomalyDetector(
+            [(start + habitat, name) for habitat in range(shard) for name in ENVIRONMENTAL_CHANNELS],
+            min_std=np.tile((high - low) / 60, shard))
+        # Load the filters before the first tick so tick times measure simulation only
+        lazy_import("scipy.signal")
+        while True:
+            ticks = connection.recv()
+            if ticks is None:
+                break
+            block = engine.step(ticks)
+            anomalies = detector.update(block[:, :, ENVIRONMENTAL_COLUMNS].reshape(ticks, -1))
+            values[:] = block[-1]
+            levels[:] = detector.levels.reshape(shard, -1).max(axis=1)
+            connection.send([(anomaly.channel[0], anomaly._replace(channel=anomaly.channel[1]))
+                             for anomaly in anomalies])
+    finally:
+        del values, levels
+        memory.close()
+
+
+def worker_context(preload=()):
+    """Return the multiprocessing context used for simulation worker processes.
+
+    Forkserver workers fork from a clean helper process that has only imported
+    the `preload` modules, so they do not inherit the server's threads and
+    sockets, and start faster than spawned interpreters.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(list(preload))
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+@contextlib.contextmanager
+def without_main_script():
+    """Keep new worker processes from re-importing the parent's __main__.
+
+    Under Streamlit, __main__ is the app script itself; workers only need
+    this module.
+    """
+    main = sys.modules["__main__"]
+    sys.modules["__main__"] = types.ModuleType("__main__")
+    try:
+        yield
+    finally:
+        sys.modules["__main__"] = main
+
+
+class FleetSimulator:
+    """Runs a fleet of habitat simulations sharded across worker processes.
+
+    A shard whose worker has died is restarted with a fresh simulation, and
+    the tick that found it raises RuntimeError after the others finished.
+    """
+
+    def __init__(self, habitats, workers=None, tick_seconds=30, seed=None):
+        self.habitats = habitats
+        self.workers = max(1, min(habitats, workers or os.cpu_count() or 1))
+        channels = len(TELEMETRY_CHANNELS)
+        self._memory = shared_memory.SharedMemory(create=True, size=habitats * (channels * 8 + 1))
+        self.values, self.levels = _fleet_arrays(self._memory.buf, habitats)
+        self.values[:] = np.nan
+        self.levels[:] = 0
+        self.tick_seconds = tick_seconds
+        self.seed = seed
+        self.restarts = 0
+        self._context = worker_context([__name__])
+        bounds = np.linspace(0, habitats, self.workers + 1).astype(int)
+        self._shards = [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+        self._connections = [None] * self.workers
+        self._processes = [None] * self.workers
+        for shard in range(self.workers):
+            self._start_shard(shard)
+        self._closed = False
+        atexit.register(self.close)
+
+    def _start_shard(self, shard):
+        start, stop = self._shards[shard]
+        parent, child = self._context.Pipe()
+        process = self._context.Process(
+            target=_shard_worker, name=f"fleet-shard-{start}",
+            args=(child, self._memory.name, self.habitats, start, stop, self.tick_seconds, self.seed), daemon=True)
+        with without_main_script():
+            process.start()
+        child.close()
+        self._connections[shard] = parent
+        self._processes[shard] = process
+
+    def _restart_shard(self, shard):
+        process = self._processes[shard]
+        process.join(timeout=1)
+        if process.is_alive():
+            process.kill()
+            process.join()
+        self._connections[shard].close()
+        start, stop = self._shards[shard]
+        self.values[start:stop] = np.nan
+        self.levels[start:stop] = 0
+        self.restarts += 1
+        self._start_shard(shard)
+        return f"habitats {start + 1}-{stop} (exit code {process.exitcode})"
+
+    def tick(self, ticks=1):
+        """Advance every habitat and return the new (habitat index, Anomaly) events."""
+        failed = []
+        for shard, connection in enumerate(self._connections):
+            try:
+                connection.send(ticks)
+            except OSError:
+                failed.append(shard)
+        events = []
+        for shard, connection in enumerate(self._connections):
+            if shard in failed:
+                continue
+            try:
+                events.extend(connection.recv())
+            except (EOFError, OSError):
+                failed.append(shard)
+        if failed:
+            restarted = [self._restart_shard(shard) for shard in failed]
+            raise RuntimeError(f"Fleet worker for {', '.join(restarted)} stopped and was restarted")
+        return events
+
+    def close(self):
+        """Stop the workers and release the shared memory."""
+        if self._closed:
+            return
+        self._closed = True
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5)
+        del self.values, self.levels
+        self._memory.close()
+        self._memory.unlink()
+
+
+def summarize(values, columns):
+    """Aggregate fleet readings per channel.
+
+    Returns {channel: (mean, min, max, index of the habitat with the minimum)}
+    for the given {channel: column} mapping, ignoring habitats without data.
+    """
+    selected = values[:, list(columns.values())]
+    if np.isnan(selected).all():
+        return {}
+    filled = np.where(np.isnan(selected), np.inf, selected)
+    return {
+        channel: stats for channel, stats in zip(columns, zip(
+            np.nanmean(selected, axis=0).tolist(), np.nanmin(selected, axis=0).tolist(),
+            np.nanmax(selected, axis=0).tolist(), filled.argmin(axis=0).tolist()))
+    }
+
+
+class FleetProducer:
+    """Publishes fleet snapshots from a FleetSimulator on a fixed interval."""
+
+    def __init__(self, habitats, refresh_interval, workers=None, seed=None, alert_backlog=50):
+        self.refresh_interval = refresh_interval
+        self.names = habitat_names(habitats)
+        self.simulator = FleetSimulator(habitats, workers, tick_seconds=refresh_interval, seed=seed)
+        self._alerts = deque(maxlen=alert_backlog)
+        self.error = None
+        self._snapshot = None
+        self._stop = threading.Event()
+        self.tick()
+        self._thread = threading.Thread(target=self._run, name="fleet-producer", daemon=True)
+        self._thread.start()
+
+    @property
+    def snapshot(self):
+        """The latest FleetSnapshot."""
+        return self._snapshot
+
+    def tick(self):
+        """Advance the fleet one step and publish a snapshot."""
+        start = time.perf_counter()
+        events = self.simulator.tick()
+        self.tick_ms = (time.perf_counter() - start) * 1000
+        now = time.time()
+        for habitat, anomaly in events:
+            self._alerts.append((now, f"{self.names[habitat]}: {anomaly_message(anomaly)}", anomaly.severity))
+        values = self.simulator.values.copy()
+        levels = self.simulator.levels.copy()
+        for array in (values, levels):
+            array.setflags(write=False)
+        previous = self._snapshot
+        self._snapshot = FleetSnapshot(
+            version=1 if previous is None else previous.version + 1,
+            timestamp=now,
+            names=self.names,
+            values=values,
+            levels=levels,
+            alerts=tuple(self._alerts),
+        )
+        return self._snapshot
+
+    def status_counts(self):
+        """Return {status: number of habitats} for the latest snapshot."""
+        counts = np.bincount(self._snapshot.levels, minlength=len(STATUS_LEVELS))
+        return dict(zip(STATUS_LEVELS, counts.tolist()))
+
+    def stop(self):
+        """Stop publishing and shut the workers down."""
+        self._stop.set()
+        self._thread.join()
+        self.simulator.close()
+
+    def _run(self):
+        while not self._stop.wait(self.refresh_interval):
+            try:
+                self.tick()
+            except Exception as error:
+                # Keep publishing; the simulator has already replaced a dead shard
+                self.error = f"{type(error).__name__}: {error}"
@@ -0,0 +1,215 @@
+"""Resource flow network of the habitat.
+
+Each node passes its throughput on along its outgoing edges, in proportion to
+the edge capacities, and keeps the rest in proportion to its own consumption.
+With s the external supply into each node and W[i, j] the share of node i's
+throughput sent to node j, the throughputs x satisfy
+
+    x = s + W^T x,   i.e.   (I - W^T) x = s
+
+and the flow on edge i -> j is x[i] * W[i, j]. The system is sparse (one
+entry per edge) and solved with a cached sparse LU factorization.
+
+Changing the capacities out of k nodes changes k columns of I - W^T, so a
+re-solve after a few changes reuses the factorization through the Woodbury
+identity, at the cost of k extra triangular solves. Once more than
+`max_update_rank` nodes differ from the factorized system it is refactorized.
+"""
+import threading
+
+import numpy as np
+
+from simulation import CHANNEL_SPECS
+from startup import lazy_import
+
+FLOW_NODES = ["Solar Panels", "Batteries", "Life Support", "Hydroponics",
+              "Water Recycling", "Crew", "Waste Processing", "Atmosphere"]
+
+# (source, target) -> (capacity at nominal readings, telemetry channel it scales with)
+FLOW_EDGES = {
+    ("Solar Panels", "Batteries"): (80, "solar_array"),
+    ("Solar Panels", "Life Support"): (20, "solar_array"),
+    ("Batteries", "Life Support"): (60, "main_battery"),
+    ("Life Support", "Crew"): (30, "Oxygen"),
+    ("Hydroponics", "Crew"): (20, "Food"),
+    ("Water Recycling", "Crew"): (50, "Water"),
+    ("Crew", "Water Recycling"): (30, None),
+    ("Crew", "Waste Processing"): (20, None),
+    ("Waste Processing", "Hydroponics"): (10, "efficiency"),
+    ("Waste Processing", "Atmosphere"): (10, "efficiency"),
+}
+# External input into a node: (amount at nominal readings, channel it scales with)
+FLOW_SUPPLY = {
+    "Solar Panels": (100, "solar_array"),
+    "Water Recycling": (30, "Water"),
+    "Hydroponics": (15, "Food"),
+}
+# Share a node keeps for itself, relative to its edge capacities
+FLOW_CONSUMPTION = {
+    "Batteries": (10, None),
+    "Life Support": (40, "power_consumption"),
+    "Hydroponics": (5, None),
+    "Crew": (40, None),
+    "Atmosphere": (1, None),
+}
+
+
+def _scaled(table, readings):
+    """Scale nominal amounts by each channel's reading relative to the middle of its band."""
+    scaled = {}
+    for key, (amount, channel) in table.items():
+        if channel is not None and channel in readings:
+            low, high, _ = CHANNEL_SPECS[channel]
+            amount = amount * readings[channel] / ((low + high) / 2)
+        scaled[key] = amount
+    return scaled
+
+
+def live_flow_inputs(power_systems, resource_levels):
+    """Return (supply, capacities, consumption) for the habitat network from live readings."""
+    readings = {**power_systems, **resource_levels}
+    return _scaled(FLOW_SUPPLY, readings), _scaled(FLOW_EDGES, readings), _scaled(FLOW_CONSUMPTION, readings)
+
+
+class FlowNetwork:
+    """Proportional-split flow network solved with an incrementally updated sparse LU."""
+
+    def __init__(self, nodes, edges, max_update_rank=16):
+        self.nodes = list(nodes)
+        self.edges = list(edges)
+        self.max_update_rank = max_update_rank
+        self._index = {node: i for i, node in enumerate(self.nodes)}
+        self._edge_index = {edge: i for i, edge in enumerate(self.edges)}
+        if len(self._edge_index) != len(self.edges):
+            raise ValueError("Flow network has duplicate edges")
+        try:
+            self.sources = np.array([self._index[source] for source, _ in self.edges], dtype=np.int64)
+            self.targets = np.array([self._index[target] for _, target in self.edges], dtype=np.int64)
+        except KeyError as error:
+            raise ValueError(f"Flow edge refers to unknown node {error.args[0]!r}") from None
+        count = len(self.nodes)
+        self.supply = np.zeros(count)
+        self.capacity = np.zeros(len(self.edges))
+        self.consumption = np.zeros(count)
+        self.factorizations = 0
+        self.incremental_solves = 0
+        self._lu = None
+        self._factorized_weights = None
+        self._result = None
+        self._lock = threading.Lock()
+
+    def update(self, supply=None, capacities=None, consumption=None):
+        """Set supply and consumption per node and capacity per (source, target) edge.
+
+        Only the given entries change; everything else keeps its value, and
+        the last solution is kept if nothing changed.
+        """
+        with self._lock:
+            self._update(supply, capacities, consumption)
+
+    def _update(self, supply, capacities, consumption):
+        for values, array, index in ((supply, self.supply, self._index),
+                                     (capacities, self.capacity, self._edge_index),
+                                     (consumption, self.consumption, self._index)):
+            for key, value in (values or {}).items():
+                if value < 0:
+                    raise ValueError(f"Flow amounts must be non-negative, got {value!r} for {key!r}")
+                if array[index[key]] != value:
+                    array[index[key]] = value
+                    self._result = None
+
+    def weights(self):
+        """Return the share of each edge source's throughput sent along the edge."""
+        totals = np.bincount(self.sources, weights=self.capacity, minlength=len(self.nodes)) + self.consumption
+        # A node with neither outflow nor consumption keeps everything it receives
+        totals[totals == 0] = 1
+        return self.capacity / totals[self.sources]
+
+    def solve(self):
+        """Return (throughput per node, flow per edge)."""
+        with self._lock:
+            return self._solution()
+
+    def update_and_solve(self, supply=None, capacities=None, consumption=None):
+        """Apply update() and return the matching solve() as one step.
+
+        Callers sharing a network use this so another thread's update cannot
+        land between their update and their solve.
+        """
+        with self._lock:
+            self._update(supply, capacities, consumption)
+            return self._solution()
+
+    def _solution(self):
+        if self._result is None:
+            weights = self.weights()
+            throughput = self._solve(weights)
+            flows = throughput[self.sources] * weights
+            for array in (throughput, flows):
+                array.setflags(write=False)
+            self._result = (throughput, flows)
+        return self._result
+
+    def _matrix(self, weights):
+        sparse = lazy_import("scipy.sparse")
+        count = len(self.nodes)
+        transfer = sparse.csc_matrix((weights, (self.targets, self.sources)), shape=(count, count))
+        return (sparse.identity(count, format="csc") - transfer).tocsc()
+
+    def _solve(self, weights):
+        if self._lu is not None:
+            changed_edges = np.flatnonzero(weights != self._factorized_weights)
+            changed = np.unique(self.sources[changed_edges])
+            if len(changed) <= self.max_update_rank:
+                self.incremental_solves += 1
+                return self._woodbury_solve(weights, changed_edges, changed)
+        linalg = lazy_import("scipy.sparse.linalg")
+        self._lu = linalg.splu(self._matrix(weights))
+        self._factorized_weights = weights
+        self.factorizations += 1
+        return self._lu.solve(self.supply)
+
+    def _woodbury_solve(self, weights, changed_edges, changed):
+        """Solve (A + U E^T) x = s from the factorization of A, where U holds the changed columns."""
+        base = self._lu.solve(self.supply)
+        if not len(changed):
+            return base
+        # Column i of A is e_i - W^T[:, i]; U[:, k] is the change in column changed[k]
+        update = np.zeros((len(self.nodes), len(changed)))
+        column = np.searchsorted(changed, self.sources[changed_edges])
+        delta = self._factorized_weights[changed_edges] - weights[changed_edges]
+        np.add.at(update, (self.targets[changed_edges], column), delta)
+        correction = self._lu.solve(update)
+        capacitance = np.eye(len(changed)) + correction[changed]
+        return base - correction @ np.linalg.solve(capacitance, base[changed])
+
+
+def habitat_flow_network():
+    """Return the flow network of the habitat's resource systems."""
+    return FlowNetwork(FLOW_NODES, FLOW_EDGES)
+
+
+def modular_flow_network(modules, seed=0):
+    """Return a synthetic network of `modules` copies of the habitat network.
+
+    Neighbouring modules share power and water, standing in for a larger
+    habitat. Returns (network, supply, capacities, consumption) at nominal
+    readings.
+    """
+    rng = np.random.default_rng(seed)
+    supply, capacities, consumption = live_flow_inputs({}, {})
+    nodes, edges = [], {}
+    node_supply, node_consumption = {}, {}
+    for module in range(modules):
+        name = lambda node: f"{node} {module + 1}"  # noqa: E731
+        nodes.extend(name(node) for node in FLOW_NODES)
+        edges.update({(name(source), name(target)): capacity * rng.uniform(0.8, 1.2)
+                      for (source, target), capacity in capacities.items()})
+        node_supply.update({name(node): amount for node, amount in supply.items()})
+        node_consumption.update({name(node): amount for node, amount in consumption.items()})
+        if module:
+            previous = lambda node: f"{node} {module}"  # noqa: E731
+            edges[(previous("Batteries"), name("Life Support"))] = 5.0
+            edges[(name("Water Recycling"), previous("Crew"))] = 5.0
+    network = FlowNetwork(nodes, edges)
+    return network, node_supply, edges, node_consumption
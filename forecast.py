@@ -0,0 +1,108 @@
+"""Vectorized resource-level forecasting from recorded telemetry history."""
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+Forecast = namedtuple("Forecast", ["channels", "times", "mean", "lower", "upper", "slope_per_day"])
+
+
+def fit_linear_trends(days, values):
+    """Fit y = intercept + slope * days for every column of values at once.
+
+    Returns (intercept, slope, residual std, mean of days, centered sum of
+    squares of days), each per column where applicable, or None with fewer
+    than three samples. The fit works from sums of products, so it reads
+    values twice and never materializes a residual matrix.
+    """
+    n = len(days)
+    if n < 3:
+        return None
+    days_mean = days.mean()
+    centered = days - days_mean
+    sxx = centered @ centered
+    if sxx == 0:
+        return None
+    values_mean = values.sum(axis=0) / n
+    slope = centered @ values / sxx
+    intercept = values_mean - slope * days_mean
+    # Residual sum of squares = Syy - slope^2 * Sxx
+    syy = np.einsum("ij,ij->j", values, values) - n * values_mean ** 2
+    rss = np.maximum(syy - slope ** 2 * sxx, 0)
+    return intercept, slope, np.sqrt(rss / (n - 2)), days_mean, sxx
+
+
+class ResourceForecaster:
+    """Forecasts channel levels with per-channel linear trends and prediction intervals.
+
+    All channels are fitted in one least-squares pass over the history window.
+    Forecasts are cached per (horizon, fit window, steps) and reused until the
+    history store receives new samples.
+    """
+
+    def __init__(self, history, channels, z=1.96, bounds=(0, 100), max_fit_samples=50000):
+        self.history = history
+        self.channels = list(channels)
+        self.z = z
+        self.bounds = bounds
+        self.max_fit_samples = max_fit_samples
+        columns = [history.column(channel) for channel in self.channels]
+        # Adjacent columns are selected with a slice so the fit reads a view
+        if columns == list(range(columns[0], columns[0] + len(columns))):
+            columns = slice(columns[0], columns[0] + len(columns))
+        self._columns = columns
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def forecast(self, horizon_days, fit_days=None, steps=None):
+        """Return a Forecast over the next horizon_days, or None without enough history."""
+        fit_days = fit_days or 2 * horizon_days
+        steps = steps or horizon_days + 1
+        key = (horizon_days, fit_days, steps)
+        data_version = (len(self.history), self.history.last_timestamp())
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == data_version:
+                return cached[1]
+
+        result = self._fit(horizon_days, fit_days, steps)
+        with self._lock:
+            self._cache[key] = (data_version, result)
+        return result
+
+    def _fit(self, horizon_days, fit_days, steps):
+        last = self.history.last_timestamp()
+        if last is None:
+            return None
+        times, values = self.history.window(start=last - fit_days * 86400)
+        # Long windows are thinned with an even stride; a trend over weeks
+        # gains nothing from every minute-level sample
+        stride = max(1, -(-len(times) // self.max_fit_samples))
+        times = times[::-stride][::-1]
+        values = values[::-stride][::-1, self._columns]
+        # Time in days relative to the latest sample keeps the fit well conditioned
+        days = (times - last) / 86400
+        fit = fit_linear_trends(days, values)
+        if fit is not None and not np.isfinite(fit[1]).all():
+            # Gaps in a channel poison the sums; refit on complete rows only
+            complete = ~np.isnan(values).any(axis=1)
+            days = days[complete]
+            fit = fit_linear_trends(days, values[complete])
+        if fit is None:
+            return None
+        intercept, slope, residual_std, days_mean, sxx = fit
+
+        future = np.linspace(0, horizon_days, steps)
+        mean = intercept + np.outer(future, slope)
+        # Ordinary least-squares prediction interval for a new observation
+        spread = np.sqrt(1 + 1 / len(days) + (future - days_mean) ** 2 / sxx)
+        margin = self.z * np.outer(spread, residual_std)
+        low, high = self.bounds
+        return Forecast(
+            channels=self.channels,
+            times=last + future * 86400,
+            mean=np.clip(mean, low, high),
+            lower=np.clip(mean - margin, low, high),
+            upper=np.clip(mean + margin, low, high),
+            slope_per_day=slope,
+        )
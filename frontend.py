@@ -1,46 +1,42 @@
-import streamlit as st
-import numpy as np
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.express as px
-from streamlit_plotly_events import plotly_events
+from startup import lazy_import, mark_first_render, startup_report
+
+# Core dependencies needed by every page. Heavy, page-specific modules
+# (matplotlib, networkx, py3Dmol, OpenCV, ...) are imported inside the
+# render_* function that uses them so a cold start only pays for the dashboard.
+st = lazy_import("streamlit")
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+go = lazy_import("plotly.graph_objects")
+px = lazy_import("plotly.express")
 import time
 import datetime
+import functools
 import random
-import json
-import base64
+import html
 from io import BytesIO
-import matplotlib.pyplot as plt
-import seaborn as sns
-from PIL import Image
-import cv2
-import mediapipe as mp
-import speech_recognition as sr
-import pyttsx3
-import threading
-import requests
-import uuid
 import os
-import scipy.signal as signal
-import networkx as nx
-import google.generativeai as genai
-from stmol import showmol
-import py3Dmol
-import matplotlib.colors as mcolors
-from matplotlib.animation import FuncAnimation
-from mpl_toolkits.mplot3d import Axes3D
-from streamlit_webrtc import webrtc_streamer, WebRtcMode, RTCConfiguration
 from streamlit_option_menu import option_menu
-from streamlit_lottie import st_lottie
 from streamlit_autorefresh import st_autorefresh
-from streamlit_extras.switch_page_button import switch_page
-from streamlit_extras.add_vertical_space import add_vertical_space
-from streamlit_extras.colored_header import colored_header
-from streamlit_extras.metric_cards import style_metric_cards
-from streamlit_extras.chart_container import chart_container
-from streamlit_extras.stylable_container import stylable_container
-from streamlit_timeline import timeline
-import altair as alt
+from ar import VIEWPORT_SIZE, ARCompositor, equipment_bay_background
+from crew_layout import CrewLayoutCache
+from downsample import HistoryDownsampler
+from emergency import LOCATIONS, SCENARIOS, SEVERITY_LEVELS, EmergencySimulator, outcome_summary
+from events import CATEGORIES, CATEGORY_LABELS, EventStore
+from fleet import FleetProducer, summarize
+from flows import habitat_flow_network, live_flow_inputs
+from figure_templates import FigureSet, gauge_template
+from forecast import ResourceForecaster
+from gestures import GesturePipeline
+from habitat_render import HabitatRenderCache
+from ingest import TelemetryIngestor
+from intents import HABITAT_INTENTS, HABITAT_SLOTS, IntentEngine
+from notifications import NotificationStore
+from profiler import Profiler, ensure_active, profiled
+from roster import CrewRoster
+from simulation import RESOURCE_CHANNELS, TELEMETRY_CHANNELS, generate_maintenance_tasks
+from tasks import PRIORITIES, STATUSES, MaintenanceScheduler, TaskStore
+from telemetry import TelemetryProducer
+from telemetry_log import TelemetryLog
 
 # Initialize session state variables if they don't exist
 if 'initialized' not in st.session_state:
@@ -50,7 +46,9 @@ if 'initialized' not in st.session_state:
     st.session_state.emergency_mode = False
     st.session_state.selected_module = "Dashboard"
     st.session_state.voice_assistant_active = False
-    st.session_state.notifications = []
+    st.session_state.notifications = NotificationStore()
+    st.session_state.notification_page = 0
+    st.session_state.profiler = Profiler()
     st.session_state.crew_data = []
     st.session_state.resource_levels = {}
     st.session_state.maintenance_tasks = []
@@ -59,6 +57,8 @@ if 'initialized' not in st.session_state:
     st.session_state.quantum_predictions = {}
     st.session_state.voice_log = []
     st.session_state.gesture_enabled = True
+    st.session_state.habitat_view = "exterior"
+    st.session_state.snapshot_version = 0
     st.session_state.last_refresh = time.time()
 
 # Configure page settings
@@ -148,6 +148,13 @@ def load_css():
             transform: scale(1.05);
         }
         
+        /* Crew card grid, one HTML block per page */
+        .crew-grid {
+            display: grid;
+            grid-template-columns: repeat(4, minmax(0, 1fr));
+            gap: 16px;
+        }
+        
         /* Custom header and footer */
         .custom-header {
             display: flex;
@@ -274,211 +281,346 @@ load_css()
 
 # Auto-refresh for real-time updates (every 30 seconds)
 refresh_interval = 30
-st_autorefresh(interval=refresh_interval * 1000, key="refresh")
+
+# Telemetry history is stored as epoch seconds and charted in local time
+LOCAL_TIMEZONE = datetime.datetime.now().astimezone().tzinfo
+# In partial mode only the live panels rerun, each on its own timer; in full
+# mode the whole script reruns on the timer as before
+partial_refresh = st.session_state.get("refresh_mode", "Partial") == "Partial"
+if not partial_refresh:
+    st_autorefresh(interval=refresh_interval * 1000, key="refresh")
+def session_fragment(run_every=None):
+    """Return a decorator making a fragment whose own reruns report to this session's profiler."""
+    fragment = st.fragment(run_every=run_every)
+    def decorate(func):
+        @functools.wraps(func)
+        def panel(*args, **kwargs):
+            # Fragment reruns skip the top of the script, where the profiler is activated
+            ensure_active(st.session_state.profiler)
+            return func(*args, **kwargs)
+        return fragment(panel)
+    return decorate
+
+live_panel = session_fragment(refresh_interval if partial_refresh else None)
 
 # Helper Functions
 def get_current_time():
     """Return formatted current time string."""
     return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-def generate_resource_data():
-    """Generate simulated resource levels data."""
-    return {
-        "Oxygen": random.uniform(85, 98),
-        "Water": random.uniform(75, 95),
-        "Food": random.uniform(80, 92),
-        "Power": random.uniform(82, 97),
-        "Fuel": random.uniform(70, 90)
-    }
+@st.cache_resource
+def get_telemetry_log():
+    """Open the on-disk telemetry log in HABITAT_DATA_DIR; an empty value disables it."""
+    directory = os.environ.get("HABITAT_DATA_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "habitat_data"))
+    if not directory:
+        return None
+    return TelemetryLog(directory, TELEMETRY_CHANNELS)
 
-def generate_crew_data():
-    """Generate simulated crew data."""
-    crew_members = [
-        {"id": 1, "name": "Cmdr. Sarah Chen", "role": "Commander", "status": "On Duty", "location": "Command Center", "health": 97},
-        {"id": 2, "name": "Dr. Michael Rodriguez", "role": "Medical Officer", "status": "On Duty", "location": "Medical Bay", "health": 94},
-        {"id": 3, "name": "Eng. Aisha Kapoor", "role": "Chief Engineer", "status": "On Duty", "location": "Engine Room", "health": 92},
-        {"id": 4, "name": "Dr. James Wilson", "role": "Science Officer", "status": "Off Duty", "location": "Quarters", "health": 98},
-        {"id": 5, "name": "Lt. Yuki Tanaka", "role": "Navigation Specialist", "status": "On Duty", "location": "Bridge", "health": 95},
-        {"id": 6, "name": "Eng. Carlos Mendez", "role": "Systems Engineer", "status": "Off Duty", "location": "Recreation", "health": 91},
-        {"id": 7, "name": "Dr. Elena Petrov", "role": "Botanist", "status": "On Duty", "location": "Hydroponics", "health": 96},
-        {"id": 8, "name": "Tech. Daniel Kim", "role": "Communications", "status": "On Duty", "location": "Comms Center", "health": 93}
-    ]
-    return crew_members
-
-def generate_maintenance_tasks():
-    """Generate simulated maintenance tasks."""
-    tasks = [
-        {"id": "T-1001", "description": "Filter replacement in Section A", "priority": "High", "assigned_to": "Eng. Aisha Kapoor", "status": "In Progress", "due": "2025-04-01"},
-        {"id": "T-1002", "description": "Calibrate radiation sensors", "priority": "Medium", "assigned_to": "Tech. Daniel Kim", "status": "Pending", "due": "2025-04-02"},
-        {"id": "T-1003", "description": "Life support system check", "priority": "High", "assigned_to": "Eng. Carlos Mendez", "status": "Completed", "due": "2025-03-30"},
-        {"id": "T-1004", "description": "Hydroponics nutrient cycle", "priority": "Medium", "assigned_to": "Dr. Elena Petrov", "status": "Pending", "due": "2025-04-03"},
-        {"id": "T-1005", "description": "Quantum computer cooling system", "priority": "High", "assigned_to": "Eng. Aisha Kapoor", "status": "Pending", "due": "2025-04-01"}
-    ]
-    return tasks
-
-def generate_environmental_data():
-    """Generate simulated environmental data."""
-    return {
-        "temperature": random.uniform(20.5, 22.5),
-        "pressure": random.uniform(99.5, 101.5),
-        "humidity": random.uniform(40, 60),
-        "co2_level": random.uniform(350, 450),
-        "radiation": random.uniform(0.05, 0.15),
-        "sound_level": random.uniform(30, 45)
-    }
+@st.cache_resource
+def get_telemetry_producer():
+    """Return the telemetry producer shared by every session in this process."""
+    seed = os.environ.get("HABITAT_SIMULATION_SEED")
+    return TelemetryProducer(
+        refresh_interval,
+        backfill_days=float(os.environ.get("HABITAT_BACKFILL_DAYS", 0)),
+        seed=None if seed is None else int(seed),
+        log=get_telemetry_log(),
+    )
 
-def generate_power_systems_data():
-    """Generate simulated power systems data."""
-    return {
-        "solar_array": random.uniform(85, 99),
-        "main_battery": random.uniform(70, 95),
-        "backup_generators": random.uniform(98, 100),
-        "power_consumption": random.uniform(60, 85),
-        "efficiency": random.uniform(88, 97)
-    }
+@st.cache_resource
+def get_fleet_producer():
+    """Start fleet mode if HABITAT_FLEET_SIZE is set to more than one habitat."""
+    habitats = int(os.environ.get("HABITAT_FLEET_SIZE") or 0)
+    if habitats < 2:
+        return None
+    workers = os.environ.get("HABITAT_FLEET_WORKERS")
+    seed = os.environ.get("HABITAT_SIMULATION_SEED")
+    return FleetProducer(
+        habitats,
+        refresh_interval,
+        workers=None if not workers else int(workers),
+        seed=None if seed is None else int(seed),
+    )
 
-def generate_quantum_predictions():
-    """Generate simulated quantum predictions for space events."""
-    return {
-        "solar_storms": [
-            {"time": "2025-04-02T14:35:00", "intensity": random.uniform(1.5, 7.5), "probability": random.uniform(0.6, 0.95)},
-            {"time": "2025-04-05T08:12:00", "intensity": random.uniform(2.5, 5.5), "probability": random.uniform(0.5, 0.85)}
-        ],
-        "cosmic_radiation": [
-            {"time": "2025-04-01T22:45:00", "intensity": random.uniform(0.5, 3.5), "duration": f"{random.randint(1, 5)} hours", "probability": random.uniform(0.7, 0.9)}
-        ],
-        "asteroid_threats": [
-            {"object_id": f"NEO-{random.randint(10000, 99999)}", "closest_approach": "2025-04-07T11:30:00", "distance": f"{random.uniform(0.5, 3.5):.2f} lunar distances", "diameter": f"{random.uniform(10, 100):.1f}m", "probability": random.uniform(0.01, 0.1)}
-        ]
-    }
+@st.cache_resource
+def get_emergency_simulator():
+    """Return the shared Monte Carlo emergency simulator and its result cache."""
+    seed = os.environ.get("HABITAT_SIMULATION_SEED")
+    return EmergencySimulator(seed=None if seed is None else int(seed))
 
+@st.cache_resource
+def get_flow_network():
+    """Return the habitat resource flow network shared by every session."""
+    return habitat_flow_network()
+
+@st.cache_resource(max_entries=2)
+def get_event_store(version, _predictions):
+    """Index the quantum predictions of a snapshot version once, for every session."""
+    return EventStore.from_predictions(_predictions)
+
+@st.cache_resource
+def get_task_store():
+    """Return the maintenance task store, with changes persisted in the telemetry log replayed."""
+    log = get_telemetry_log()
+    store = TaskStore(generate_maintenance_tasks(), log=log)
+    if log is not None:
+        log.flush()
+        store.replay(log.task_changes())
+    return store
+
+@st.cache_resource
+def get_maintenance_scheduler():
+    """Return the shared crew assignment scheduler and its plan cache."""
+    return MaintenanceScheduler()
+
+@st.cache_resource(max_entries=2)
+def get_crew_roster(version, _crew_data):
+    """Build the columnar crew roster of a snapshot version once, for every session."""
+    return CrewRoster(_crew_data)
+
+@st.cache_resource
+def get_resource_forecaster():
+    """Return the resource forecaster over the shared telemetry history."""
+    return ResourceForecaster(get_telemetry_producer().history, RESOURCE_CHANNELS)
+
+@st.cache_resource
+def get_history_downsampler():
+    """Return the shared cache of downsampled history series for charts."""
+    return HistoryDownsampler(get_telemetry_producer().history)
+
+@st.cache_resource
+def get_telemetry_ingestor():
+    """Start ingesting real sensor readings if HABITAT_TELEMETRY_SOURCE is set."""
+    source = os.environ.get("HABITAT_TELEMETRY_SOURCE")
+    if not source:
+        return None
+    fmt = os.environ.get("HABITAT_TELEMETRY_FORMAT", "json")
+    return TelemetryIngestor(get_telemetry_producer(), source, fmt).start()
+
+@profiled
+def get_history_frame(channels, days, width=None, method="minmax"):
+    """Return the recorded history of channels over the last `days` as a DataFrame.
+
+    With a chart width in pixels the series are downsampled server-side, so
+    the frame holds a few points per pixel however long the window is.
+    Min/max buckets keep the same sample times for every channel; LTTB picks
+    its own per channel, so it takes a single channel.
+    """
+    if width is not None and method == "lttb" and len(channels) > 1:
+        raise ValueError("LTTB downsampling picks different times per channel; request one channel per frame")
+    history = get_telemetry_producer().history
+    if width is None:
+        times, values = history.window(start=time.time() - days * 86400)
+        df = pd.DataFrame(values[:, [history.column(channel) for channel in channels]], columns=channels)
+    else:
+        downsampler = get_history_downsampler()
+        series = [downsampler.series(channel, days, width, method) for channel in channels]
+        times = series[0][0]
+        df = pd.DataFrame({channel: values for channel, (_, values) in zip(channels, series)})
+    df.insert(0, 'Date', pd.to_datetime(times, unit='s', utc=True).tz_convert(LOCAL_TIMEZONE).tz_localize(None))
+    return df
+
+@profiled
 def update_simulation_data():
-    """Update all simulation data."""
-    # Only update if enough time has passed since last refresh
-    current_time = time.time()
-    if current_time - st.session_state.last_refresh >= refresh_interval:
-        st.session_state.resource_levels = generate_resource_data()
-        st.session_state.crew_data = generate_crew_data()
-        st.session_state.maintenance_tasks = generate_maintenance_tasks()
-        st.session_state.environmental_data = generate_environmental_data()
-        st.session_state.power_systems = generate_power_systems_data()
-        st.session_state.quantum_predictions = generate_quantum_predictions()
-        
-        # Random chance of generating a notification
-        if random.random() < 0.3:  # 30% chance
-            system = random.choice(["Environmental", "Power", "Life Support", "Navigation", "Communications"])
-            message = random.choice([
-                f"{system} systems showing slight anomaly",
-                f"{system} performance optimized",
-                f"Scheduled maintenance for {system} system due",
-                f"{system} diagnostic complete"
-            ])
-            severity = random.choice(["info", "warning", "critical"])
-            add_notification(message, severity)
-            
-        st.session_state.last_refresh = current_time
+    """Pull the latest shared telemetry snapshot into this session."""
+    producer = get_telemetry_producer()
+    snapshot = producer.snapshot
+    if snapshot.version == st.session_state.snapshot_version:
+        return
+    
+    # Snapshots are immutable, so sessions share them without copying
+    st.session_state.resource_levels = snapshot.resource_levels
+    st.session_state.crew_data = snapshot.crew_data
+    st.session_state.maintenance_tasks = snapshot.maintenance_tasks
+    st.session_state.environmental_data = snapshot.environmental_data
+    st.session_state.power_systems = snapshot.power_systems
+    st.session_state.quantum_predictions = snapshot.quantum_predictions
+    st.session_state.system_status = snapshot.system_status
+    
+    # Producer notifications are already persisted by the producer itself
+    log = producer.log
+    if st.session_state.snapshot_version == 0 and log is not None:
+        # A new session starts from the persisted notification history
+        log.flush()
+        for timestamp, message, severity in log.notifications(limit=NOTIFICATION_HISTORY):
+            st.session_state.notifications.add(message, severity, timestamp=timestamp)
+        st.session_state.notifications.mark_all_read()
+    else:
+        for message, severity in producer.notifications_since(st.session_state.snapshot_version):
+            st.session_state.notifications.add(message, severity)
+    
+    st.session_state.snapshot_version = snapshot.version
+    st.session_state.last_refresh = snapshot.timestamp
 
 def add_notification(message, severity="info"):
-    """Add a notification to the notification center."""
-    notification = {
-        "id": str(uuid.uuid4()),
-        "time": get_current_time(),
-        "message": message,
-        "severity": severity,
-        "read": False
-    }
-    st.session_state.notifications.insert(0, notification)
-    # Keep only the last 50 notifications
-    if len(st.session_state.notifications) > 50:
-        st.session_state.notifications = st.session_state.notifications[:50]
+    """Add a notification to the notification center and the persistent log."""
+    log = get_telemetry_log()
+    if log is not None:
+        log.log_notification(message, severity)
+    return st.session_state.notifications.add(message, severity)
+
+@st.cache_resource
+def get_intent_engine():
+    """Compile the assistant's command patterns once per process."""
+    return IntentEngine(HABITAT_INTENTS, HABITAT_SLOTS)
 
 def process_voice_command(command):
     """Process voice commands from the AI assistant."""
-    command = command.lower()
+    match = get_intent_engine().match(command)
     response = "I didn't understand that command."
     
-    # General commands
-    if "status" in command or "report" in command:
+    if match is None:
+        pass
+    elif match.intent == "status":
         response = f"All systems are {st.session_state.system_status.lower()}. Current time is {get_current_time()}."
-    elif "switch to" in command or "open" in command or "show" in command:
-        for module in ["dashboard", "crew", "resources", "maintenance", "environmental", "power", "3d view", "quantum"]:
-            if module in command:
-                st.session_state.selected_module = module.title().replace("3d", "3D")
-                response = f"Switching to {module} module."
-                break
-    elif "emergency" in command:
-        if "activate" in command or "enable" in command:
-            st.session_state.emergency_mode = True
-            response = "Emergency protocols activated."
-        elif "deactivate" in command or "disable" in command:
-            st.session_state.emergency_mode = False
-            response = "Emergency protocols deactivated."
-    elif "dark mode" in command or "light mode" in command:
-        st.session_state.dark_mode = "dark" in command
-        response = f"Switching to {'dark' if st.session_state.dark_mode else 'light'} mode."
+    elif match.intent == "navigate":
+        st.session_state.selected_module = match.slots["module"]
+        st.session_state.navigate_to = match.slots["module"]
+        response = f"Switching to {match.slots['module']} module."
+    elif match.intent == "emergency":
+        st.session_state.emergency_mode = match.slots["state"]
+        response = f"Emergency protocols {'activated' if match.slots['state'] else 'deactivated'}."
+    elif match.intent == "theme":
+        st.session_state.dark_mode = match.slots["theme"] == "dark"
+        response = f"Switching to {match.slots['theme']} mode."
     
     # Add the response to the voice log
     st.session_state.voice_log.append({"role": "assistant", "content": response})
     return response
 
-def get_3d_habitat_visualization():
+@st.cache_resource
+def get_habitat_render_cache():
+    """Return the habitat image cache shared by every session in this process."""
+    return HabitatRenderCache()
+
+@st.cache_resource
+def get_crew_layout_cache():
+    """Return the crew location graph cache shared by every session in this process."""
+    return CrewLayoutCache()
+
+@st.cache_resource
+def get_figure_templates():
+    """Build the static figure templates once per process."""
+    return {
+        "temperature": gauge_template(
+            axis_range=(18, 25), reference=21.0, threshold=23, decreasing_color="green",
+            steps=[((18, 19.5), 'cyan'), ((19.5, 22.5), 'royalblue'), ((22.5, 25), 'red')]),
+        "pressure": gauge_template(
+            axis_range=(95, 105), reference=101.3, threshold=103,
+            steps=[((95, 98), 'red'), ((98, 102.5), 'royalblue'), ((102.5, 105), 'red')]),
+        "humidity": gauge_template(
+            axis_range=(20, 70), reference=45, threshold=65,
+            steps=[((20, 30), 'red'), ((30, 60), 'royalblue'), ((60, 70), 'red')]),
+    }
+
+def get_session_figures():
+    """Return this session's figures, cloned from the shared templates."""
+    if "figures" not in st.session_state:
+        st.session_state.figures = FigureSet(get_figure_templates())
+    return st.session_state.figures
+
+@profiled
+def get_3d_habitat_visualization(elevation=20, azimuth=45, zoom=1.0, highlights=()):
     """Generate a 3D visualization of the space habitat."""
-    # This would ideally be a complex 3D model, but for simplicity, we'll create a basic 3D plot
-    fig = plt.figure(figsize=(10, 8))
-    ax = fig.add_subplot(111, projection='3d')
-    
-    # Create a cylinder (main habitat body)
-    theta = np.linspace(0, 2*np.pi, 100)
-    z = np.linspace(-3, 3, 100)
-    theta, z = np.meshgrid(theta, z)
-    r = 1
-    x = r * np.cos(theta)
-    y = r * np.sin(theta)
-    
-    # Plot the main cylinder
-    ax.plot_surface(x, y, z, color='silver', alpha=0.7)
-    
-    # Add solar panels
-    panel_x = np.array([[-3, -3], [3, 3]])
-    panel_y = np.array([[-0.5, 0.5], [-0.5, 0.5]])
-    panel_z = np.array([[0, 0], [0, 0]])
-    ax.plot_surface(panel_x, panel_y, panel_z, color='blue', alpha=0.6)
-    
-    # Add a sphere for the command module
-    u = np.linspace(0, 2 * np.pi, 100)
-    v = np.linspace(0, np.pi, 100)
-    x = 0.7 * np.outer(np.cos(u), np.sin(v)) + 0
-    y = 0.7 * np.outer(np.sin(u), np.sin(v)) + 0
-    z = 0.7 * np.outer(np.ones(np.size(u)), np.cos(v)) + 3.5
-    ax.plot_surface(x, y, z, color='gold', alpha=0.7)
-    
-    # Remove axis labels and ticks
-    ax.set_xlabel('')
-    ax.set_ylabel('')
-    ax.set_zlabel('')
-    ax.set_xticks([])
-    ax.set_yticks([])
-    ax.set_zticks([])
-    
-    # Set limits
-    ax.set_xlim([-3, 3])
-    ax.set_ylim([-3, 3])
-    ax.set_zlim([-3, 3])
-    
-    # Set the view angle
-    ax.view_init(elev=20, azim=45)
-    
-    # Set a dark background
-    ax.set_facecolor((0.1, 0.1, 0.2))
-    fig.patch.set_facecolor((0.1, 0.1, 0.2))
-    
-    # Convert to a plotly figure for better interactivity
-    buf = BytesIO()
-    plt.savefig(buf, format='png', bbox_inches='tight', transparent=True)
-    buf.seek(0)
-    return buf
+    # Rendered images are cached per view, so a hit never touches matplotlib
+    return BytesIO(get_habitat_render_cache().get(elevation, azimuth, zoom, highlights))
+
+# Approximate plot width in pixels of a chart in a two-column row of the wide layout
+HALF_CHART_WIDTH = 700
+# High-priority tasks listed on the dashboard, soonest due first
+PRIORITY_TASKS_SHOWN = 8
+
+# Prediction tabs and their horizons in days
+FORECAST_HORIZONS = {"7 Days": 7, "30 Days": 30, "90 Days": 90}
+# Forecast line colors (RGB) per resource
+FORECAST_COLORS = {"Oxygen": "0, 100, 80", "Water": "0, 176, 246", "Food": "231, 107, 243"}
+
+# Notifications shown per sidebar page
+NOTIFICATIONS_PER_PAGE = 5
+# Persisted notifications loaded into a new session
+NOTIFICATION_HISTORY = 100
+
+# Systems that can be highlighted in the 3D view and whether they start enabled
+HABITAT_HIGHLIGHT_DEFAULTS = {
+    "Life Support": True,
+    "Power Systems": True,
+    "Structural Integrity": True,
+    "Communication Arrays": False,
+}
 
 # Main Interface Components
+@live_panel
+@profiled
+def render_system_status():
+    """Render the live system status card."""
+    update_simulation_data()
+    status_color = {
+        "Nominal": "status-nominal",
+        "Warning": "status-warning",
+        "Critical": "status-critical"
+    }
+    st.markdown(f"""
+        <div class="info-card">
+            <div class="{status_color.get(st.session_state.system_status, 'status-nominal')}">
+                {st.session_state.system_status}
+            </div>
+            <div class="system-time">
+                {get_current_time()}
+            </div>
+        </div>
+    """, unsafe_allow_html=True)
+
+@live_panel
+@profiled
+def render_notifications():
+    """Render the live, paginated notification list."""
+    update_simulation_data()
+    notifications = st.session_state.notifications
+    unread = notifications.unread_count()
+    st.subheader(f"Notifications ({unread} unread)" if unread else "Notifications")
+    if not len(notifications):
+        st.info("No new notifications")
+    else:
+        pages = (len(notifications) - 1) // NOTIFICATIONS_PER_PAGE + 1
+        page = min(st.session_state.notification_page, pages - 1)
+        for notification in notifications.page(page * NOTIFICATIONS_PER_PAGE, NOTIFICATIONS_PER_PAGE):
+            severity_class = {
+                "info": "status-nominal",
+                "warning": "status-warning",
+                "critical": "status-critical"
+            }.get(notification["severity"], "status-nominal")
+            repeats = f" (×{notification['count']})" if notification["count"] > 1 else ""
+            
+            with st.container():
+                st.markdown(f"""
+                    <div class="info-card" style="padding: 10px; margin-bottom: 10px;">
+                        <div class="{severity_class}" style="font-size: 14px;">
+                            {notification["message"]}{repeats}
+                        </div>
+                        <div style="font-size: 12px; color: gray;">
+                            {notification["time"]}
+                        </div>
+                    </div>
+                """, unsafe_allow_html=True)
+        
+        if pages > 1:
+            cols = st.columns([1, 2, 1])
+            with cols[0]:
+                if st.button("◀", key="notifications_newer", disabled=page == 0):
+                    st.session_state.notification_page = page - 1
+                    st.rerun()
+            with cols[1]:
+                st.caption(f"Page {page + 1} of {pages}")
+            with cols[2]:
+                if st.button("▶", key="notifications_older", disabled=page >= pages - 1):
+                    st.session_state.notification_page = page + 1
+                    st.rerun()
+        
+        if unread and st.button("Mark all read"):
+            notifications.mark_all_read()
+            st.rerun()
+
+@profiled
 def render_sidebar():
     """Render the sidebar with navigation and controls."""
     with st.sidebar:
@@ -487,39 +629,31 @@ def render_sidebar():
         
         # Main navigation
         st.subheader("Navigation")
+        options = [
+            "Dashboard", "3D View", "Crew", "Resources", 
+            "Environmental", "Power", "Maintenance", "Quantum",
+            "Emergency", "AR"
+        ]
+        # Voice and gesture commands select a page through the menu itself
+        navigate_to = st.session_state.pop("navigate_to", None)
         selected = option_menu(
             menu_title=None,
-            options=[
-                "Dashboard", "3D View", "Crew", "Resources", 
-                "Environmental", "Power", "Maintenance", "Quantum"
-            ],
+            options=options,
             icons=[
                 "speedometer2", "box", "people", "droplet", 
-                "thermometer-half", "lightning", "tools", "cpu"
+                "thermometer-half", "lightning", "tools", "cpu",
+                "exclamation-triangle", "eyeglasses"
             ],
             menu_icon="cast",
             default_index=0,
+            manual_select=options.index(navigate_to) if navigate_to in options else None,
             key="main_menu"
         )
         st.session_state.selected_module = selected
         
         # System status indicator
         st.subheader("System Status")
-        status_color = {
-            "Nominal": "status-nominal",
-            "Warning": "status-warning",
-            "Critical": "status-critical"
-        }
-        st.markdown(f"""
-            <div class="info-card">
-                <div class="{status_color.get(st.session_state.system_status, 'status-nominal')}">
-                    {st.session_state.system_status}
-                </div>
-                <div class="system-time">
-                    {get_current_time()}
-                </div>
-            </div>
-        """, unsafe_allow_html=True)
+        render_system_status()
         
         # Controls
         st.subheader("Controls")
@@ -539,41 +673,104 @@ def render_sidebar():
         
         # Gesture control toggle
         st.checkbox("Enable Gesture Control", value=st.session_state.gesture_enabled, key="gesture_toggle")
+        render_gesture_control(st.session_state.gesture_toggle)
         
         # Voice assistant toggle
         if st.button("🎤 Voice Assistant"):
             st.session_state.voice_assistant_active = not st.session_state.voice_assistant_active
+        if st.session_state.voice_assistant_active:
+            render_voice_assistant()
+        
+        # Refresh mode
+        st.radio("Refresh Mode", ["Partial", "Full"], horizontal=True, key="refresh_mode",
+                 help="Partial reruns only the live panels; Full reruns the whole page.")
         
         # Notifications
-        st.subheader("Notifications")
-        if not st.session_state.notifications:
-            st.info("No new notifications")
-        else:
-            for i, notification in enumerate(st.session_state.notifications[:5]):
-                severity_class = {
-                    "info": "status-nominal",
-                    "warning": "status-warning",
-                    "critical": "status-critical"
-                }.get(notification["severity"], "status-nominal")
-                
-                with st.container():
-                    st.markdown(f"""
-                        <div class="info-card" style="padding: 10px; margin-bottom: 10px;">
-                            <div class="{severity_class}" style="font-size: 14px;">
-                                {notification["message"]}
-                            </div>
-                            <div style="font-size: 12px; color: gray;">
-                                {notification["time"]}
-                            </div>
-                        </div>
-                    """, unsafe_allow_html=True)
-            
-            if len(st.session_state.notifications) > 5:
-                st.info(f"{len(st.session_state.notifications) - 5} more notifications...")
+        render_notifications()
 
-def render_dashboard():
-    """Render the main dashboard with overview of all systems."""
-    st.header("Habitat Command Dashboard")
+VOICE_LOG_SHOWN = 6
+
+@profiled
+def render_voice_assistant():
+    """Take a spoken (transcribed) or typed command and show the recent exchange."""
+    with st.form("voice_command", clear_on_submit=True, border=False):
+        command = st.text_input("Command", placeholder="e.g. take me to the crew page",
+                                label_visibility="collapsed")
+        submitted = st.form_submit_button("Send")
+    if submitted and command.strip():
+        st.session_state.voice_log.append({"role": "user", "content": command})
+        process_voice_command(command)
+        # Navigation and theme changes take effect on a fresh run
+        st.rerun()
+    for entry in st.session_state.voice_log[-VOICE_LOG_SHOWN:]:
+        prefix = "🧑‍🚀" if entry["role"] == "user" else "🤖"
+        st.caption(f"{prefix} {entry['content']}")
+
+@profiled
+def render_gesture_control(enabled):
+    """Stream the camera into this session's gesture pipeline while enabled.
+
+    The recognition worker and the status fragment only run while the camera
+    stream is playing.
+    """
+    pipeline = st.session_state.get("gesture_pipeline")
+    if not enabled:
+        if pipeline is not None:
+            pipeline.stop()
+            del st.session_state.gesture_pipeline
+        return
+    try:
+        webrtc = lazy_import("streamlit_webrtc")
+    except ImportError:
+        st.caption("Gesture control needs the streamlit-webrtc and mediapipe packages.")
+        return
+    if pipeline is None:
+        pipeline = st.session_state.gesture_pipeline = GesturePipeline()
+    
+    # Runs on the WebRTC thread: hand the frame off and return it untouched
+    def forward_frame(frame):
+        pipeline.submit(frame.to_ndarray(format="rgb24"))
+        return frame
+    
+    context = webrtc.webrtc_streamer(
+        key="gesture_camera",
+        mode=webrtc.WebRtcMode.SENDRECV,
+        video_frame_callback=forward_frame,
+        media_stream_constraints={"video": True, "audio": False},
+        async_processing=True,
+    )
+    if context.state.playing:
+        pipeline.start()
+        render_gesture_status()
+    else:
+        pipeline.stop()
+
+@session_fragment(run_every=1)
+@profiled
+def render_gesture_status():
+    """Show gesture pipeline health and follow gesture navigation."""
+    pipeline = st.session_state.get("gesture_pipeline")
+    if pipeline is None:
+        return
+    stats = pipeline.stats()
+    if stats["error"] and not stats["processed"]:
+        st.warning(f"Gesture recognition unavailable: {stats['error']}")
+        return
+    if stats["processed"]:
+        st.caption(f"Gesture: {stats['gesture'] or 'none'} · latency p50 {stats['latency_ms_p50']:.0f} ms · "
+                   f"p95 {stats['latency_ms_p95']:.0f} ms · dropped {stats['drop_rate']:.0%} of frames")
+    if stats["failed"]:
+        st.caption(f"{stats['failed']:,} frames failed recognition; last error: {stats['error']}")
+    module = pipeline.poll_navigation()
+    if module is not None and module != st.session_state.selected_module:
+        st.session_state.navigate_to = module
+        st.rerun(scope="app")
+
+@live_panel
+@profiled
+def render_dashboard_metrics():
+    """Render the live system overview and current status metrics."""
+    update_simulation_data()
     
     # System overview cards
     col1, col2, col3 = st.columns(3)
@@ -581,11 +778,10 @@ def render_dashboard():
     with col1:
         st.subheader("Life Support")
         oxygen = st.session_state.resource_levels.get("Oxygen", 95)
-        oxygen_color = "green" if oxygen > 90 else "orange" if oxygen > 80 else "red"
         st.metric("Oxygen Level", f"{oxygen:.1f}%", delta=f"{(oxygen-90):.1f}%")
-        
+    
         st.progress(oxygen/100, text="")
-        
+    
         water = st.session_state.resource_levels.get("Water", 85)
         st.metric("Water Reserves", f"{water:.1f}%", delta=f"{(water-80):.1f}%")
         st.progress(water/100, text="")
@@ -595,7 +791,7 @@ def render_dashboard():
         power = st.session_state.power_systems.get("solar_array", 90)
         st.metric("Solar Array Efficiency", f"{power:.1f}%", delta=f"{(power-88):.1f}%")
         st.progress(power/100, text="")
-        
+    
         battery = st.session_state.power_systems.get("main_battery", 80)
         st.metric("Main Battery", f"{battery:.1f}%", delta=f"{(battery-75):.1f}%")
         st.progress(battery/100, text="")
@@ -605,7 +801,7 @@ def render_dashboard():
         on_duty = sum(1 for member in st.session_state.crew_data if member["status"] == "On Duty")
         total_crew = len(st.session_state.crew_data)
         st.metric("On Duty", f"{on_duty}/{total_crew}", delta=f"{on_duty-total_crew//2}")
-        
+    
         avg_health = sum(member["health"] for member in st.session_state.crew_data) / total_crew
         st.metric("Average Health", f"{avg_health:.1f}%", delta=f"{(avg_health-90):.1f}%")
         st.progress(avg_health/100, text="")
@@ -621,29 +817,69 @@ def render_dashboard():
         st.metric("CO₂ Level", f"{st.session_state.environmental_data.get('co2_level', 400):.1f} ppm")
     with col4:
         st.metric("Radiation", f"{st.session_state.environmental_data.get('radiation', 0.1):.3f} μSv/h")
+
+# Fleet overview columns: channel -> label; power consumption is in kW, the rest in %
+FLEET_CHANNELS = {**{name: name for name in RESOURCE_CHANNELS}, **{
+    "solar_array": "Solar Array", "main_battery": "Main Battery", "efficiency": "Efficiency",
+    "power_consumption": "Consumption (kW)"}}
+
+@live_panel
+@profiled
+def render_fleet_overview(fleet):
+    """Render aggregate resource and power levels across every habitat in the fleet."""
+    snapshot = fleet.snapshot
+    st.subheader("Fleet Overview")
+    counts = fleet.status_counts()
+    cols = st.columns(5)
+    cols[0].metric("Habitats", len(snapshot.names))
+    cols[1].metric("Nominal", counts["Nominal"])
+    cols[2].metric("Warning", counts["Warning"])
+    cols[3].metric("Critical", counts["Critical"])
+    cols[4].metric("Fleet Tick", f"{fleet.tick_ms:.0f} ms", help=f"{fleet.simulator.workers} worker processes")
+    if fleet.error:
+        st.warning(f"Fleet simulation error ({fleet.simulator.restarts} worker restarts): {fleet.error}")
+    
+    summary = summarize(snapshot.values, {name: TELEMETRY_CHANNELS.index(name) for name in FLEET_CHANNELS})
+    col1, col2 = st.columns(2)
+    with col1:
+        st.dataframe(pd.DataFrame(
+            [(FLEET_CHANNELS[name], mean, low, high, snapshot.names[lowest])
+             for name, (mean, low, high, lowest) in summary.items()],
+            columns=["Channel", "Fleet Mean", "Min", "Max", "Lowest Habitat"],
+        ).round(1), hide_index=True, use_container_width=True)
+        alerts = snapshot.alerts[-5:]
+        for timestamp, message, severity in reversed(alerts):
+            icon = "🔴" if severity == "critical" else "⚠️" if severity == "warning" else "ℹ️"
+            st.caption(f"{icon} {datetime.datetime.fromtimestamp(timestamp).strftime('%H:%M:%S')} {message}")
+    with col2:
+        # Habitats x percentage channels; one row per habitat scales to large fleets
+        percent = [name for name in FLEET_CHANNELS if name != "power_consumption"]
+        levels = snapshot.values[:, [TELEMETRY_CHANNELS.index(name) for name in percent]]
+        fig = px.imshow(levels, x=[FLEET_CHANNELS[name] for name in percent], y=list(snapshot.names),
+                        zmin=50, zmax=100, color_continuous_scale="RdYlGn", aspect="auto",
+                        labels={"color": "Level (%)"}, title="Resource and Power Levels by Habitat")
+        fig.update_layout(height=max(300, 18 * len(snapshot.names) + 120))
+        st.plotly_chart(fig, use_container_width=True)
+
+@profiled
+def render_dashboard():
+    """Render the main dashboard with overview of all systems."""
+    st.header("Habitat Command Dashboard")
+    
+    # Live metric cards
+    render_dashboard_metrics()
+    
+    fleet = get_fleet_producer()
+    if fleet is not None:
+        render_fleet_overview(fleet)
     
     # Charts
     st.subheader("System Trends")
     col1, col2 = st.columns(2)
     
     with col1:
-        # Generate resource usage data
-        days = 14
-        dates = [datetime.datetime.now() - datetime.timedelta(days=i) for i in range(days)]
-        dates.reverse()
-        
-        # Generate synthetic resource usage data with some patterns
-        oxygen_data = [95 + random.uniform(-2, 2) + 3*np.sin(i/5) for i in range(days)]
-        water_data = [90 + random.uniform(-3, 1) - i/10 for i in range(days)]
-        power_data = [92 + random.uniform(-4, 2) + 5*np.sin(i/3) for i in range(days)]
-        
-        # Create dataframe
-        df = pd.DataFrame({
-            'Date': dates,
-            'Oxygen': oxygen_data,
-            'Water': water_data,
-            'Power': power_data
-        })
+        # Recorded resource levels
+        df = get_history_frame(['Oxygen', 'Water', 'Power'], days=14, width=HALF_CHART_WIDTH)
         
         # Plot with Plotly
         fig = px.line(df, x='Date', y=['Oxygen', 'Water', 'Power'],
@@ -653,19 +889,9 @@ def render_dashboard():
         st.plotly_chart(fig, use_container_width=True)
     
     with col2:
-        # Generate power consumption data
-        hours = 24
-        times = [datetime.datetime.now() - datetime.timedelta(hours=i) for i in range(hours)]
-        times.reverse()
-        
-        # Synthetic power consumption with day/night pattern
-        base_consumption = [65 + 20*np.sin(np.pi*i/12) + random.uniform(-5, 5) for i in range(hours)]
-        
-        # Create dataframe
-        power_df = pd.DataFrame({
-            'Time': times,
-            'Consumption': base_consumption
-        })
+        # Recorded power consumption
+        power_df = get_history_frame(['power_consumption'], days=1, width=HALF_CHART_WIDTH, method="lttb").rename(
+            columns={'Date': 'Time', 'power_consumption': 'Consumption'})
         
         # Plot with Plotly
         fig = px.area(power_df, x='Time', y='Consumption',
@@ -677,8 +903,8 @@ def render_dashboard():
     col1, col2 = st.columns(2)
     
     with col1:
-                st.subheader("Priority Tasks")
-                high_priority_tasks = [task for task in st.session_state.maintenance_tasks if task["priority"] == "High"]
+        st.subheader("Priority Tasks")
+        high_priority_tasks = get_task_store().query(priority="High", limit=PRIORITY_TASKS_SHOWN)
         if high_priority_tasks:
             for task in high_priority_tasks:
                 with st.container():
@@ -697,6 +923,7 @@ def render_dashboard():
         else:
             st.info("No high priority tasks at this time.")
 
+@profiled
 def render_3d_view():
     """Render the 3D habitat visualization."""
     st.header("3D Habitat Digital Twin")
@@ -738,7 +965,21 @@ def render_3d_view():
                 height=700
             )
             st.plotly_chart(fig, use_container_width=True)
+        elif st.session_state.habitat_view in ("exterior", "systems"):
+            # View controls below are keyed, so their last values drive the render
+            highlights = [system for system, default in HABITAT_HIGHLIGHT_DEFAULTS.items()
+                          if st.session_state.get(f"highlight_{system}", default)]
+            image = get_3d_habitat_visualization(
+                elevation=st.session_state.get("habitat_elevation", 45),
+                azimuth=st.session_state.get("habitat_azimuth", 45),
+                zoom=st.session_state.get("habitat_zoom", 1.0),
+                highlights=highlights if st.session_state.habitat_view == "systems" else ()
+            )
+            st.image(image, use_container_width=True)
         else:
+            py3Dmol = lazy_import("py3Dmol")
+            showmol = lazy_import("stmol").showmol
+            
             # Use py3Dmol for more advanced molecular-style visualization
             # This is a placeholder - in a real application, you would load actual 3D models
             view = py3Dmol.view(width=800, height=600)
@@ -757,103 +998,83 @@ def render_3d_view():
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.slider("Zoom", min_value=0.5, max_value=2.0, value=1.0, step=0.1)
+            st.slider("Zoom", min_value=0.5, max_value=2.0, value=1.0, step=0.1, key="habitat_zoom")
         with col2:
-            st.slider("Rotation X", min_value=0, max_value=360, value=45, step=15)
+            st.slider("Rotation X", min_value=0, max_value=360, value=45, step=15, key="habitat_azimuth")
         with col3:
-            st.slider("Rotation Y", min_value=0, max_value=360, value=45, step=15)
+            st.slider("Rotation Y", min_value=0, max_value=360, value=45, step=15, key="habitat_elevation")
     
     # System highlights
     with st.container():
         st.subheader("System Highlights")
-        col1, col2, col3, col4 = st.columns(4)
+        cols = st.columns(len(HABITAT_HIGHLIGHT_DEFAULTS))
         
-        with col1:
-            st.checkbox("Life Support", value=True)
-        with col2:
-            st.checkbox("Power Systems", value=True)
-        with col3:
-            st.checkbox("Structural Integrity", value=True)
-        with col4:
-            st.checkbox("Communication Arrays", value=False)
+        for col, (system, default) in zip(cols, HABITAT_HIGHLIGHT_DEFAULTS.items()):
+            with col:
+                st.checkbox(system, value=default, key=f"highlight_{system}")
+
+# Crew cards per page: four rows of four
+CREW_CARDS_PER_PAGE = 16
 
+@profiled
 def render_crew():
     """Render the crew management interface."""
+    timeline = lazy_import("streamlit_timeline").timeline
+    
     st.header("Crew Management")
     
+    roster = get_crew_roster(st.session_state.snapshot_version, st.session_state.crew_data)
+    
     # Crew filtering
-    filter_options = ["All", "On Duty", "Off Duty"]
-    selected_filter = st.radio("Filter by status:", filter_options, horizontal=True)
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        filter_options = ["All", "On Duty", "Off Duty"]
+        selected_filter = st.radio("Filter by status:", filter_options, horizontal=True)
+    with col2:
+        selected_location = st.selectbox("Location", ["All", *roster.locations])
     
-    # Filter crew data based on selection
-    filtered_crew = st.session_state.crew_data
-    if selected_filter != "All":
-        filtered_crew = [member for member in st.session_state.crew_data if member["status"] == selected_filter]
+    # Filter crew data based on selection, through the roster's indexes
+    rows = roster.filter(
+        status=None if selected_filter == "All" else selected_filter,
+        location=None if selected_location == "All" else selected_location,
+    )
     
     # Crew grid
     st.subheader("Crew Status")
     
-    # Create a grid of crew members
-    cols_per_row = 4
-    rows = [filtered_crew[i:i+cols_per_row] for i in range(0, len(filtered_crew), cols_per_row)]
-    
-    for row in rows:
-        cols = st.columns(cols_per_row)
-        for i, member in enumerate(row):
-            with cols[i]:
-                health_color = "green" if member["health"] > 95 else "orange" if member["health"] > 85 else "red"
-                
-                st.markdown(f"""
-                <div class="info-card" style="padding: 15px;">
-                    <h4>{member["name"]}</h4>
-                    <p><strong>Role:</strong> {member["role"]}</p>
-                    <p><strong>Status:</strong> {member["status"]}</p>
-                    <p><strong>Location:</strong> {member["location"]}</p>
-                    <div style="margin-top: 10px;">
-                        <span>Health: </span>
-                        <span style="color: {health_color}; font-weight: bold;">{member["health"]}%</span>
-                    </div>
+    # Only the visible page of cards is built, as a single HTML block
+    pages = max(1, -(-len(rows) // CREW_CARDS_PER_PAGE))
+    page = 1
+    if pages > 1:
+        page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+    first = (page - 1) * CREW_CARDS_PER_PAGE
+    visible = roster.records(rows[first:first + CREW_CARDS_PER_PAGE])
+    if not visible:
+        st.info("No crew members match these filters.")
+    else:
+        st.caption(f"Showing {first + 1}–{first + len(visible)} of {len(rows):,} crew members")
+        cards = []
+        for member in visible:
+            health_color = "green" if member["health"] > 95 else "orange" if member["health"] > 85 else "red"
+            cards.append(f"""
+            <div class="info-card" style="padding: 15px;">
+                <h4>{html.escape(member["name"])}</h4>
+                <p><strong>Role:</strong> {html.escape(member["role"])}</p>
+                <p><strong>Status:</strong> {html.escape(member["status"])}</p>
+                <p><strong>Location:</strong> {html.escape(member["location"])}</p>
+                <div style="margin-top: 10px;">
+                    <span>Health: </span>
+                    <span style="color: {health_color}; font-weight: bold;">{member["health"]:.0f}%</span>
                 </div>
-                """, unsafe_allow_html=True)
+            </div>""")
+        st.markdown(f'<div class="crew-grid">{"".join(cards)}</div>', unsafe_allow_html=True)
     
     # Crew location tracking
     st.subheader("Crew Location Tracking")
     
-    # Create a network graph of crew locations
-    G = nx.Graph()
-    
-    # Add nodes for locations
-    locations = set(member["location"] for member in st.session_state.crew_data)
-    for location in locations:
-        G.add_node(location, type="location")
-    
-    # Add nodes for crew members and edges to their locations
-    for member in st.session_state.crew_data:
-        G.add_node(member["name"], type="crew")
-        G.add_edge(member["name"], member["location"])
-    
-    # Create positions for the graph
-    pos = nx.spring_layout(G, seed=42)
-    
-    # Create the plot
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
-    # Draw location nodes
-    location_nodes = [node for node, attr in G.nodes(data=True) if attr.get("type") == "location"]
-    nx.draw_networkx_nodes(G, pos, nodelist=location_nodes, node_color="skyblue", node_size=500, alpha=0.8)
-    
-    # Draw crew nodes
-    crew_nodes = [node for node, attr in G.nodes(data=True) if attr.get("type") == "crew"]
-    nx.draw_networkx_nodes(G, pos, nodelist=crew_nodes, node_color="orange", node_size=300, alpha=0.8)
-    
-    # Draw edges
-    nx.draw_networkx_edges(G, pos, width=1.0, alpha=0.5)
-    
-    # Draw labels
-    nx.draw_networkx_labels(G, pos, font_size=10, font_family="sans-serif")
-    
-    plt.axis("off")
-    st.pyplot(fig)
+    # Layout and image are cached per crew topology and shared across sessions
+    _, graph_image = get_crew_layout_cache().get(st.session_state.crew_data)
+    st.image(graph_image, use_container_width=True)
     
     # Crew schedule
     st.subheader("Crew Schedule")
@@ -929,6 +1150,7 @@ def render_crew():
     
     timeline(timeline_data, height=400)
 
+@profiled
 def render_resources():
     """Render the resource management interface."""
     st.header("Resource Management")
@@ -975,48 +1197,39 @@ def render_resources():
     with col2:
         st.subheader("Resource Consumption")
         
-        # Generate synthetic consumption data
-        days = 30
-        dates = [datetime.datetime.now() - datetime.timedelta(days=i) for i in range(days)]
-        dates.reverse()
-        
-        # Create consumption patterns with some randomness
-        oxygen_consumption = [0.8 + 0.2 * np.sin(i/5) + random.uniform(-0.05, 0.05) for i in range(days)]
-        water_consumption = [1.2 + 0.3 * np.sin(i/7) + random.uniform(-0.1, 0.1) for i in range(days)]
-        food_consumption = [1.5 + 0.2 * np.sin(i/3) + random.uniform(-0.15, 0.15) for i in range(days)]
-        
-        # Create dataframe
-        consumption_df = pd.DataFrame({
-            'Date': dates,
-            'Oxygen (kg)': oxygen_consumption,
-            'Water (L)': water_consumption,
-            'Food (kg)': food_consumption
-        })
+        # Daily consumption is the drop in the daily mean level over the last 30 days
+        levels_df = get_history_frame(['Oxygen', 'Water', 'Food'], days=30)
+        consumption_df = -levels_df.set_index('Date').resample('D').mean().diff()
+        consumption_df = consumption_df.dropna().reset_index()
         
         # Plot with Plotly
-        fig = px.line(consumption_df, x='Date', y=['Oxygen (kg)', 'Water (L)', 'Food (kg)'],
+        fig = px.line(consumption_df, x='Date', y=['Oxygen', 'Water', 'Food'],
                       title='Daily Resource Consumption',
-                      labels={'value': 'Consumption', 'variable': 'Resource'})
+                      labels={'value': 'Consumption (% per day)', 'variable': 'Resource'})
         
         st.plotly_chart(fig, use_container_width=True)
     
     # Resource flow visualization
     st.subheader("Resource Flow Visualization")
     
+    # Flows are solved from the live power and resource readings
+    network = get_flow_network()
+    _, flows = network.update_and_solve(*live_flow_inputs(st.session_state.power_systems,
+                                                           st.session_state.resource_levels))
+    
     # Create a Sankey diagram for resource flow
     fig = go.Figure(data=[go.Sankey(
         node=dict(
             pad=15,
             thickness=20,
             line=dict(color="black", width=0.5),
-            label=["Solar Panels", "Batteries", "Life Support", "Hydroponics", 
-                   "Water Recycling", "Crew", "Waste Processing", "Atmosphere"],
+            label=network.nodes,
             color="blue"
         ),
         link=dict(
-            source=[0, 0, 1, 2, 3, 4, 5, 5, 6, 6],
-            target=[1, 2, 2, 5, 5, 5, 4, 6, 3, 7],
-            value=[80, 20, 60, 30, 20, 50, 30, 20, 10, 10],
+            source=network.sources,
+            target=network.targets,
+            value=flows.round(1),
             color="rgba(100, 100, 200, 0.2)"
         )
     )])
@@ -1028,108 +1241,50 @@ def render_resources():
     st.subheader("Resource Consumption Predictions")
     
     # Create tabs for different prediction timeframes
-    tabs = st.tabs(["7 Days", "30 Days", "90 Days"])
-    
-    with tabs[0]:
-        # Generate prediction data for 7 days
-        days = 7
-        future_dates = [datetime.datetime.now() + datetime.timedelta(days=i) for i in range(days)]
-        
-        # Create synthetic prediction data with confidence intervals
-        oxygen_pred = [st.session_state.resource_levels.get("Oxygen", 95) - i*0.5 + random.uniform(-0.2, 0.2) for i in range(days)]
-        oxygen_upper = [val + 2 for val in oxygen_pred]
-        oxygen_lower = [val - 2 for val in oxygen_pred]
-        
-        water_pred = [st.session_state.resource_levels.get("Water", 85) - i*0.7 + random.uniform(-0.3, 0.3) for i in range(days)]
-        water_upper = [val + 3 for val in water_pred]
-        water_lower = [val - 3 for val in water_pred]
-        
-        food_pred = [st.session_state.resource_levels.get("Food", 90) - i*0.6 + random.uniform(-0.25, 0.25) for i in range(days)]
-        food_upper = [val + 2.5 for val in food_pred]
-        food_lower = [val - 2.5 for val in food_pred]
-        
-        # Create dataframe
-        pred_df = pd.DataFrame({
-            'Date': future_dates,
-            'Oxygen': oxygen_pred,
-            'Oxygen_Upper': oxygen_upper,
-            'Oxygen_Lower': oxygen_lower,
-            'Water': water_pred,
-            'Water_Upper': water_upper,
-            'Water_Lower': water_lower,
-            'Food': food_pred,
-            'Food_Upper': food_upper,
-            'Food_Lower': food_lower
-        })
-        
-        # Plot with confidence intervals
-        fig = go.Figure()
-        
-        # Oxygen
-        fig.add_trace(go.Scatter(
-            x=pred_df['Date'], y=pred_df['Oxygen_Upper'],
-            fill=None, mode='lines', line_color='rgba(0, 100, 80, 0.2)',
-            showlegend=False
-        ))
-        fig.add_trace(go.Scatter(
-            x=pred_df['Date'], y=pred_df['Oxygen_Lower'],
-            fill='tonexty', mode='lines', line_color='rgba(0, 100, 80, 0.2)',
-            name='Oxygen (95% CI)'
-        ))
-        fig.add_trace(go.Scatter(
-            x=pred_df['Date'], y=pred_df['Oxygen'],
-            mode='lines', line_color='rgb(0, 100, 80)',
-            name='Oxygen'
-        ))
-        
-        # Water
-        fig.add_trace(go.Scatter(
-            x=pred_df['Date'], y=pred_df['Water_Upper'],
-            fill=None, mode='lines', line_color='rgba(0, 176, 246, 0.2)',
-            showlegend=False
-        ))
-        fig.add_trace(go.Scatter(
-            x=pred_df['Date'], y=pred_df['Water_Lower'],
-            fill='tonexty', mode='lines', line_color='rgba(0, 176, 246, 0.2)',
-            name='Water (95% CI)'
-        ))
-        fig.add_trace(go.Scatter(
-            x=pred_df['Date'], y=pred_df['Water'],
-            mode='lines', line_color='rgb(0, 176, 246)',
-            name='Water'
-        ))
-        
-        # Food
-        fig.add_trace(go.Scatter(
-            x=pred_df['Date'], y=pred_df['Food_Upper'],
-            fill=None, mode='lines', line_color='rgba(231, 107, 243, 0.2)',
-            showlegend=False
-        ))
-        fig.add_trace(go.Scatter(
-            x=pred_df['Date'], y=pred_df['Food_Lower'],
-            fill='tonexty', mode='lines', line_color='rgba(231, 107, 243, 0.2)',
-            name='Food (95% CI)'
-        ))
-        fig.add_trace(go.Scatter(
-            x=pred_df['Date'], y=pred_df['Food'],
-            mode='lines', line_color='rgb(231, 107, 243)',
-            name='Food'
-        ))
-        
-        fig.update_layout(
-            title='7-Day Resource Level Predictions',
-            yaxis_title='Resource Level (%)',
-            hovermode="x unified"
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-    
-    with tabs[1]:
-        st.info("30-day predictions would be displayed here with similar visualization.")
-    
-    with tabs[2]:
-        st.info("90-day predictions would be displayed here with similar visualization.")
+    tabs = st.tabs(list(FORECAST_HORIZONS))
+    
+    for tab, (label, horizon_days) in zip(tabs, FORECAST_HORIZONS.items()):
+        with tab:
+            forecast = get_resource_forecaster().forecast(horizon_days)
+            if forecast is None:
+                st.info("Not enough recorded history to fit a forecast yet.")
+                continue
+            
+            dates = pd.to_datetime(forecast.times, unit='s', utc=True).tz_convert(LOCAL_TIMEZONE).tz_localize(None)
+            
+            # Plot with prediction intervals
+            fig = go.Figure()
+            
+            for resource, color in FORECAST_COLORS.items():
+                column = forecast.channels.index(resource)
+                fig.add_trace(go.Scatter(
+                    x=dates, y=forecast.upper[:, column],
+                    fill=None, mode='lines', line_color=f'rgba({color}, 0.2)',
+                    showlegend=False
+                ))
+                fig.add_trace(go.Scatter(
+                    x=dates, y=forecast.lower[:, column],
+                    fill='tonexty', mode='lines', line_color=f'rgba({color}, 0.2)',
+                    name=f'{resource} (95% PI)'
+                ))
+                fig.add_trace(go.Scatter(
+                    x=dates, y=forecast.mean[:, column],
+                    mode='lines', line_color=f'rgb({color})',
+                    name=resource
+                ))
+            
+            fig.update_layout(
+                title=f'{label.replace(" Days", "-Day")} Resource Level Predictions',
+                yaxis_title='Resource Level (%)',
+                hovermode="x unified"
+            )
+            
+            st.plotly_chart(fig, use_container_width=True)
 
+EMERGENCY_TRIALS = [1000, 10000, 100000, 1000000]
+EMERGENCY_BINS = 40
+
+@profiled
 def render_emergency():
     """Render the emergency management interface."""
     st.header("Emergency Management")
@@ -1217,17 +1372,52 @@ def render_emergency():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.selectbox("Scenario Type", ["Hull Breach", "Fire", "Power Failure", "Medical Emergency", "Cosmic Radiation"])
+        scenario = st.selectbox("Scenario Type", list(SCENARIOS))
     
     with col2:
-        st.selectbox("Severity Level", ["Low", "Medium", "High", "Critical"])
+        severity = st.selectbox("Severity Level", list(SEVERITY_LEVELS))
     
     with col3:
-        st.selectbox("Location", ["Command Center", "Crew Quarters", "Engineering", "Life Support", "Research Lab"])
+        location = st.selectbox("Location", list(LOCATIONS))
     
+    trials = st.select_slider("Trials", options=EMERGENCY_TRIALS, value=10000, format_func="{:,}".format)
     if st.button("Run Simulation"):
-        st.info("Emergency simulation would be executed here, testing response protocols and crew readiness.")
+        st.session_state.emergency_run = (scenario, severity, location, trials)
+    
+    # Results stay on screen across reruns; repeated runs come from the simulator's cache
+    if "emergency_run" in st.session_state:
+        render_emergency_results(*st.session_state.emergency_run)
+
+@profiled
+def render_emergency_results(scenario, severity, location, trials):
+    """Render the outcome distributions of a Monte Carlo emergency simulation."""
+    result = get_emergency_simulator().run(scenario, severity, location, trials)
+    summary = outcome_summary(result)
+    st.caption(f"{scenario} · {severity} · {location}: {trials:,} trials in {result.elapsed_ms:.0f} ms")
+    cols = st.columns(4)
+    cols[0].metric("Survival Probability", f"{summary['survival_probability']:.1%}",
+                   help=f"Trials with no fatalities; {summary['crew_survival_rate']:.1%} of exposed crew survive overall")
+    cols[1].metric("Time to Safe (median)", f"{summary['time_to_safe_p50']:.1f} min",
+                   help=f"90th percentile {summary['time_to_safe_p90']:.1f} min")
+    cols[2].metric("Resource Margin (5th pct)", f"{summary['resource_margin_p5']:.1f}%",
+                   help=f"Median {summary['resource_margin_p50']:.1f}%; shortfall in {summary['resource_shortfall']:.1%} of trials")
+    cols[3].metric("Evacuation Rate", f"{summary['evacuation_rate']:.1%}")
+    
+    # Histograms are binned here so the chart payload does not grow with the trial count
+    col1, col2 = st.columns(2)
+    for column, values, title, unit in (
+        (col1, result.time_to_safe, "Time to Safe", "Minutes"),
+        (col2, result.resource_margin, "Lowest Resource Margin", "Remaining reserve (%)"),
+    ):
+        high = np.percentile(values, 99.5)
+        counts, edges = np.histogram(np.minimum(values, high), bins=EMERGENCY_BINS)
+        fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts / len(values), width=np.diff(edges)))
+        fig.update_layout(title=f"{title} Distribution", xaxis_title=unit, yaxis_title="Share of trials",
+                          yaxis_tickformat=".0%", bargap=0.05)
+        with column:
+            st.plotly_chart(fig, use_container_width=True)
 
+@profiled
 def render_ar():
     """Render the augmented reality interface."""
     st.header("Augmented Reality Maintenance")
@@ -1236,12 +1426,14 @@ def render_ar():
     ar_modes = ["Inspect", "Repair", "Diagnostic"]
     selected_mode = st.radio("AR Mode:", ar_modes, horizontal=True)
     
+    # AR controls toggle overlay layers
+    st.session_state.setdefault("ar_scan", False)
+    st.session_state.setdefault("ar_schematics", False)
+    
     # AR viewport
     st.subheader("AR Viewport")
-    
-    # Simulated AR view using an image with overlays
-    ar_image = Image.new('RGB', (800, 600), color=(20, 20, 40))
-    st.image(ar_image, use_column_width=True)
+    source = st.radio("Source:", ["Equipment Bay", "Camera"], horizontal=True, key="ar_source")
+    viewport = st.container()
     
     # AR controls
     st.subheader("AR Controls")
@@ -1249,14 +1441,39 @@ def render_ar():
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        st.button("Scan Component")
+        if st.button("Clear Scan" if st.session_state.ar_scan else "Scan Component"):
+            st.session_state.ar_scan = not st.session_state.ar_scan
     
     with col2:
-        st.button("Show Schematics")
+        if st.button("Hide Schematics" if st.session_state.ar_schematics else "Show Schematics"):
+            st.session_state.ar_schematics = not st.session_state.ar_schematics
     
     with col3:
         st.button("Record Procedure")
     
+    layers = ["grid"]
+    if st.session_state.ar_schematics:
+        layers.append("schematics")
+    layers.append("labels")
+    if st.session_state.ar_scan:
+        layers.append("highlight")
+    layers.append(f"hud:{selected_mode}")
+    
+    compositor = get_ar_compositor()
+    version = compositor.version
+    changed = compositor.set_layers(layers)
+    with viewport:
+        if source == "Camera":
+            render_ar_camera(compositor)
+        else:
+            # Coming back from the camera changes the source even with the same layers
+            changed = compositor.set_background(get_ar_background()) or changed
+            _, frame = compositor.latest(newer_than=version if changed else None)
+            st.image(frame, width="stretch")
+        stats = compositor.stats()
+        st.caption(f"{stats['fps']:.0f} fps · compose p50 {stats['compose_ms_p50']:.1f} ms · "
+                   f"{stats['dropped']:,} stale frames dropped")
+    
     # AR information panels
     st.subheader("Component Information")
     
@@ -1291,6 +1508,62 @@ def render_ar():
         9. Run diagnostic test sequence
         """)
 
+def get_ar_compositor():
+    """Return this session's AR compositor.
+
+    Its worker thread starts on demand and exits once the session stops
+    sending it work, so sessions that leave the page or end hold no thread;
+    flattened overlays are shared across sessions.
+    """
+    if "ar_compositor" not in st.session_state:
+        st.session_state.ar_compositor = ARCompositor()
+    return st.session_state.ar_compositor
+
+@st.cache_resource
+def get_ar_background():
+    """Load the still AR background once: HABITAT_AR_IMAGE if set, else the equipment bay."""
+    path = os.environ.get("HABITAT_AR_IMAGE")
+    if not path:
+        return equipment_bay_background(VIEWPORT_SIZE)
+    Image = lazy_import("PIL.Image")
+    with Image.open(path) as image:
+        frame = np.asarray(image.convert("RGB").resize(VIEWPORT_SIZE))
+    frame.setflags(write=False)
+    return frame
+
+@profiled
+def render_ar_camera(compositor):
+    """Stream the camera through the compositor and back to the browser."""
+    try:
+        webrtc = lazy_import("streamlit_webrtc")
+        av = lazy_import("av")
+    except ImportError:
+        st.info("The camera source needs the streamlit-webrtc package.")
+        return
+    
+    # Runs on the WebRTC thread: submit the frame, return the newest composite
+    def composite_frame(frame):
+        compositor.submit(frame.to_ndarray(format="rgb24"))
+        _, composite = compositor.latest()
+        return av.VideoFrame.from_ndarray(composite, format="rgb24")
+    
+    webrtc.webrtc_streamer(
+        key="ar_camera",
+        mode=webrtc.WebRtcMode.SENDRECV,
+        video_frame_callback=composite_frame,
+        media_stream_constraints={"video": True, "audio": False},
+        async_processing=True,
+    )
+
+@live_panel
+@profiled
+def render_environment_gauge(name, default):
+    """Render one live environmental gauge."""
+    update_simulation_data()
+    value = st.session_state.environmental_data.get(name, default)
+    st.plotly_chart(get_session_figures().indicator(name, value), use_container_width=True)
+
+@profiled
 def render_environmental():
     """Render the environmental control interface."""
     st.header("Environmental Control Systems")
@@ -1301,35 +1574,8 @@ def render_environmental():
     with col1:
         st.subheader("Temperature Control")
         
-        current_temp = st.session_state.environmental_data.get("temperature", 21.5)
-        
         # Temperature gauge
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=current_temp,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            delta={'reference': 21.0, 'increasing': {'color': "red"}, 'decreasing': {'color': "green"}},
-            gauge={
-                'axis': {'range': [18, 25], 'tickwidth': 1, 'tickcolor': "darkblue"},
-                'bar': {'color': "darkblue"},
-                'bgcolor': "white",
-                'borderwidth': 2,
-                'bordercolor': "gray",
-                'steps': [
-                    {'range': [18, 19.5], 'color': 'cyan'},
-                    {'range': [19.5, 22.5], 'color': 'royalblue'},
-                    {'range': [22.5, 25], 'color': 'red'}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 23
-                }
-            }
-        ))
-        
-        fig.update_layout(height=250)
-        st.plotly_chart(fig, use_container_width=True)
+        render_environment_gauge("temperature", 21.5)
         
         # Temperature controls
         st.slider("Temperature Set Point", min_value=18.0, max_value=25.0, value=21.0, step=0.5)
@@ -1343,35 +1589,8 @@ def render_environmental():
     with col2:
         st.subheader("Pressure Control")
         
-        current_pressure = st.session_state.environmental_data.get("pressure", 101.3)
-        
         # Pressure gauge
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=current_pressure,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            delta={'reference': 101.3, 'increasing': {'color': "red"}, 'decreasing': {'color': "red"}},
-            gauge={
-                'axis': {'range': [95, 105], 'tickwidth': 1, 'tickcolor': "darkblue"},
-                'bar': {'color': "darkblue"},
-                'bgcolor': "white",
-                'borderwidth': 2,
-                'bordercolor': "gray",
-                'steps': [
-                    {'range': [95, 98], 'color': 'red'},
-                    {'range': [98, 102.5], 'color': 'royalblue'},
-                    {'range': [102.5, 105], 'color': 'red'}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 103
-                }
-            }
-        ))
-        
-        fig.update_layout(height=250)
-        st.plotly_chart(fig, use_container_width=True)
+        render_environment_gauge("pressure", 101.3)
         
         # Pressure controls
         st.slider("Pressure Set Point", min_value=98.0, max_value=103.0, value=101.3, step=0.1)
@@ -1385,29 +1604,224 @@ def render_environmental():
     with col3:
         st.subheader("Humidity Control")
         
-        current_humidity = st.session_state.environmental_data.get("humidity", 45)
-        
         # Humidity gauge
-        fig = go.Figure(go.Indicator(
-            mode="gauge+number+delta",
-            value=current_humidity,
-            domain={'x': [0, 1], 'y': [0, 1]},
-            delta={'reference': 45, 'increasing': {'color': "red"}, 'decreasing': {'color': "red"}},
-            gauge={
-                'axis': {'range': [20, 70], 'tickwidth': 1, 'tickcolor': "darkblue"},
-                'bar': {'color': "darkblue"},
-                'bgcolor': "white",
-                'borderwidth': 2,
-                'bordercolor': "gray",
-                'steps': [
-                    {'range': [20, 30], 'color': 'red'},
-                    {'range': [30, 60], 'color': 'royalblue'},
-                    {'range': [60, 70], 'color': 'red'}
-                ],
-                'threshold': {
-                    'line': {'color': "red", 'width': 4},
-                    'thickness': 0.75,
-                    'value': 65
-                }
-            }
-        ))
+        render_environment_gauge("humidity", 45)
+        
+        # Humidity controls
+        st.slider("Humidity Set Point", min_value=30, max_value=60, value=45, step=1)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.button("Apply Humidity")
+        with col2:
+            st.button("Reset Humidity")
+
+@profiled
+def render_maintenance():
+    """Render the maintenance task list and the optimized crew assignments."""
+    st.header("Maintenance Scheduling")
+    store = get_task_store()
+    today = datetime.date.today().isoformat()
+    
+    cols = st.columns(4)
+    for col, status in zip(cols, STATUSES):
+        col.metric(status, store.count("status", status))
+    overdue = store.query(status=["Pending", "In Progress"], due_before=today)
+    cols[3].metric("Overdue", len(overdue))
+    
+    # Task list, filtered through the store's indexes
+    st.subheader("Tasks")
+    crew_names = [member["name"] for member in st.session_state.crew_data]
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        priorities = st.multiselect("Priority", PRIORITIES, key="task_priority")
+    with col2:
+        statuses = st.multiselect("Status", STATUSES, default=["Pending", "In Progress"], key="task_status")
+    with col3:
+        assignees = st.multiselect("Assigned To", crew_names, key="task_assignee")
+    tasks = store.query(priority=priorities or None, status=statuses or None, assigned_to=assignees or None)
+    if tasks:
+        st.dataframe(pd.DataFrame(tasks)[TASK_COLUMNS], hide_index=True, use_container_width=True)
+    else:
+        st.info("No tasks match these filters.")
+    
+    with st.expander("Update Task"):
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            task_id = st.selectbox("Task", [task["id"] for task in tasks] or [None], key="task_edit_id")
+        current = store.get(task_id) if task_id is not None else None
+        # Streamlit ignores index once a key holds state, so key the inputs on the
+        # task and its stored values; picking another task, or an update made
+        # elsewhere, starts them from the stored values again
+        stored = f"{task_id}_{current['status']}_{current['assigned_to']}" if current else "none"
+        with col2:
+            status = st.selectbox("New Status", STATUSES,
+                                  index=STATUSES.index(current["status"]) if current else 0,
+                                  key=f"task_edit_status_{stored}")
+        with col3:
+            assignee = st.selectbox("Assign To", crew_names,
+                                    index=crew_names.index(current["assigned_to"]) if current and current["assigned_to"] in crew_names else 0,
+                                    key=f"task_edit_assignee_{stored}")
+        if st.button("Save Task", disabled=current is None):
+            store.update(task_id, {"status": status, "assigned_to": assignee})
+            st.rerun()
+    
+    # Optimal assignment of pending tasks to on-duty crew
+    st.subheader("Optimized Crew Assignments")
+    scheduler = get_maintenance_scheduler()
+    plan = scheduler.plan(store, st.session_state.crew_data, today)
+    if not plan:
+        st.info("No pending tasks can be assigned to on-duty crew.")
+        return
+    details = {task["id"]: task for task in store.query(status="Pending")}
+    st.dataframe(pd.DataFrame([
+        {"Task": assignment.task_id, "Description": details[assignment.task_id]["description"],
+         "Priority": details[assignment.task_id]["priority"], "Due": details[assignment.task_id]["due"],
+         "Assign To": assignment.crew, "Cost": round(assignment.cost, 2)}
+        for assignment in plan
+    ]), hide_index=True, use_container_width=True)
+    if st.button("Apply Assignments"):
+        for assignment in plan:
+            store.update(assignment.task_id, {"assigned_to": assignment.crew, "status": "In Progress"})
+        add_notification(f"{len(plan)} maintenance tasks assigned", "info")
+        st.rerun()
+
+TASK_COLUMNS = ["id", "description", "priority", "status", "assigned_to", "due", "skill", "location"]
+
+# Prediction windows offered on the Quantum page, in hours
+QUANTUM_WINDOWS = [6, 24, 72, 168]
+# Most probable events drawn on the timeline; the rest are only counted
+QUANTUM_MAX_EVENTS = 200
+
+@profiled
+def render_quantum():
+    """Render predicted space weather and asteroid events."""
+    st.header("Quantum Event Predictions")
+    
+    store = get_event_store(st.session_state.snapshot_version, st.session_state.quantum_predictions)
+    now = time.time()
+    
+    # Most probable event per category that is not over yet
+    likely = store.most_likely(now)
+    cols = st.columns(len(CATEGORIES))
+    for col, category in zip(cols, CATEGORIES):
+        with col:
+            st.subheader(CATEGORY_LABELS[category])
+            if category not in likely:
+                st.info("No predicted events.")
+                continue
+            event = store.records([likely[category]])
+            start = datetime.datetime.fromtimestamp(event["start"][0], LOCAL_TIMEZONE)
+            st.metric("Highest Probability", f"{event['probability'][0]:.0%}")
+            st.caption(f"{event['label'][0]} · {start.strftime('%Y-%m-%d %H:%M')}")
+    
+    window = st.select_slider("Prediction Window", options=QUANTUM_WINDOWS, value=72,
+                              format_func=lambda hours: f"{hours} h" if hours < 48 else f"{hours // 24} days")
+    upcoming = store.upcoming(window, now)
+    st.subheader(f"Events in the Next {window} Hours")
+    if not len(upcoming):
+        st.info("No events predicted in this window.")
+        return
+    if len(upcoming) > QUANTUM_MAX_EVENTS:
+        st.caption(f"Showing the {QUANTUM_MAX_EVENTS} most probable of {len(upcoming):,} events.")
+        probabilities = store.probabilities[upcoming]
+        upcoming = np.sort(upcoming[np.argpartition(-probabilities, QUANTUM_MAX_EVENTS)[:QUANTUM_MAX_EVENTS]])
+    
+    df = pd.DataFrame(store.records(upcoming))
+    for column in ("start", "end"):
+        df[column] = pd.to_datetime(df[column], unit='s', utc=True).dt.tz_convert(LOCAL_TIMEZONE).dt.tz_localize(None)
+    df.columns = ["Category", "Event", "Start", "End", "Probability", "Intensity"]
+    
+    fig = px.timeline(df, x_start="Start", x_end="End", y="Category", color="Probability",
+                      hover_name="Event", range_color=[0, 1], color_continuous_scale="Reds",
+                      title="Predicted Events")
+    st.plotly_chart(fig, use_container_width=True)
+    st.dataframe(df.round({"Probability": 3, "Intensity": 2}), hide_index=True, use_container_width=True)
+
+# Module renderers available from the navigation menu
+MODULE_RENDERERS = {
+    "Dashboard": render_dashboard,
+    "3D View": render_3d_view,
+    "Crew": render_crew,
+    "Resources": render_resources,
+    "Environmental": render_environmental,
+    "Maintenance": render_maintenance,
+    "Quantum": render_quantum,
+    "Emergency": render_emergency,
+    "AR": render_ar,
+}
+
+@profiled
+def render_startup_report():
+    """Render process startup timings in a collapsed sidebar panel."""
+    report = startup_report()
+    with st.sidebar.expander("Startup Report", expanded=False):
+        if report["time_to_first_render_ms"] is not None:
+            st.metric("Time to First Render", f"{report['time_to_first_render_ms']:.0f} ms",
+                      help="From the first script run of this process, not from server launch")
+        st.metric("Total Import Time", f"{report['total_import_ms']:.0f} ms")
+        st.dataframe(pd.DataFrame(report["imports"]), hide_index=True, use_container_width=True)
+
+@profiled
+def render_profiler():
+    """Render the profiling toggle and the rolling per-function summary."""
+    profiler = st.session_state.profiler
+    producer_profiler = get_telemetry_producer().profiler
+    enabled = st.sidebar.checkbox("Enable Profiling", value=profiler.enabled, key="profiling_toggle")
+    if enabled != profiler.enabled:
+        profiler.enable(enabled)
+        # The producer is shared, so the last session to toggle profiling decides for it
+        producer_profiler.enable(enabled)
+    if not enabled:
+        return
+    
+    with st.expander("Profiler", expanded=False):
+        st.markdown(f"**This session** ({profiler.rerun} reruns)")
+        st.dataframe(pd.DataFrame(profiler.summary()), hide_index=True, use_container_width=True)
+        st.caption("alloc_kb is traced process-wide, so it includes other sessions and background "
+                   "threads running at the same time.")
+        st.markdown(f"**Telemetry producer** ({producer_profiler.rerun} ticks)")
+        st.dataframe(pd.DataFrame(producer_profiler.summary()), hide_index=True, use_container_width=True)
+        st.download_button("Download Samples (JSON)", profiler.to_json(),
+                           file_name="profile.json", mime="application/json")
+
+@profiled
+def render_ingestion_status():
+    """Render telemetry ingestion counters when a sensor source is configured."""
+    ingestor = get_telemetry_ingestor()
+    if ingestor is None:
+        return
+    stats = ingestor.stats()
+    with st.sidebar.expander("Telemetry Ingestion", expanded=False):
+        st.caption(f"{stats['source']} ({stats['format']})")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Received", f"{stats['received']:,}")
+            st.metric("Dropped", f"{stats['dropped']:,}")
+        with col2:
+            st.metric("Applied", f"{stats['applied']:,}")
+            st.metric("Queue Depth", stats["queue_depth"])
+        if stats["decode_errors"]:
+            st.warning(f"{stats['decode_errors']:,} records could not be decoded")
+        if stats["last_error"]:
+            st.caption(f"Last error: {stats['last_error']}")
+
+# Main application
+st.session_state.profiler.start_rerun()
+get_telemetry_ingestor()
+update_simulation_data()
+render_sidebar()
+
+if st.session_state.emergency_mode and st.session_state.selected_module != "Emergency":
+    render_emergency()
+
+renderer = MODULE_RENDERERS.get(st.session_state.selected_module)
+if renderer is not None:
+    renderer()
+else:
+    st.info(f"The {st.session_state.selected_module} module is not available yet.")
+
+mark_first_render()
+render_ingestion_status()
+render_startup_report()
+render_profiler()
@@ -0,0 +1,307 @@
+"""Hand-gesture navigation from a live camera or a recorded video.
+
+Frames are handed to GesturePipeline.submit() by whoever owns the camera (the
+streamlit-webrtc frame callback, or replay() for a local video file). submit()
+only swaps the frame into a one-slot mailbox and returns, so the capture
+thread never waits on recognition. Between start() and stop(), a single
+worker thread owns one long-lived MediaPipe Hands instance and always takes
+the newest frame; frames that were replaced before the worker got to them are
+dropped and counted. The worker also exits after idle_timeout seconds without
+frames, so a camera that went away does not leave it running; the next
+submitted frame starts it again.
+
+Recognized gestures that are held for a few processed frames become
+navigation requests:
+
+    point -> Dashboard     victory -> 3D View     three -> Crew
+    thumbs_up -> Resources     open_palm -> Environmental
+
+Run `python gestures.py replay video.mp4` to measure the pipeline offline.
+"""
+import argparse
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+from startup import lazy_import
+
+GESTURE_MODULES = {
+    "point": "Dashboard",
+    "victory": "3D View",
+    "three": "Crew",
+    "thumbs_up": "Resources",
+    "open_palm": "Environmental",
+}
+
+# (thumb, index, middle, ring, pinky) extended -> gesture
+FINGER_GESTURES = {
+    (1, 1, 1, 1, 1): "open_palm",
+    (0, 0, 0, 0, 0): "fist",
+    (0, 1, 0, 0, 0): "point",
+    (1, 1, 0, 0, 0): "point",
+    (0, 1, 1, 0, 0): "victory",
+    (0, 1, 1, 1, 0): "three",
+    (1, 0, 0, 0, 0): "thumbs_up",
+}
+
+# MediaPipe hand landmark indices
+WRIST, THUMB_IP, THUMB_TIP, PINKY_MCP = 0, 3, 4, 17
+FINGER_TIPS = [8, 12, 16, 20]
+FINGER_PIPS = [6, 10, 14, 18]
+
+
+def classify_hand(landmarks):
+    """Name the gesture formed by 21 (x, y[, z]) hand landmarks, or return None.
+
+    A finger counts as extended when its tip is farther from the wrist than
+    its middle joint, and the thumb when its tip is farther from the base of
+    the little finger than its last joint, so the test works at any rotation.
+    """
+    points = np.asarray(landmarks, dtype=np.float64)[:, :2]
+    tips = np.linalg.norm(points[FINGER_TIPS] - points[WRIST], axis=1)
+    pips = np.linalg.norm(points[FINGER_PIPS] - points[WRIST], axis=1)
+    thumb = np.linalg.norm(points[THUMB_TIP] - points[PINKY_MCP]) > np.linalg.norm(points[THUMB_IP] - points[PINKY_MCP])
+    return FINGER_GESTURES.get((int(thumb), *(tips > pips).astype(int).tolist()))
+
+
+def mediapipe_hands(max_num_hands=1, min_detection_confidence=0.6, min_tracking_confidence=0.5):
+    """Create a MediaPipe Hands tracker for video input."""
+    mp = lazy_import("mediapipe")
+    return mp.solutions.hands.Hands(
+        static_image_mode=False,
+        max_num_hands=max_num_hands,
+        min_detection_confidence=min_detection_confidence,
+        min_tracking_confidence=min_tracking_confidence,
+    )
+
+
+class LatestFrame:
+    """One-slot mailbox that keeps only the newest frame."""
+
+    def __init__(self):
+        self._item = None
+        self._condition = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self._condition:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self._condition.notify()
+
+    def take(self, timeout=None):
+        """Remove and return the newest item, waiting up to timeout; None if empty."""
+        with self._condition:
+            if self._item is None:
+                self._condition.wait(timeout)
+            item, self._item = self._item, None
+            return item
+
+
+class GesturePipeline:
+    """Recognizes hand gestures off the capture thread and turns them into navigation.
+
+    `hands_factory` builds the landmark tracker on the worker thread; it must
+    return an object with MediaPipe's process(rgb_frame) interface. Frames
+    that fail recognition are counted in `failed` and the error kept in
+    `error`; the worker carries on with the next frame.
+    """
+
+    def __init__(self, hands_factory=mediapipe_hands, gesture_modules=GESTURE_MODULES, hold_frames=5,
+                 max_samples=300, idle_timeout=30):
+        self.hands_factory = hands_factory
+        self.gesture_modules = dict(gesture_modules)
+        self.hold_frames = hold_frames
+        self.idle_timeout = idle_timeout
+        self.error = None
+        self.submitted = 0
+        self.processed = 0
+        self.failed = 0
+        self.gesture = None
+        self._latency_ms = deque(maxlen=max_samples)
+        self._process_ms = deque(maxlen=max_samples)
+        self._frames = LatestFrame()
+        self._candidate = None
+        self._streak = 0
+        self._navigation = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._idled_out = False
+
+    @property
+    def running(self):
+        """Whether the worker thread is alive."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the worker thread unless it is already running; return self."""
+        with self._lock:
+            if not self.running:
+                self._stop.clear()
+                self._idled_out = False
+                self._thread = threading.Thread(target=self._run, name="gesture-worker", daemon=True)
+                self._thread.start()
+        return self
+
+    def submit(self, frame):
+        """Offer an RGB frame (height, width, 3) for recognition; never blocks.
+
+        Restarts a worker that exited for being idle, but not one stopped with
+        stop() or one whose tracker could not be created.
+        """
+        self.submitted += 1
+        self._frames.put((frame, time.perf_counter()))
+        if self._idled_out:
+            self.start()
+
+    @property
+    def dropped(self):
+        """Frames replaced by a newer one before the worker took them."""
+        return self._frames.dropped
+
+    def poll_navigation(self):
+        """Return the module requested by a gesture since the last poll, or None."""
+        with self._lock:
+            module, self._navigation = self._navigation, None
+        return module
+
+    def stats(self):
+        """Return frame counters and latency percentiles in milliseconds."""
+        latency = np.array(self._latency_ms) if self._latency_ms else np.array([np.nan])
+        process = np.array(self._process_ms) if self._process_ms else np.array([np.nan])
+        return {
+            "submitted": self.submitted,
+            "processed": self.processed,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "drop_rate": self.dropped / self.submitted if self.submitted else 0.0,
+            "latency_ms_p50": float(np.percentile(latency, 50)),
+            "latency_ms_p95": float(np.percentile(latency, 95)),
+            "process_ms_p50": float(np.percentile(process, 50)),
+            "gesture": self.gesture,
+            "error": self.error,
+        }
+
+    def stop(self):
+        """Stop the worker thread, if running; start() brings it back."""
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join()
+
+    def _recognize(self, hands, frame):
+        results = hands.process(frame)
+        if not results.multi_hand_landmarks:
+            return None
+        landmarks = results.multi_hand_landmarks[0].landmark
+        return classify_hand([(point.x, point.y) for point in landmarks])
+
+    def _update_gesture(self, gesture):
+        # A gesture navigates once, after it has been held for hold_frames frames
+        self._streak = self._streak + 1 if gesture == self._candidate else 1
+        self._candidate = gesture
+        self.gesture = gesture
+        module = self.gesture_modules.get(gesture)
+        if module is not None and self._streak == self.hold_frames:
+            with self._lock:
+                self._navigation = module
+
+    def _run(self):
+        try:
+            hands = self.hands_factory()
+        except Exception as error:
+            self.error = f"{type(error).__name__}: {error}"
+            return
+        try:
+            idle_since = time.perf_counter()
+            while not self._stop.is_set():
+                item = self._frames.take(timeout=0.5)
+                if item is None:
+                    if time.perf_counter() - idle_since > self.idle_timeout:
+                        self._idled_out = True
+                        return
+                    continue
+                frame, submitted = item
+                start = time.perf_counter()
+                idle_since = start
+                try:
+                    gesture = self._recognize(hands, frame)
+                except Exception as error:
+                    self.error = f"{type(error).__name__}: {error}"
+                    self.failed += 1
+                    continue
+                finished = time.perf_counter()
+                self._update_gesture(gesture)
+                self.processed += 1
+                self._process_ms.append((finished - start) * 1000)
+                self._latency_ms.append((finished - submitted) * 1000)
+        finally:
+            close = getattr(hands, "close", None)
+            if close is not None:
+                close()
+
+
+def replay(pipeline, path, realtime=True):
+    """Feed a local video file through the pipeline and return the modules it navigated to.
+
+    With realtime, frames are submitted at the file's frame rate, as a camera
+    would deliver them; otherwise as fast as they decode.
+    """
+    cv2 = lazy_import("cv2")
+    capture = cv2.VideoCapture(path)
+    if not capture.isOpened():
+        raise OSError(f"Cannot open video {path!r}")
+    interval = 1 / (capture.get(cv2.CAP_PROP_FPS) or 30)
+    navigations = []
+    frames = 0
+    start = time.perf_counter()
+    try:
+        while True:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            pipeline.submit(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            frames += 1
+            module = pipeline.poll_navigation()
+            if module is not None:
+                navigations.append(module)
+            if realtime:
+                lead = frames * interval - (time.perf_counter() - start)
+                if lead > 0:
+                    time.sleep(lead)
+    finally:
+        capture.release()
+    # Let the worker finish the last frame
+    deadline = time.perf_counter() + 2
+    while (pipeline.processed + pipeline.failed + pipeline.dropped < pipeline.submitted
+           and time.perf_counter() < deadline):
+        time.sleep(0.01)
+    module = pipeline.poll_navigation()
+    if module is not None:
+        navigations.append(module)
+    return navigations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Habitat gesture pipeline tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    replayer = commands.add_parser("replay", help="run a recorded video through the gesture pipeline")
+    replayer.add_argument("video", help="path to a local video file")
+    replayer.add_argument("--fast", action="store_true", help="submit frames as fast as they decode")
+    replayer.add_argument("--hold-frames", type=int, default=5)
+    args = parser.parse_args()
+
+    pipeline = GesturePipeline(hold_frames=args.hold_frames).start()
+    navigations = replay(pipeline, args.video, realtime=not args.fast)
+    pipeline.stop()
+    print(json.dumps({"navigations": navigations, **pipeline.stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Cached rendering of the habitat digital twin image."""
+import functools
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import numpy as np
+
+from startup import lazy_import
+
+# Highlighted system -> (habitat component, highlight color)
+SYSTEM_HIGHLIGHTS = {
+    "Life Support": ("body", "limegreen"),
+    "Power Systems": ("panels", "cyan"),
+    "Structural Integrity": ("frame", "white"),
+    "Communication Arrays": ("command", "orange"),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def habitat_meshes():
+    """Build the habitat surface meshes once per process."""
+    # Create a cylinder (main habitat body)
+    theta = np.linspace(0, 2*np.pi, 100)
+    z = np.linspace(-3, 3, 100)
+    theta, z = np.meshgrid(theta, z)
+    r = 1
+    body = (r * np.cos(theta), r * np.sin(theta), z)
+
+    # Solar panels
+    panels = (
+        np.array([[-3, -3], [3, 3]]),
+        np.array([[-0.5, 0.5], [-0.5, 0.5]]),
+        np.array([[0, 0], [0, 0]]),
+    )
+
+    # A sphere for the command module
+    u = np.linspace(0, 2 * np.pi, 100)
+    v = np.linspace(0, np.pi, 100)
+    command = (
+        0.7 * np.outer(np.cos(u), np.sin(v)) + 0,
+        0.7 * np.outer(np.sin(u), np.sin(v)) + 0,
+        0.7 * np.outer(np.ones(np.size(u)), np.cos(v)) + 3.5,
+    )
+    for mesh in (body, panels, command):
+        for array in mesh:
+            array.setflags(write=False)
+    return {"body": body, "panels": panels, "command": command}
+
+
+def render_habitat_png(elevation=20, azimuth=45, zoom=1.0, highlights=()):
+    """Draw the habitat with matplotlib and return PNG bytes."""
+    # Use the object-oriented API: pyplot's global figure state is not thread-safe
+    Figure = lazy_import("matplotlib.figure").Figure
+    lazy_import("mpl_toolkits.mplot3d")
+    meshes = habitat_meshes()
+    colors = {"body": "silver", "panels": "blue", "command": "gold"}
+    for system in highlights:
+        component, color = SYSTEM_HIGHLIGHTS[system]
+        colors[component] = color
+
+    fig = Figure(figsize=(10, 8))
+    ax = fig.add_subplot(111, projection='3d')
+    ax.plot_surface(*meshes["body"], color=colors["body"], alpha=0.7)
+    ax.plot_surface(*meshes["panels"], color=colors["panels"], alpha=0.6)
+    ax.plot_surface(*meshes["command"], color=colors["command"], alpha=0.7)
+    if "frame" in colors:
+        ax.plot_wireframe(*meshes["body"], color=colors["frame"], rstride=10, cstride=10, linewidth=0.5)
+
+    # Remove axis labels and ticks
+    ax.set_xlabel('')
+    ax.set_ylabel('')
+    ax.set_zlabel('')
+    ax.set_xticks([])
+    ax.set_yticks([])
+    ax.set_zticks([])
+
+    # Set limits, zooming in by shrinking them
+    limit = 3 / zoom
+    ax.set_xlim([-limit, limit])
+    ax.set_ylim([-limit, limit])
+    ax.set_zlim([-limit, limit])
+
+    # Set the view angle
+    ax.view_init(elev=elevation, azim=azimuth)
+
+    # Set a dark background
+    ax.set_facecolor((0.1, 0.1, 0.2))
+    fig.patch.set_facecolor((0.1, 0.1, 0.2))
+
+    buf = BytesIO()
+    fig.savefig(buf, format='png', bbox_inches='tight', transparent=True)
+    return buf.getvalue()
+
+
+class HabitatRenderCache:
+    """LRU cache of rendered habitat images bounded by total size in bytes."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(elevation, azimuth, zoom, highlights):
+        """Normalize view parameters into a cache key."""
+        return (round(float(elevation), 1), round(float(azimuth), 1), round(float(zoom), 2), frozenset(highlights))
+
+    def get(self, elevation=20, azimuth=45, zoom=1.0, highlights=()):
+        """Return PNG bytes for the view, rendering only on a cache miss."""
+        key = self.key(elevation, azimuth, zoom, highlights)
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                self.hits += 1
+                return image
+            self.misses += 1
+        image = render_habitat_png(*key[:3], highlights=sorted(key[3]))
+        with self._lock:
+            if key not in self._images:
+                self._images[key] = image
+                self.size += len(image)
+            while self.size > self.max_bytes and len(self._images) > 1:
+                _, evicted = self._images.popitem(last=False)
+                self.size -= len(evicted)
+        return image
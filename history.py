@@ -0,0 +1,103 @@
+"""Fixed-capacity columnar time-series store for habitat telemetry."""
+import threading
+
+import numpy as np
+
+
+class TimeSeriesStore:
+    """Ring buffer of timestamped samples with one column per channel.
+
+    Every sample is written twice, `capacity` rows apart, so the most recent
+    `capacity` samples always form one contiguous slice of the backing arrays.
+    That keeps append O(1) and lets reads copy one slice without reassembling
+    a wrap. Writers and readers share a lock, so the copies that window() and
+    series() return are consistent even while other threads append.
+    Timestamps (seconds since the epoch) must be appended in increasing order.
+    """
+
+    def __init__(self, channels, capacity, dtype=np.float64):
+        self.channels = tuple(channels)
+        self.capacity = capacity
+        self._columns = {name: i for i, name in enumerate(self.channels)}
+        self._times = np.full(2 * capacity, np.nan)
+        self._values = np.full((2 * capacity, len(self.channels)), np.nan, dtype=dtype)
+        # (next write position, number of stored samples), swapped atomically
+        self._cursor = (0, 0)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._cursor[1]
+
+    def column(self, channel):
+        """Return the column index of a channel."""
+        return self._columns[channel]
+
+    def append(self, timestamp, values):
+        """Append one sample given as a {channel: value} mapping."""
+        row = [values.get(name, np.nan) for name in self.channels]
+        with self._lock:
+            position, size = self._cursor
+            self._values[position] = row
+            self._values[position + self.capacity] = row
+            self._times[position] = timestamp
+            self._times[position + self.capacity] = timestamp
+            self._cursor = ((position + 1) % self.capacity, min(size + 1, self.capacity))
+
+    def extend(self, timestamps, rows):
+        """Append a batch of samples; rows has one column per channel."""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        rows = np.asarray(rows, dtype=self._values.dtype)
+        if len(timestamps) > self.capacity:
+            timestamps = timestamps[-self.capacity:]
+            rows = rows[-self.capacity:]
+        count = len(timestamps)
+        if count == 0:
+            return
+        with self._lock:
+            position, size = self._cursor
+            positions = (position + np.arange(count)) % self.capacity
+            self._values[positions] = rows
+            self._values[positions + self.capacity] = rows
+            self._times[positions] = timestamps
+            self._times[positions + self.capacity] = timestamps
+            self._cursor = ((position + count) % self.capacity, min(size + count, self.capacity))
+
+    def _live_range(self):
+        position, size = self._cursor
+        stop = position + self.capacity
+        return stop - size, stop
+
+    def _rows(self, start, end):
+        # Callers hold the lock
+        lo, hi = self._live_range()
+        times = self._times[lo:hi]
+        first = 0 if start is None else np.searchsorted(times, start, side="left")
+        last = len(times) if end is None else np.searchsorted(times, end, side="right")
+        return lo + first, lo + last
+
+    def window(self, start=None, end=None):
+        """Return (times, values) copies of samples with start <= time <= end."""
+        with self._lock:
+            first, last = self._rows(start, end)
+            return self._times[first:last].copy(), self._values[first:last].copy()
+
+    def series(self, channel, start=None, end=None):
+        """Return (times, values) copies of a single channel."""
+        column = self._columns[channel]
+        with self._lock:
+            first, last = self._rows(start, end)
+            return self._times[first:last].copy(), self._values[first:last, column].copy()
+
+    def last_timestamp(self):
+        """Return the timestamp of the most recent sample, or None."""
+        with self._lock:
+            lo, hi = self._live_range()
+            return None if lo == hi else float(self._times[hi - 1])
+
+    def latest(self):
+        """Return the most recent sample as a {channel: value} dict, or None."""
+        with self._lock:
+            lo, hi = self._live_range()
+            if lo == hi:
+                return None
+            return dict(zip(self.channels, self._values[hi - 1].tolist()))
@@ -0,0 +1,418 @@
+"""Streaming ingestion of habitat sensor telemetry.
+
+Readings arrive on a UDP, TCP or Unix socket, or are tailed from a file:
+
+    udp://0.0.0.0:9999    tcp://0.0.0.0:9999    unix:///tmp/habitat.sock
+    file:///var/log/habitat/telemetry.ndjson
+
+Two wire formats are understood:
+
+    json    newline-delimited objects such as
+            {"timestamp": 1743500000.0, "Oxygen": 91.2, "temperature": 21.4}
+    binary  fixed 14-byte little-endian records of
+            (float64 timestamp, uint16 channel index, float32 value), where the
+            channel index is the position in simulation.TELEMETRY_CHANNELS
+
+Reader threads decode into NumPy batches and put them on a bounded queue.
+When the queue is full, UDP data is dropped and counted, because a datagram
+socket cannot push back. Stream sources block instead, which stops reading
+and lets TCP flow control slow the sender. An applier thread drains the queue
+every apply_interval seconds and publishes the latest value of each channel to
+the shared telemetry producer in one update.
+
+Run `python ingest.py simulate --help` for the bundled load generator.
+"""
+import argparse
+import json
+import math
+import os
+import queue
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from simulation import TELEMETRY_CHANNELS, SimulationEngine
+
+RECORD_DTYPE = np.dtype([("timestamp", "<f8"), ("channel", "<u2"), ("value", "<f4")])
+CHANNEL_INDEX = {name: i for i, name in enumerate(TELEMETRY_CHANNELS)}
+FORMATS = ("json", "binary")
+
+
+def _is_number(value):
+    """Return whether a decoded JSON value is a finite real number (bools, NaN and infinities are not)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+class Decoder:
+    """Turns a byte stream into (timestamps, channels, values) arrays."""
+
+    def __init__(self, fmt):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown telemetry format: {fmt}")
+        self.fmt = fmt
+        self.errors = 0
+        self._pending = b""
+
+    def feed(self, data, final=False):
+        """Decode every complete record in data; keep any partial tail for later.
+
+        With final=True the data is self-contained (one datagram): a JSON line
+        needs no trailing newline and nothing is carried over.
+        """
+        data = self._pending + data
+        if final and self.fmt == "json" and not data.endswith(b"\n"):
+            data += b"\n"
+        if self.fmt == "binary":
+            complete = len(data) - len(data) % RECORD_DTYPE.itemsize
+            self._pending = b"" if final else data[complete:]
+            self.errors += int(final and complete < len(data))
+            records = np.frombuffer(data[:complete], dtype=RECORD_DTYPE)
+            # Non-finite timestamps would break the history's time order
+            valid = ((records["channel"] < len(TELEMETRY_CHANNELS))
+                     & np.isfinite(records["timestamp"]) & np.isfinite(records["value"]))
+            self.errors += int(len(records) - valid.sum())
+            records = records[valid]
+            return records["timestamp"], records["channel"].astype(np.intp), records["value"].astype(np.float64)
+
+        complete = data.rfind(b"\n") + 1
+        self._pending = data[complete:]
+        lines = [line for line in data[:complete].split(b"\n") if line.strip()]
+        if not lines:
+            return None
+        try:
+            # One parser call per chunk instead of one per line
+            objects = json.loads(b"[" + b",".join(lines) + b"]")
+        except ValueError:
+            objects = []
+            for line in lines:
+                try:
+                    objects.append(json.loads(line))
+                except ValueError:
+                    self.errors += 1
+        now = time.time()
+        timestamps, channels, values = [], [], []
+        for obj in objects:
+            if not isinstance(obj, dict):
+                self.errors += 1
+                continue
+            timestamp = obj.pop("timestamp", now)
+            if not _is_number(timestamp):
+                self.errors += 1
+                continue
+            for name, value in obj.items():
+                channel = CHANNEL_INDEX.get(name)
+                if channel is None or not _is_number(value):
+                    self.errors += 1
+                    continue
+                timestamps.append(timestamp)
+                channels.append(channel)
+                values.append(value)
+        return np.array(timestamps, dtype=np.float64), np.array(channels, dtype=np.intp), np.array(values, dtype=np.float64)
+
+
+class TelemetryIngestor:
+    """Reads sensor records from a source and batch-applies them to a producer."""
+
+    def __init__(self, producer, source, fmt="json", queue_size=1024, apply_interval=0.5):
+        self.producer = producer
+        self.source = urlsplit(source)
+        if self.source.scheme not in ("udp", "tcp", "unix", "file"):
+            raise ValueError(f"Unsupported telemetry source: {source}")
+        self.fmt = fmt
+        self.apply_interval = apply_interval
+        # Datagram sources cannot apply backpressure, so they drop when full
+        self.block_when_full = self.source.scheme != "udp"
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._threads = []
+        self._decoders = []
+        self.received = 0
+        self.applied = 0
+        self.dropped = 0
+        self.batches = 0
+        self.error = None
+
+    def stats(self):
+        """Return ingestion counters."""
+        return {
+            "source": self.source.geturl(),
+            "format": self.fmt,
+            "received": self.received,
+            "applied": self.applied,
+            "dropped": self.dropped,
+            "decode_errors": sum(decoder.errors for decoder in self._decoders),
+            "queue_depth": self._queue.qsize(),
+            "batches": self.batches,
+            "last_error": self.error,
+        }
+
+    def start(self):
+        """Start the reader and applier threads; readings replace simulated channels."""
+        self.producer.simulate_channels = False
+        reader = {
+            "udp": self._read_udp,
+            "tcp": self._serve_stream,
+            "unix": self._serve_stream,
+            "file": self._tail_file,
+        }[self.source.scheme]
+        self._spawn(reader, "telemetry-reader")
+        self._spawn(self._apply_loop, "telemetry-applier")
+        return self
+
+    def stop(self):
+        """Stop ingesting and hand the channels back to the simulation."""
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self.producer.simulate_channels = True
+
+    def _spawn(self, target, name, *args):
+        thread = threading.Thread(target=target, args=args, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _decoder(self):
+        decoder = Decoder(self.fmt)
+        self._decoders.append(decoder)
+        return decoder
+
+    def _feed(self, decoder, data, final=False):
+        """Decode and enqueue data; a record that breaks the decoder is counted and skipped."""
+        try:
+            batch = decoder.feed(data, final)
+        except Exception as error:
+            decoder.errors += 1
+            self._record_error(error)
+            return
+        self._enqueue(batch)
+
+    def _record_error(self, error):
+        self.error = f"{type(error).__name__}: {error}"
+
+    def _enqueue(self, batch):
+        if batch is None or len(batch[0]) == 0:
+            return
+        count = len(batch[0])
+        self.received += count
+        if self.block_when_full:
+            while not self._stop.is_set():
+                try:
+                    self._queue.put(batch, timeout=0.5)
+                    return
+                except queue.Full:
+                    continue
+            return
+        try:
+            self._queue.put_nowait(batch)
+        except queue.Full:
+            self.dropped += count
+
+    def _read_udp(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+        sock.bind((self.source.hostname or "0.0.0.0", self.source.port))
+        sock.settimeout(0.5)
+        decoder = self._decoder()
+        with sock:
+            while not self._stop.is_set():
+                try:
+                    data = sock.recv(65535)
+                except socket.timeout:
+                    continue
+                except OSError as error:
+                    # e.g. ICMP errors reported on the socket; keep listening
+                    self._record_error(error)
+                    continue
+                # Every datagram holds whole records
+                self._feed(decoder, data, final=True)
+
+    def _serve_stream(self):
+        if self.source.scheme == "unix":
+            if os.path.exists(self.source.path):
+                os.unlink(self.source.path)
+            server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            server.bind(self.source.path)
+        else:
+            server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            server.bind((self.source.hostname or "0.0.0.0", self.source.port))
+        server.listen()
+        server.settimeout(0.5)
+        with server:
+            while not self._stop.is_set():
+                try:
+                    connection, _ = server.accept()
+                except socket.timeout:
+                    continue
+                self._spawn(self._read_stream, "telemetry-connection", connection)
+
+    def _read_stream(self, connection):
+        decoder = self._decoder()
+        connection.settimeout(0.5)
+        with connection:
+            while not self._stop.is_set():
+                try:
+                    data = connection.recv(256 * 1024)
+                except socket.timeout:
+                    continue
+                except OSError as error:
+                    # The connection is gone; the server keeps accepting new ones
+                    self._record_error(error)
+                    return
+                if not data:
+                    return
+                self._feed(decoder, data)
+
+    def _tail_file(self):
+        decoder = self._decoder()
+        path = self.source.path
+        f = self._open_when_present(path)
+        if f is None:
+            return
+        f.seek(0, os.SEEK_END)
+        try:
+            while not self._stop.is_set():
+                data = f.read(256 * 1024)
+                if data:
+                    self._feed(decoder, data)
+                    continue
+                try:
+                    current = os.stat(path)
+                except OSError:
+                    # Moved away while rotating; the new file is not there yet
+                    time.sleep(0.1)
+                    continue
+                if current.st_ino != os.fstat(f.fileno()).st_ino:
+                    # Renamed and recreated: finish the old file, then follow the new one from its start
+                    for data in iter(lambda: f.read(256 * 1024), b""):
+                        self._feed(decoder, data)
+                    self._feed(decoder, b"", final=True)
+                    f.close()
+                    f = self._open_when_present(path)
+                    if f is None:
+                        return
+                    continue
+                if current.st_size < f.tell():
+                    # Truncated in place
+                    self._feed(decoder, b"", final=True)
+                    f.seek(0)
+                time.sleep(0.1)
+        finally:
+            if f is not None:
+                f.close()
+
+    def _open_when_present(self, path):
+        """Open path for reading once it exists; None if stopped first."""
+        while True:
+            try:
+                return open(path, "rb")
+            except FileNotFoundError:
+                if self._stop.wait(0.1):
+                    return None
+
+    def _apply_loop(self):
+        while not self._stop.wait(self.apply_interval):
+            batches = []
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batches:
+                self.apply(batches)
+
+    def apply(self, batches):
+        """Publish the latest value of every channel seen in the batches."""
+        timestamps = np.concatenate([batch[0] for batch in batches])
+        channels = np.concatenate([batch[1] for batch in batches])
+        values = np.concatenate([batch[2] for batch in batches])
+        # Records arrive in order, so the last occurrence of a channel is its latest value
+        seen, first_from_end = np.unique(channels[::-1], return_index=True)
+        latest = len(channels) - 1 - first_from_end
+        readings = {TELEMETRY_CHANNELS[channel]: float(values[i]) for channel, i in zip(seen, latest)}
+        # Every reading, grouped by channel in arrival order, for anomaly scoring
+        order = np.argsort(channels, kind="stable")
+        bounds = np.searchsorted(channels[order], seen, side="right")
+        samples = {TELEMETRY_CHANNELS[channel]: group
+                   for channel, group in zip(seen, np.split(values[order], bounds[:-1]))}
+        self.producer.ingest(float(timestamps.max()), readings, samples)
+        self.applied += len(channels)
+        self.batches += 1
+
+
+def encode(timestamps, values, fmt):
+    """Encode a (ticks, channels) block of readings in the given wire format."""
+    if fmt == "binary":
+        ticks, channels = values.shape
+        records = np.empty(ticks * channels, dtype=RECORD_DTYPE)
+        records["timestamp"] = np.repeat(timestamps, channels)
+        records["channel"] = np.tile(np.arange(channels), ticks)
+        records["value"] = values.ravel()
+        return records.tobytes()
+    lines = [json.dumps({"timestamp": timestamp, **dict(zip(TELEMETRY_CHANNELS, row))})
+             for timestamp, row in zip(timestamps.tolist(), np.round(values, 4).tolist())]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def simulate(target, fmt="binary", rate=50000, duration=None, seed=None):
+    """Send simulated readings to a telemetry source at about `rate` records per second."""
+    target = urlsplit(target)
+    engine = SimulationEngine(tick_seconds=1, seed=seed)
+    channels = len(TELEMETRY_CHANNELS)
+    # JSON records carry every channel of a tick; binary records carry one
+    per_tick = 1 if fmt == "json" else channels
+    # About 100 sends per second, each kept under the UDP datagram limit
+    tick_bytes = channels * RECORD_DTYPE.itemsize if fmt == "binary" else 512
+    ticks_per_send = max(1, min(rate // (100 * per_tick), 60000 // tick_bytes))
+
+    if target.scheme == "file":
+        sink = open(target.path, "ab")
+        send = sink.write
+    elif target.scheme == "udp":
+        sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        address = (target.hostname, target.port)
+        send = lambda data: sink.sendto(data, address)
+    else:
+        family = socket.AF_UNIX if target.scheme == "unix" else socket.AF_INET
+        sink = socket.socket(family, socket.SOCK_STREAM)
+        sink.connect(target.path if target.scheme == "unix" else (target.hostname, target.port))
+        send = sink.sendall
+
+    sent = 0
+    start = time.perf_counter()
+    with sink:
+        while duration is None or time.perf_counter() - start < duration:
+            values = engine.step(ticks_per_send)[:, 0]
+            timestamps = time.time() + np.arange(ticks_per_send) * 1e-6
+            send(encode(timestamps, values, fmt))
+            if target.scheme == "file":
+                sink.flush()
+            sent += ticks_per_send * per_tick
+            # Sleep off any lead over the target rate
+            lead = sent / rate - (time.perf_counter() - start)
+            if lead > 0:
+                time.sleep(lead)
+    elapsed = time.perf_counter() - start
+    return sent, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Habitat telemetry tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+    simulator = commands.add_parser("simulate", help="emit simulated readings to a telemetry source")
+    simulator.add_argument("target", help="e.g. udp://127.0.0.1:9999 or file:///tmp/telemetry.ndjson")
+    simulator.add_argument("--format", choices=FORMATS, default="binary")
+    simulator.add_argument("--rate", type=int, default=50000, help="records per second")
+    simulator.add_argument("--duration", type=float, help="seconds to run (default: forever)")
+    simulator.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    sent, elapsed = simulate(args.target, args.format, args.rate, args.duration, args.seed)
+    print(f"Sent {sent} records in {elapsed:.1f}s ({sent / elapsed:.0f} records/s)")
+
+
+if __name__ == "__main__":
+    main()
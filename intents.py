@@ -0,0 +1,185 @@
+"""Compiled intent matching for assistant commands.
+
+Command patterns are written as token sequences:
+
+    "(switch|go) [to] [the] {module} [module|page]"
+
+where (a|b) picks one alternative, [a] or [a|b] is optional, and {slot} is
+filled from that slot's vocabulary. Every pattern of every intent is expanded
+and compiled once into a single token trie, so matching a transcript walks the
+trie from each token and its cost depends on the transcript, not on how many
+intents are registered.
+"""
+import itertools
+import re
+from collections import namedtuple
+
+IntentMatch = namedtuple("IntentMatch", ["intent", "slots", "phrase"])
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_ELEMENT = re.compile(r"\(([^)]*)\)|\[([^\]]*)\]|\{(\w+)\}|(\S+)")
+
+
+def tokenize(text):
+    """Lowercase text and split it into alphanumeric tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+def expand_pattern(pattern):
+    """Return every token sequence a pattern accepts; slots stay as "{name}"."""
+    choices = []
+    for group, optional, slot, word in _ELEMENT.findall(pattern):
+        if slot:
+            choices.append([["{%s}" % slot]])
+        elif word:
+            choices.append([tokenize(word)])
+        else:
+            alternatives = [tokenize(alternative) for alternative in (group or optional).split("|")]
+            choices.append(alternatives + [[]] if optional else alternatives)
+    return [[token for part in combination for token in part] for combination in itertools.product(*choices)]
+
+
+class _Node:
+    __slots__ = ("words", "slots", "value")
+
+    def __init__(self):
+        self.words = {}
+        self.slots = {}
+        # Intent (or slot value) completed at this node, as (priority, name)
+        self.value = None
+
+
+class IntentEngine:
+    """Matches transcripts against every registered intent in one pass.
+
+    `intents` maps intent names to lists of patterns; earlier intents win ties.
+    `slots` maps slot names to {phrase: value} vocabularies. The longest
+    match anywhere in the transcript wins, so "activate emergency" beats
+    "emergency" and surrounding filler words are ignored.
+    """
+
+    def __init__(self, intents, slots):
+        self.slots = {}
+        for name, vocabulary in slots.items():
+            root = _Node()
+            for phrase, value in vocabulary.items():
+                node = root
+                for token in tokenize(phrase):
+                    node = node.words.setdefault(token, _Node())
+                node.value = value
+            self.slots[name] = root
+
+        self.root = _Node()
+        self.patterns = 0
+        for priority, (intent, patterns) in enumerate(intents.items()):
+            for pattern in patterns:
+                for sequence in expand_pattern(pattern):
+                    self._insert(sequence, (priority, intent), pattern)
+
+    def _insert(self, sequence, value, pattern):
+        node = self.root
+        for token in sequence:
+            if token.startswith("{"):
+                slot = token[1:-1]
+                if slot not in self.slots:
+                    raise ValueError(f"Pattern {pattern!r} uses unknown slot {slot!r}")
+                node = node.slots.setdefault(slot, _Node())
+            else:
+                node = node.words.setdefault(token, _Node())
+        if node.value is None or value[0] < node.value[0]:
+            node.value = value
+        self.patterns += 1
+
+    def _slot_values(self, slot, tokens, position):
+        """Yield (value, next position) for every vocabulary phrase starting at position."""
+        node = self.slots[slot]
+        while position < len(tokens):
+            node = node.words.get(tokens[position])
+            if node is None:
+                return
+            position += 1
+            if node.value is not None:
+                yield node.value, position
+
+    def _walk(self, node, tokens, position, slots, start, best):
+        if node.value is not None:
+            # Longer matches win, then higher-priority intents, then earlier ones
+            rank = (position - start, -node.value[0], -start)
+            if best[0] is None or rank > best[0]:
+                best[0] = rank
+                best[1] = (node.value[1], dict(slots), start, position)
+        if position < len(tokens):
+            child = node.words.get(tokens[position])
+            if child is not None:
+                self._walk(child, tokens, position + 1, slots, start, best)
+        for slot, child in node.slots.items():
+            for value, end in self._slot_values(slot, tokens, position):
+                slots[slot] = value
+                self._walk(child, tokens, end, slots, start, best)
+                del slots[slot]
+
+    def match(self, text):
+        """Return the best IntentMatch for a transcript, or None."""
+        tokens = tokenize(text)
+        best = [None, None]
+        for start in range(len(tokens)):
+            self._walk(self.root, tokens, start, {}, start, best)
+        if best[1] is None:
+            return None
+        intent, slots, start, end = best[1]
+        return IntentMatch(intent, slots, " ".join(tokens[start:end]))
+
+    def match_batch(self, texts):
+        """Return match() for each transcript, calling it once per distinct transcript.
+
+        This only deduplicates; each distinct transcript is still walked
+        through the trie on its own.
+        """
+        seen = {}
+        return [seen[text] if text in seen else seen.setdefault(text, self.match(text)) for text in texts]
+
+
+# Navigable modules, keyed by how they are spoken
+MODULE_VOCABULARY = {
+    "dashboard": "Dashboard", "home": "Dashboard", "overview": "Dashboard",
+    "3d view": "3D View", "3d": "3D View", "three d view": "3D View", "habitat model": "3D View",
+    "crew": "Crew", "personnel": "Crew",
+    "resources": "Resources", "resource": "Resources", "supplies": "Resources",
+    "environmental": "Environmental", "environment": "Environmental", "life support": "Environmental",
+    "power": "Power", "energy": "Power",
+    "maintenance": "Maintenance", "repairs": "Maintenance",
+    "quantum": "Quantum", "predictions": "Quantum",
+    "emergency": "Emergency",
+    "ar": "AR", "augmented reality": "AR",
+}
+
+HABITAT_SLOTS = {
+    "module": MODULE_VOCABULARY,
+    "state": {
+        "on": True, "activate": True, "enable": True, "start": True, "engage": True, "trigger": True,
+        "off": False, "deactivate": False, "disable": False, "stop": False, "cancel": False, "end": False,
+    },
+    "theme": {"dark": "dark", "night": "dark", "light": "light", "day": "light"},
+}
+
+HABITAT_INTENTS = {
+    "emergency": [
+        "{state} [the] emergency [mode|protocols|protocol]",
+        "turn {state} [the] emergency [mode|protocols|protocol]",
+        "turn [the] emergency [mode|protocols|protocol] {state}",
+        "emergency [mode|protocols|protocol] {state}",
+    ],
+    "theme": [
+        "[switch|change] [to] {theme} (mode|theme)",
+        "(use|enable) [the] {theme} (mode|theme)",
+    ],
+    "navigate": [
+        "(switch|go|navigate|jump) to [the] {module} [module|page|view|screen]",
+        "(open|show|display) [me] [the] {module} [module|page|view|screen]",
+        "take me to [the] {module} [module|page|view|screen]",
+    ],
+    "status": [
+        "status", "report", "status report", "system status", "systems status",
+        "how are [the] systems [doing]", "(give|read) me [a] [status] report",
+    ],
+}
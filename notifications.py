@@ -0,0 +1,153 @@
+"""Bounded, indexed notification store."""
+import datetime
+import time
+import uuid
+from collections import deque
+
+SEVERITIES = ("info", "warning", "critical")
+
+
+class NotificationStore:
+    """Ring buffer of notifications with per-severity indexes and unread counters.
+
+    Notifications are numbered with an increasing sequence number and kept in
+    slot seq % capacity, so adding and evicting are O(1). A message repeated
+    with the same severity inside the coalescing window moves the stored
+    notification back to the top with a new sequence number, updated count
+    and time. Its old slot is emptied and its old sequence number is left in
+    the indexes as a tombstone, so coalescing is O(1) too. Reads are newest
+    first and touch the requested page plus any tombstones they pass;
+    tombstones are dropped once they age out of the ring. mark_all_read()
+    moves a watermark instead of visiting every notification.
+    """
+
+    def __init__(self, capacity=1000, coalesce_seconds=60):
+        self.capacity = capacity
+        self.coalesce_seconds = coalesce_seconds
+        self._slots = [None] * capacity
+        self._next_seq = 0
+        # Sequence numbers oldest first, overall and per severity, including tombstones
+        self._order = deque()
+        self._by_severity = {severity: deque() for severity in SEVERITIES}
+        self._counts = dict.fromkeys(SEVERITIES, 0)
+        self._unread = dict.fromkeys(SEVERITIES, 0)
+        # Notifications numbered below this were all read by mark_all_read()
+        self._read_before = 0
+        self._seq_by_id = {}
+        self._seq_by_message = {}
+
+    def __len__(self):
+        return sum(self._counts.values())
+
+    def _get(self, seq):
+        if seq < max(0, self._next_seq - self.capacity) or seq >= self._next_seq:
+            return None
+        notification = self._slots[seq % self.capacity]
+        # The slot is empty if its notification moved to a newer sequence number
+        return notification if notification is not None and notification["seq"] == seq else None
+
+    def _is_read(self, notification):
+        if not notification["read"] and notification["seq"] < self._read_before:
+            notification["read"] = True
+        return notification["read"]
+
+    def _remove(self, notification):
+        """Empty the notification's slot; its index entries become tombstones."""
+        seq = notification["seq"]
+        severity = notification["severity"]
+        self._slots[seq % self.capacity] = None
+        self._counts[severity] -= 1
+        if not self._is_read(notification):
+            self._unread[severity] -= 1
+        del self._seq_by_id[notification["id"]]
+        key = (notification["message"], severity)
+        if self._seq_by_message.get(key) == seq:
+            del self._seq_by_message[key]
+
+    def _insert(self, notification):
+        seq = self._next_seq
+        evicted = self._slots[seq % self.capacity]
+        if evicted is not None:
+            self._remove(evicted)
+        notification["seq"] = seq
+        self._slots[seq % self.capacity] = notification
+        self._next_seq += 1
+        oldest = self._next_seq - self.capacity
+        for index in (self._order, *self._by_severity.values()):
+            while index and index[0] < oldest:
+                index.popleft()
+        self._order.append(seq)
+        self._by_severity[notification["severity"]].append(seq)
+        self._counts[notification["severity"]] += 1
+        if not notification["read"]:
+            self._unread[notification["severity"]] += 1
+        self._seq_by_id[notification["id"]] = seq
+        self._seq_by_message[(notification["message"], notification["severity"])] = seq
+
+    def add(self, message, severity="info", timestamp=None):
+        """Add a notification, coalescing recent duplicates, and return it."""
+        if severity not in self._by_severity:
+            severity = "info"
+        timestamp = time.time() if timestamp is None else timestamp
+        time_text = datetime.datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M:%S")
+
+        previous = self._get(self._seq_by_message.get((message, severity), -1))
+        if previous is not None and timestamp - previous["timestamp"] <= self.coalesce_seconds:
+            self._remove(previous)
+            previous["count"] += 1
+            previous["timestamp"] = timestamp
+            previous["time"] = time_text
+            previous["read"] = False
+            self._insert(previous)
+            return previous
+
+        notification = {
+            "id": str(uuid.uuid4()),
+            "seq": None,
+            "timestamp": timestamp,
+            "time": time_text,
+            "message": message,
+            "severity": severity,
+            "read": False,
+            "count": 1
+        }
+        self._insert(notification)
+        return notification
+
+    def page(self, offset=0, limit=5, severity=None):
+        """Return up to `limit` notifications, newest first, skipping `offset`."""
+        index = self._order if severity is None else self._by_severity[severity]
+        result = []
+        skipped = 0
+        for position in range(len(index) - 1, -1, -1):
+            notification = self._get(index[position])
+            if notification is None:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            self._is_read(notification)
+            result.append(notification)
+            if len(result) == limit:
+                break
+        return result
+
+    def count(self, severity=None):
+        """Return the number of stored notifications, optionally for one severity."""
+        return len(self) if severity is None else self._counts[severity]
+
+    def unread_count(self, severity=None):
+        """Return the number of unread notifications, optionally for one severity."""
+        return sum(self._unread.values()) if severity is None else self._unread[severity]
+
+    def mark_read(self, notification_id):
+        """Mark one notification as read."""
+        notification = self._get(self._seq_by_id.get(notification_id, -1))
+        if notification is not None and not self._is_read(notification):
+            notification["read"] = True
+            self._unread[notification["severity"]] -= 1
+
+    def mark_all_read(self):
+        """Mark every stored notification as read."""
+        self._read_before = self._next_seq
+        self._unread = dict.fromkeys(SEVERITIES, 0)
@@ -0,0 +1,124 @@
+"""Opt-in per-rerun profiling of render and simulation functions."""
+import functools
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+import numpy as np
+
+_local = threading.local()
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+
+
+def activate(profiler):
+    """Make profiler the one @profiled functions report to on this thread."""
+    _local.profiler = profiler
+    _local.stack = []
+
+
+def ensure_active(profiler):
+    """Activate profiler on this thread unless it already is, e.g. in a fragment rerun."""
+    if getattr(_local, "profiler", None) is not profiler:
+        activate(profiler)
+
+
+def profiled(func):
+    """Record wall time, CPU time and allocations of func when profiling is on."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profiler = getattr(_local, "profiler", None)
+        if profiler is None or not profiler.enabled:
+            return func(*args, **kwargs)
+        with profiler.measure(func.__name__):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class Profiler:
+    """Keeps the most recent timing samples and summarizes them per function.
+
+    CPU time is per thread, which matches Streamlit running each session's
+    script in its own thread. Allocation is the peak traced memory above the
+    level at entry, so it includes temporaries that were freed again. The
+    traced memory is process-wide: alloc_kb also counts whatever other
+    sessions and background threads (the shared telemetry producer, say)
+    allocated meanwhile, and a shared resource is charged to the session
+    that happened to build it. Read it as exact only with one active session.
+    """
+
+    def __init__(self, max_samples=5000):
+        self.enabled = False
+        self.rerun = 0
+        self.samples = deque(maxlen=max_samples)
+
+    def enable(self, enabled=True):
+        """Turn profiling on or off, tracing allocations only while any profiler is on."""
+        global _tracing_users
+        if enabled == self.enabled:
+            return
+        with _tracing_lock:
+            _tracing_users += 1 if enabled else -1
+            if enabled and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            elif not enabled and _tracing_users == 0:
+                tracemalloc.stop()
+        self.enabled = enabled
+
+    def start_rerun(self):
+        """Begin a new rerun and activate this profiler on the current thread."""
+        self.rerun += 1
+        activate(self)
+
+    @contextmanager
+    def measure(self, name):
+        """Measure the enclosed block as one call of `name`."""
+        stack = _local.stack
+        tracing = tracemalloc.is_tracing()
+        base = tracemalloc.get_traced_memory()[0] if tracing else 0
+        if tracing:
+            tracemalloc.reset_peak()
+        frame = {"peak": 0}
+        stack.append(frame)
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            cpu = time.thread_time() - cpu
+            wall = time.perf_counter() - wall
+            stack.pop()
+            peak = max(tracemalloc.get_traced_memory()[1], frame["peak"]) if tracing else 0
+            # Nested measurements reset the peak, so hand ours up to the caller
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            self.samples.append({
+                "rerun": self.rerun,
+                "function": name,
+                "timestamp": time.time(),
+                "wall_ms": wall * 1000,
+                "cpu_ms": cpu * 1000,
+                "alloc_kb": max(peak - base, 0) / 1024,
+            })
+
+    def summary(self):
+        """Return p50/p95/max of wall time, CPU time and allocations per function."""
+        by_function = {}
+        for sample in self.samples:
+            by_function.setdefault(sample["function"], []).append(sample)
+        rows = []
+        for name, samples in sorted(by_function.items()):
+            row = {"function": name, "calls": len(samples)}
+            for metric in ("wall_ms", "cpu_ms", "alloc_kb"):
+                values = np.array([sample[metric] for sample in samples])
+                p50, p95 = np.percentile(values, [50, 95])
+                row.update({f"{metric} p50": p50, f"{metric} p95": p95, f"{metric} max": values.max()})
+            rows.append(row)
+        return rows
+
+    def to_json(self):
+        """Serialize the raw samples to JSON."""
+        return json.dumps(list(self.samples), indent=2)
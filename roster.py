@@ -0,0 +1,77 @@
+"""Columnar crew roster with status and location indexes."""
+import numpy as np
+
+from tasks import LOCATIONS, ROLE_SKILLS
+
+CREW_STATUSES = ("On Duty", "Off Duty")
+
+
+def _group_index(codes, count):
+    """Return, per code, the sorted row numbers holding it (a CSR-style index)."""
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(count + 1))
+    return [order[bounds[code]:bounds[code + 1]] for code in range(count)]
+
+
+class CrewRoster:
+    """Crew members as parallel NumPy columns.
+
+    Status and location are stored as small integer codes, each with an index
+    of the rows holding every value, so filters intersect precomputed row
+    lists and a page of cards only materializes the rows it shows.
+    """
+
+    def __init__(self, members):
+        self.ids = np.array([member["id"] for member in members], dtype=np.int64)
+        self.names = np.array([member["name"] for member in members], dtype=object)
+        self.roles = np.array([member["role"] for member in members], dtype=object)
+        self.health = np.array([member["health"] for member in members], dtype=np.float32)
+        statuses = [member["status"] for member in members]
+        self.statuses = tuple(dict.fromkeys(CREW_STATUSES + tuple(statuses)))
+        self.locations = tuple(sorted({member["location"] for member in members}))
+        self.status_codes = np.array([self.statuses.index(status) for status in statuses], dtype=np.int8)
+        location_lookup = {location: code for code, location in enumerate(self.locations)}
+        self.location_codes = np.array([location_lookup[member["location"]] for member in members], dtype=np.int32)
+        self._by_status = _group_index(self.status_codes, len(self.statuses))
+        self._by_location = _group_index(self.location_codes, len(self.locations))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def status_counts(self):
+        """Return {status: number of crew members}."""
+        return dict(zip(self.statuses, np.bincount(self.status_codes, minlength=len(self.statuses)).tolist()))
+
+    def filter(self, status=None, location=None):
+        """Return the row numbers, in roster order, matching a status and/or location."""
+        rows = np.arange(len(self))
+        if status is not None:
+            rows = self._by_status[self.statuses.index(status)] if status in self.statuses else rows[:0]
+        if location is not None:
+            matches = self._by_location[self.locations.index(location)] if location in self.locations else rows[:0]
+            rows = matches if status is None else np.intersect1d(rows, matches, assume_unique=True)
+        return rows
+
+    def records(self, rows):
+        """Return the given rows as member dicts."""
+        rows = np.asarray(rows, dtype=np.int64)
+        return [
+            {"id": member_id, "name": name, "role": role, "status": self.statuses[status],
+             "location": self.locations[location], "health": health}
+            for member_id, name, role, status, location, health in zip(
+                self.ids[rows].tolist(), self.names[rows].tolist(), self.roles[rows].tolist(),
+                self.status_codes[rows].tolist(), self.location_codes[rows].tolist(),
+                self.health[rows].tolist())
+        ]
+
+
+def synthetic_crew(count, seed=0):
+    """Return `count` random crew member dicts for load testing."""
+    rng = np.random.default_rng(seed)
+    return [
+        {"id": i + 1, "name": f"Crew Member {i + 1:05d}", "role": role, "status": status,
+         "location": location, "health": health}
+        for i, (role, status, location, health) in enumerate(zip(
+            rng.choice(list(ROLE_SKILLS), count).tolist(), rng.choice(CREW_STATUSES, count).tolist(),
+            rng.choice(LOCATIONS, count).tolist(), rng.integers(80, 100, count).tolist()))
+    ]
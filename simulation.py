@@ -0,0 +1,145 @@
+"""Simulated habitat telemetry.
+
+SimulationEngine models every numeric channel as a mean-reverting random walk
+(a discrete Ornstein-Uhlenbeck process) that drifts toward its setpoint, so
+consecutive ticks are correlated. Whole batches of ticks for any number of
+habitats are produced in one vectorized call from a seeded numpy Generator.
+"""
+import time
+
+import numpy as np
+
+from profiler import profiled
+from startup import lazy_import
+
+# Channel name -> (low, high, reversion time constant in seconds). The range is
+# the normal operating band; values are drawn around its midpoint.
+RESOURCE_SPECS = {
+    "Oxygen": (85, 98, 6 * 3600),
+    "Water": (75, 95, 6 * 3600),
+    "Food": (80, 92, 6 * 3600),
+    "Power": (82, 97, 6 * 3600),
+    "Fuel": (70, 90, 6 * 3600),
+}
+ENVIRONMENTAL_SPECS = {
+    "temperature": (20.5, 22.5, 3600),
+    "pressure": (99.5, 101.5, 2 * 3600),
+    "humidity": (40, 60, 3600),
+    "co2_level": (350, 450, 1800),
+    "radiation": (0.05, 0.15, 900),
+    "sound_level": (30, 45, 300),
+}
+POWER_SPECS = {
+    "solar_array": (85, 99, 2700),
+    "main_battery": (70, 95, 4 * 3600),
+    "backup_generators": (98, 100, 12 * 3600),
+    "power_consumption": (60, 85, 1800),
+    "efficiency": (88, 97, 2 * 3600),
+}
+
+# Numeric channels recorded in the telemetry history
+RESOURCE_CHANNELS = list(RESOURCE_SPECS)
+ENVIRONMENTAL_CHANNELS = list(ENVIRONMENTAL_SPECS)
+POWER_CHANNELS = list(POWER_SPECS)
+TELEMETRY_CHANNELS = RESOURCE_CHANNELS + ENVIRONMENTAL_CHANNELS + POWER_CHANNELS
+CHANNEL_SPECS = {**RESOURCE_SPECS, **ENVIRONMENTAL_SPECS, **POWER_SPECS}
+
+
+class SimulationEngine:
+    """Vectorized, seeded simulator for one or more habitats."""
+
+    def __init__(self, habitats=1, tick_seconds=30, seed=None, fault_rate=0.001):
+        self.habitats = habitats
+        self.tick_seconds = tick_seconds
+        self.rng = np.random.default_rng(seed)
+        specs = np.array([CHANNEL_SPECS[name] for name in TELEMETRY_CHANNELS], dtype=np.float64)
+        self.low, self.high, time_constant = specs.T
+        self.setpoint = (self.low + self.high) / 2
+        # Stationary spread keeps ~99.7% of samples inside the operating band
+        self.spread = (self.high - self.low) / 6
+        self.decay = np.exp(-tick_seconds / time_constant)
+        self.innovation = self.spread * np.sqrt(1 - self.decay ** 2)
+        # Chance per tick that an environmental sensor reads far outside its band
+        self.fault_rate = fault_rate * np.isin(TELEMETRY_CHANNELS, ENVIRONMENTAL_CHANNELS)
+        # Unclipped deviation from setpoint, one row per habitat
+        self.state = self.rng.uniform(self.low, self.high, (habitats, len(TELEMETRY_CHANNELS))) - self.setpoint
+
+    @profiled
+    def step(self, ticks=1):
+        """Advance the simulation and return values shaped (ticks, habitats, channels)."""
+        signal = lazy_import("scipy.signal")
+        channels = len(TELEMETRY_CHANNELS)
+        # Filter along a contiguous time axis, then return time-major
+        noise = self.rng.standard_normal((channels, self.habitats, ticks)) * self.innovation[:, np.newaxis, np.newaxis]
+        deviation = np.empty_like(noise)
+        # x[t] = decay * x[t-1] + noise[t], run as an IIR filter along the time axis
+        for channel, decay in enumerate(self.decay):
+            initial = (decay * self.state[:, channel])[:, np.newaxis]
+            deviation[channel], _ = signal.lfilter([1.0], [1.0, -decay], noise[channel], axis=-1, zi=initial)
+        if ticks:
+            self.state = deviation[:, :, -1].T.copy()
+        values = deviation.transpose(2, 1, 0) + self.setpoint
+        np.clip(values, self.low, self.high, out=values)
+        # Transient faults are added after clipping and do not disturb the state
+        faults = np.nonzero(self.rng.random(values.shape) < self.fault_rate)
+        if len(faults[0]):
+            offset = self.rng.choice([-1.0, 1.0], len(faults[0])) * self.rng.uniform(8, 12, len(faults[0]))
+            values[faults] += offset * self.spread[faults[2]]
+        return values
+
+    @profiled
+    def quantum_predictions(self, now=None):
+        """Generate simulated quantum predictions for space events in the coming week.
+
+        Times are UTC ISO strings, counted from `now` (epoch seconds, default
+        the current time).
+        """
+        intensity = self.rng.uniform([1.5, 2.5, 0.5], [7.5, 5.5, 3.5])
+        probability = self.rng.uniform([0.6, 0.5, 0.7, 0.01], [0.95, 0.85, 0.9, 0.1])
+        duration, object_id = self.rng.integers([1, 10000], [6, 100000])
+        distance, diameter = self.rng.uniform([0.5, 10], [3.5, 100])
+        # Hours ahead of: two solar storms, the radiation event and the asteroid's closest approach
+        offsets = self.rng.uniform([6, 48, 2, 24], [48, 120, 30, 168]) * 3600
+        times = np.datetime64(int(time.time() if now is None else now), "s") + offsets.astype("timedelta64[s]")
+        storm_1, storm_2, radiation, approach = np.datetime_as_string(times).tolist()
+        return {
+            "solar_storms": [
+                {"time": storm_1, "intensity": intensity[0], "probability": probability[0]},
+                {"time": storm_2, "intensity": intensity[1], "probability": probability[1]}
+            ],
+            "cosmic_radiation": [
+                {"time": radiation, "intensity": intensity[2], "duration": f"{duration} hours", "probability": probability[2]}
+            ],
+            "asteroid_threats": [
+                {"object_id": f"NEO-{object_id}", "closest_approach": approach, "distance": f"{distance:.2f} lunar distances", "diameter": f"{diameter:.1f}m", "probability": probability[3]}
+            ]
+        }
+
+
+@profiled
+def generate_crew_data():
+    """Generate simulated crew data."""
+    crew_members = [
+        {"id": 1, "name": "Cmdr. Sarah Chen", "role": "Commander", "status": "On Duty", "location": "Command Center", "health": 97},
+        {"id": 2, "name": "Dr. Michael Rodriguez", "role": "Medical Officer", "status": "On Duty", "location": "Medical Bay", "health": 94},
+        {"id": 3, "name": "Eng. Aisha Kapoor", "role": "Chief Engineer", "status": "On Duty", "location": "Engine Room", "health": 92},
+        {"id": 4, "name": "Dr. James Wilson", "role": "Science Officer", "status": "Off Duty", "location": "Quarters", "health": 98},
+        {"id": 5, "name": "Lt. Yuki Tanaka", "role": "Navigation Specialist", "status": "On Duty", "location": "Bridge", "health": 95},
+        {"id": 6, "name": "Eng. Carlos Mendez", "role": "Systems Engineer", "status": "Off Duty", "location": "Recreation", "health": 91},
+        {"id": 7, "name": "Dr. Elena Petrov", "role": "Botanist", "status": "On Duty", "location": "Hydroponics", "health": 96},
+        {"id": 8, "name": "Tech. Daniel Kim", "role": "Communications", "status": "On Duty", "location": "Comms Center", "health": 93}
+    ]
+    return crew_members
+
+
+@profiled
+def generate_maintenance_tasks():
+    """Generate simulated maintenance tasks."""
+    tasks = [
+        {"id": "T-1001", "description": "Filter replacement in Section A", "priority": "High", "assigned_to": "Eng. Aisha Kapoor", "status": "In Progress", "due": "2025-04-01", "skill": "Engineering", "location": "Engine Room"},
+        {"id": "T-1002", "description": "Calibrate radiation sensors", "priority": "Medium", "assigned_to": "Tech. Daniel Kim", "status": "Pending", "due": "2025-04-02", "skill": "Systems", "location": "Comms Center"},
+        {"id": "T-1003", "description": "Life support system check", "priority": "High", "assigned_to": "Eng. Carlos Mendez", "status": "Completed", "due": "2025-03-30", "skill": "Systems", "location": "Engine Room"},
+        {"id": "T-1004", "description": "Hydroponics nutrient cycle", "priority": "Medium", "assigned_to": "Dr. Elena Petrov", "status": "Pending", "due": "2025-04-03", "skill": "Botany", "location": "Hydroponics"},
+        {"id": "T-1005", "description": "Quantum computer cooling system", "priority": "High", "assigned_to": "Eng. Aisha Kapoor", "status": "Pending", "due": "2025-04-01", "skill": "Engineering", "location": "Bridge"}
+    ]
+    return tasks
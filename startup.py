@@ -0,0 +1,52 @@
+"""Startup instrumentation and timed imports of heavy dependencies.
+
+Streamlit re-executes frontend.py on every rerun, but imported modules stay in
+sys.modules for the life of the server process. Keeping this bookkeeping in its
+own module means the numbers below are recorded once per process, not per rerun.
+
+lazy_import() itself imports immediately. Loading is deferred only because
+callers place the call inside the function that needs the module, so the
+import happens the first time that function runs.
+"""
+import importlib
+import sys
+import time
+
+# Set when the first script run of this server process imports this module,
+# which is after Streamlit itself has started; startup times are relative to it
+PROCESS_START = time.perf_counter()
+
+import_times = {}
+first_render_time = None
+
+
+def lazy_import(name):
+    """Import a module now, recording how long the first import took.
+
+    Later calls return the module from sys.modules. Call it where the module
+    is first needed to defer the import to that point.
+    """
+    if name in import_times:
+        return sys.modules[name]
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    import_times[name] = time.perf_counter() - start
+    return module
+
+
+def mark_first_render():
+    """Record the time from the first script run to the end of the first full render."""
+    global first_render_time
+    if first_render_time is None:
+        first_render_time = time.perf_counter() - PROCESS_START
+    return first_render_time
+
+
+def startup_report():
+    """Return time-to-first-render and per-dependency import times in milliseconds."""
+    imports = sorted(import_times.items(), key=lambda item: item[1], reverse=True)
+    return {
+        "time_to_first_render_ms": None if first_render_time is None else first_render_time * 1000,
+        "total_import_ms": sum(import_times.values()) * 1000,
+        "imports": [{"dependency": name, "import_ms": seconds * 1000} for name, seconds in imports],
+    }
@@ -0,0 +1,249 @@
+"""Indexed maintenance task store and crew assignment scheduler."""
+import bisect
+import datetime
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from startup import lazy_import
+
+PRIORITIES = ("High", "Medium", "Low")
+STATUSES = ("Pending", "In Progress", "Completed")
+INDEXED_FIELDS = ("priority", "status", "assigned_to")
+
+SKILLS = ("Command", "Engineering", "Systems", "Medical", "Science", "Botany", "Communications")
+
+# Crew role -> {skill: proficiency in [0, 1]}; skills not listed are unqualified
+ROLE_SKILLS = {
+    "Commander": {"Command": 1.0, "Systems": 0.5, "Engineering": 0.3},
+    "Medical Officer": {"Medical": 1.0, "Science": 0.5},
+    "Chief Engineer": {"Engineering": 1.0, "Systems": 0.8},
+    "Science Officer": {"Science": 1.0, "Systems": 0.4, "Medical": 0.2},
+    "Navigation Specialist": {"Command": 0.6, "Systems": 0.6, "Communications": 0.5},
+    "Systems Engineer": {"Systems": 1.0, "Engineering": 0.7},
+    "Botanist": {"Botany": 1.0, "Science": 0.6},
+    "Communications": {"Communications": 1.0, "Systems": 0.5},
+}
+
+# Module -> (x, y) position in the habitat, in tens of metres
+LOCATION_POSITIONS = {
+    "Command Center": (0, 0),
+    "Bridge": (0, 1),
+    "Comms Center": (1, 1),
+    "Medical Bay": (2, 0),
+    "Quarters": (3, 0),
+    "Recreation": (3, 1),
+    "Hydroponics": (4, 1),
+    "Engine Room": (5, 0),
+}
+LOCATIONS = list(LOCATION_POSITIONS)
+
+
+class TaskStore:
+    """Maintenance tasks with indexes by priority, status, assignee and due date.
+
+    The field indexes map each value to the set of task ids holding it, and
+    the due-date index is a sorted list of (due, id), so queries touch only
+    matching tasks and updates adjust the indexes in place. `version` grows
+    with every change so derived views such as schedules can be cached.
+    """
+
+    def __init__(self, tasks=(), log=None):
+        self.log = log
+        self.version = 0
+        self._tasks = {}
+        self._indexes = {field: {} for field in INDEXED_FIELDS}
+        self._due = []
+        self._lock = threading.RLock()
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    def get(self, task_id):
+        """Return a copy of a task, or None."""
+        task = self._tasks.get(task_id)
+        return None if task is None else dict(task)
+
+    def add(self, task):
+        """Add a task dict with at least an id; an existing task with that id is replaced."""
+        with self._lock:
+            if task["id"] in self._tasks:
+                self._unindex(self._tasks[task["id"]])
+            task = dict(task)
+            self._tasks[task["id"]] = task
+            self._index(task)
+            self.version += 1
+
+    def update(self, task_id, changes, log=True):
+        """Apply a {field: new value} mapping to a task and record it in the log."""
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is None:
+                raise ValueError(f"Unknown maintenance task {task_id!r}")
+            if "status" in changes and changes["status"] not in STATUSES:
+                raise ValueError(f"Unknown task status {changes['status']!r}")
+            if "id" in changes and changes["id"] != task_id:
+                raise ValueError("A task's id cannot change")
+            self._unindex(task)
+            task.update(changes)
+            self._index(task)
+            self.version += 1
+        if log and self.log is not None:
+            self.log.log_task_change(task_id, changes)
+
+    def replay(self, changes):
+        """Re-apply logged (timestamp, task_id, changes) rows, skipping tasks that no longer exist."""
+        for _, task_id, fields in changes:
+            if task_id in self._tasks:
+                self.update(task_id, fields, log=False)
+
+    def _index(self, task):
+        for field in INDEXED_FIELDS:
+            self._indexes[field].setdefault(task.get(field), set()).add(task["id"])
+        bisect.insort(self._due, (task.get("due", ""), task["id"]))
+
+    def _unindex(self, task):
+        for field in INDEXED_FIELDS:
+            ids = self._indexes[field].get(task.get(field))
+            ids.discard(task["id"])
+            if not ids:
+                del self._indexes[field][task.get(field)]
+        del self._due[bisect.bisect_left(self._due, (task.get("due", ""), task["id"]))]
+
+    def count(self, field, value):
+        """Return how many tasks have field == value, for an indexed field."""
+        return len(self._indexes[field].get(value, ()))
+
+    def query(self, priority=None, status=None, assigned_to=None, due_before=None, limit=None):
+        """Return copies of the matching tasks ordered by due date.
+
+        Each filter is a value or a collection of values; due_before is an
+        exclusive ISO date.
+        """
+        with self._lock:
+            selected = None
+            for field, wanted in (("priority", priority), ("status", status), ("assigned_to", assigned_to)):
+                if wanted is None:
+                    continue
+                values = [wanted] if isinstance(wanted, str) else wanted
+                ids = set().union(*(self._indexes[field].get(value, ()) for value in values))
+                selected = ids if selected is None else selected & ids
+            end = len(self._due) if due_before is None else bisect.bisect_left(self._due, (due_before,))
+            if selected is not None and len(selected) < end:
+                # Sort the (smaller) filtered set instead of walking the due-date index
+                ordered = sorted((self._tasks[task_id].get("due", ""), task_id) for task_id in selected)
+                ordered = ordered[:bisect.bisect_left(ordered, (due_before,))] if due_before is not None else ordered
+            else:
+                ordered = [entry for entry in self._due[:end] if selected is None or entry[1] in selected]
+            return [dict(self._tasks[task_id]) for _, task_id in ordered[:limit]]
+
+
+Assignment = namedtuple("Assignment", ["task_id", "crew", "cost"])
+
+
+def _distances():
+    positions = np.array(list(LOCATION_POSITIONS.values()), dtype=np.float64)
+    distances = np.linalg.norm(positions[:, np.newaxis] - positions[np.newaxis], axis=-1)
+    return distances / distances.max()
+
+
+class MaintenanceScheduler:
+    """Assigns pending tasks to on-duty crew with an optimal assignment solver.
+
+    Each on-duty crew member offers `slots_per_crew` task slots. The cost of
+    giving a task to a slot combines the crew member's lack of the task's
+    skill, the distance between their location and the task's, and a slot
+    penalty, minus a bonus for priority and for being overdue, so with more
+    tasks than slots the urgent ones are chosen. scipy's linear_sum_assignment
+    finds the cheapest matching; pairs where the crew member is unqualified
+    are dropped from the plan. Plans are cached per task store version and
+    crew state.
+    """
+
+    UNQUALIFIED = 100.0
+
+    def __init__(self, slots_per_crew=3, skill_weight=2.0, distance_weight=1.0, slot_penalty=0.2,
+                 priority_bonus=(3.0, 2.0, 1.0), overdue_bonus=1.0):
+        self.slots_per_crew = slots_per_crew
+        self.skill_weight = skill_weight
+        self.distance_weight = distance_weight
+        self.slot_penalty = slot_penalty
+        self.priority_bonus = dict(zip(PRIORITIES, priority_bonus))
+        self.overdue_bonus = overdue_bonus
+        self.plans = 0
+        self._distances = _distances()
+        self._cached = (None, None)
+        self._lock = threading.Lock()
+
+    def cost_matrix(self, tasks, crew, today=None):
+        """Return the (tasks, crew) cost matrix before slots are expanded."""
+        today = today or datetime.date.today().isoformat()
+        # A skill nobody has maps to an extra all-zero column, so no crew member qualifies
+        skills = np.array([SKILLS.index(skill) if skill in SKILLS else len(SKILLS)
+                           for skill in (task.get("skill", "Systems") for task in tasks)], dtype=np.int64)
+        # Unknown locations fall back to the Command Center, as for crew
+        task_locations = np.array([LOCATIONS.index(location) if location in LOCATION_POSITIONS else 0
+                                   for location in (task.get("location", "Command Center") for task in tasks)],
+                                  dtype=np.int64)
+        proficiency = np.zeros((len(crew), len(SKILLS) + 1))
+        for row, member in enumerate(crew):
+            for skill, level in ROLE_SKILLS.get(member["role"], {}).items():
+                proficiency[row, SKILLS.index(skill)] = level
+        crew_locations = np.array([LOCATIONS.index(member["location"]) if member["location"] in LOCATION_POSITIONS else 0
+                                   for member in crew], dtype=np.int64)
+        skill_fit = proficiency[:, skills].T
+        cost = np.where(skill_fit > 0, self.skill_weight * (1 - skill_fit), self.UNQUALIFIED)
+        cost += self.distance_weight * self._distances[task_locations][:, crew_locations]
+        bonus = np.array([self.priority_bonus.get(task.get("priority"), 0.0)
+                          + (self.overdue_bonus if task.get("due", "") < today else 0.0) for task in tasks])
+        return cost - bonus[:, np.newaxis]
+
+    def plan(self, store, crew, today=None):
+        """Return Assignments of pending tasks to on-duty crew, cheapest total cost first."""
+        on_duty = [member for member in crew if member["status"] == "On Duty"]
+        crew_key = tuple((member["name"], member["role"], member["location"]) for member in on_duty)
+        key = (id(store), store.version, crew_key, today)
+        with self._lock:
+            if self._cached[0] == key:
+                return self._cached[1]
+        tasks = store.query(status="Pending")
+        if not tasks or not on_duty:
+            plan = []
+        else:
+            optimize = lazy_import("scipy.optimize")
+            cost = self.cost_matrix(tasks, on_duty, today)
+            # One column per (crew member, slot); later slots cost a little more
+            slots = np.repeat(cost, self.slots_per_crew, axis=1) + np.tile(
+                np.arange(self.slots_per_crew) * self.slot_penalty, len(on_duty))
+            rows, columns = optimize.linear_sum_assignment(slots)
+            plan = [Assignment(tasks[row]["id"], on_duty[column // self.slots_per_crew]["name"], float(slots[row, column]))
+                    for row, column in zip(rows, columns) if cost[row, column // self.slots_per_crew] < self.UNQUALIFIED / 2]
+            plan.sort(key=lambda assignment: assignment.cost)
+        with self._lock:
+            self._cached = (key, plan)
+            self.plans += 1
+        return plan
+
+
+def synthetic_tasks(count, seed=0, start=1000):
+    """Return `count` random task dicts for load testing."""
+    rng = np.random.default_rng(seed)
+    base = datetime.date.today()
+    priorities = rng.choice(PRIORITIES, count, p=[0.2, 0.5, 0.3])
+    statuses = rng.choice(STATUSES, count, p=[0.6, 0.2, 0.2])
+    skills = rng.choice(SKILLS, count)
+    locations = rng.choice(LOCATIONS, count)
+    days = rng.integers(-10, 60, count)
+    return [
+        {"id": f"T-{start + i}", "description": f"{skill} work in {location}", "priority": priority,
+         "assigned_to": None, "status": status, "due": (base + datetime.timedelta(days=int(day))).isoformat(),
+         "skill": skill, "location": location}
+        for i, (priority, status, skill, location, day) in enumerate(
+            zip(priorities.tolist(), statuses.tolist(), skills.tolist(), locations.tolist(), days))
+    ]
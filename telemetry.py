@@ -0,0 +1,219 @@
+"""Process-wide telemetry producer shared by every Streamlit session.
+
+One background thread per server process owns the current habitat snapshot and
+regenerates it every refresh interval. Sessions only read the latest snapshot,
+so the cost of a tick does not grow with the number of viewers.
+"""
+import threading
+import time
+from collections import deque, namedtuple
+from types import MappingProxyType
+
+import numpy as np
+
+from anomaly import StreamingAnomalyDetector
+from history import TimeSeriesStore
+from profiler import Profiler, activate, profiled
+from simulation import (
+    CHANNEL_SPECS,
+    ENVIRONMENTAL_CHANNELS,
+    POWER_CHANNELS,
+    RESOURCE_CHANNELS,
+    TELEMETRY_CHANNELS,
+    SimulationEngine,
+    generate_crew_data,
+    generate_maintenance_tasks,
+)
+
+Snapshot = namedtuple("Snapshot", [
+    "version",
+    "timestamp",
+    "resource_levels",
+    "crew_data",
+    "maintenance_tasks",
+    "environmental_data",
+    "power_systems",
+    "quantum_predictions",
+    "system_status",
+])
+
+ENVIRONMENTAL_LABELS = {
+    "temperature": "Temperature",
+    "pressure": "Pressure",
+    "humidity": "Humidity",
+    "co2_level": "CO₂ level",
+    "radiation": "Radiation",
+    "sound_level": "Sound level",
+}
+
+
+def freeze(value):
+    """Return a read-only copy of nested dicts and lists."""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def channel_groups(readings):
+    """Split {channel: value} readings into resource, environmental and power dicts."""
+    return dict(
+        resource_levels={name: readings[name] for name in RESOURCE_CHANNELS},
+        environmental_data={name: readings[name] for name in ENVIRONMENTAL_CHANNELS},
+        power_systems={name: readings[name] for name in POWER_CHANNELS},
+    )
+
+
+def anomaly_message(anomaly):
+    """Describe a detector event as notification text."""
+    label = ENVIRONMENTAL_LABELS.get(anomaly.channel, anomaly.channel)
+    if anomaly.severity == "info":
+        return f"{label} back within normal range"
+    return f"{label} reading {anomaly.value:.2f} is {abs(anomaly.zscore):.1f}σ from its recent mean"
+
+
+class TelemetryProducer:
+    """Owns the shared habitat snapshot and refreshes it on a fixed interval."""
+
+    def __init__(self, refresh_interval, history_days=30, backfill_days=0, seed=None, notification_backlog=100,
+                 log=None):
+        self.refresh_interval = refresh_interval
+        self.history_days = history_days
+        # Optional TelemetryLog that persists samples and notifications across restarts
+        self.log = log
+        self.profiler = Profiler()
+        # Cleared when real sensor readings are ingested instead
+        self.simulate_channels = True
+        self.engine = SimulationEngine(tick_seconds=refresh_interval, seed=seed)
+        self.history = TimeSeriesStore(TELEMETRY_CHANNELS, int(history_days * 86400 / refresh_interval))
+        # Floor the rolling spread at a tenth of each channel's stationary spread
+        low, high, _ = np.array([CHANNEL_SPECS[name] for name in ENVIRONMENTAL_CHANNELS]).T
+        self.detector = StreamingAnomalyDetector(ENVIRONMENTAL_CHANNELS, min_std=(high - low) / 60)
+        self._detector_columns = [self.history.column(name) for name in ENVIRONMENTAL_CHANNELS]
+        self._detector_lock = threading.Lock()
+        restored = self.restore() if log is not None else 0
+        if backfill_days and not restored:
+            self.backfill(backfill_days)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        # (version, message, severity) for the most recent ticks
+        self._notifications = deque(maxlen=notification_backlog)
+        self._snapshot = None
+        self.tick()
+        self._thread = threading.Thread(target=self._run, name="telemetry-producer", daemon=True)
+        self._thread.start()
+
+    @property
+    def snapshot(self):
+        """The latest immutable snapshot."""
+        return self._snapshot
+
+    def publish(self, **fields):
+        """Publish a new snapshot with the given fields replaced."""
+        with self._lock:
+            previous = self._snapshot
+            frozen = {key: freeze(value) for key, value in fields.items()}
+            if previous is None:
+                snapshot = Snapshot(version=1, timestamp=time.time(), **frozen)
+            else:
+                snapshot = previous._replace(version=previous.version + 1, timestamp=time.time(), **frozen)
+            self._snapshot = snapshot
+        return snapshot
+
+    def backfill(self, days):
+        """Simulate `days` of history ending now in one batch."""
+        ticks = int(days * 86400 / self.refresh_interval)
+        values = self.engine.step(ticks)[:, 0]
+        timestamps = time.time() - self.refresh_interval * np.arange(ticks, 0, -1)
+        self._load(timestamps, values)
+        if self.log is not None:
+            self.log.extend(timestamps, values)
+
+    def restore(self):
+        """Reload the last history_days of samples from the log; return how many."""
+        timestamps, values = self.log.window(start=time.time() - self.history_days * 86400)
+        if len(timestamps):
+            self._load(timestamps, values)
+        return len(timestamps)
+
+    def _load(self, timestamps, values):
+        self.history.extend(timestamps, values)
+        # Warm the detector up on past samples; their events are history, not news
+        with self._detector_lock:
+            self.detector.update(values[:, self._detector_columns])
+
+    @profiled
+    def tick(self):
+        """Advance the simulation one step and publish the new readings."""
+        channels = {}
+        anomalies = []
+        if self.simulate_channels:
+            values = self.engine.step()[0, 0]
+            channels = channel_groups(dict(zip(TELEMETRY_CHANNELS, values.tolist())))
+            with self._detector_lock:
+                anomalies = self.detector.update(values[self._detector_columns])
+                channels["system_status"] = self.detector.status
+        snapshot = self.publish(
+            crew_data=generate_crew_data(),
+            maintenance_tasks=generate_maintenance_tasks(),
+            quantum_predictions=self.engine.quantum_predictions(),
+            **channels,
+        )
+        if self.simulate_channels:
+            self.history.extend([snapshot.timestamp], values[np.newaxis])
+            if self.log is not None:
+                self.log.extend([snapshot.timestamp], values[np.newaxis])
+        self._notify(snapshot, anomalies)
+        return snapshot
+
+    def ingest(self, timestamp, readings, samples=None):
+        """Merge measured {channel: value} readings into the snapshot and history.
+
+        `samples` optionally maps channels to every reading received since the
+        last call; the anomaly detector scores those instead of only the latest.
+        """
+        snapshot = self._snapshot
+        merged = {**snapshot.resource_levels, **snapshot.environmental_data, **snapshot.power_systems, **readings}
+        samples = samples or {name: [value] for name, value in readings.items()}
+        anomalies = []
+        with self._detector_lock:
+            for name in ENVIRONMENTAL_CHANNELS:
+                if name in samples:
+                    anomalies.extend(self.detector.update_channel(name, samples[name]))
+            status = self.detector.status
+        snapshot = self.publish(system_status=status, **channel_groups(merged))
+        # History timestamps must increase even if sensor clocks disagree
+        last = self.history.last_timestamp()
+        timestamp = timestamp if last is None else max(timestamp, last)
+        self.history.append(timestamp, merged)
+        if self.log is not None:
+            self.log.append(timestamp, merged)
+        self._notify(snapshot, anomalies)
+        return snapshot
+
+    def _notify(self, snapshot, anomalies):
+        if not anomalies:
+            return
+        with self._lock:
+            for anomaly in anomalies:
+                message = anomaly_message(anomaly)
+                self._notifications.append((snapshot.version, message, anomaly.severity))
+                if self.log is not None:
+                    self.log.log_notification(message, anomaly.severity, snapshot.timestamp)
+
+    def notifications_since(self, version):
+        """Return (message, severity) pairs published after the given version."""
+        with self._lock:
+            return [(message, severity) for v, message, severity in self._notifications if v > version]
+
+    def stop(self):
+        """Stop the background thread."""
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        activate(self.profiler)
+        while not self._stop.wait(self.refresh_interval):
+            self.profiler.start_rerun()
+            self.tick()
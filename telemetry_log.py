@@ -0,0 +1,225 @@
+"""Persistent, append-only log of telemetry samples and habitat events.
+
+Samples are appended to one flat binary segment per UTC day,
+telemetry-YYYYMMDD.bin, as fixed-width little-endian records of
+(float64 timestamp, float64 value per channel). Reads memory-map the
+segments, so a 30-day window is sliced straight out of the page cache into
+NumPy arrays without building Python objects per sample. A partial record
+left by a crash is truncated away when the log is reopened.
+
+Notifications and maintenance task changes go to events.sqlite in WAL mode,
+which also records the channel layout the segments were written with.
+
+Writes are buffered and flushed in batches by a writer thread every
+flush_interval seconds, or sooner once max_pending samples are waiting.
+"""
+import datetime
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS notifications (
+    timestamp REAL NOT NULL, message TEXT NOT NULL, severity TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS notifications_timestamp ON notifications (timestamp);
+CREATE TABLE IF NOT EXISTS task_changes (
+    timestamp REAL NOT NULL, task_id TEXT NOT NULL, changes TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS task_changes_task ON task_changes (task_id, timestamp);
+"""
+
+
+def segment_day(timestamp):
+    """Return the UTC day (YYYYMMDD) whose segment holds a timestamp."""
+    return datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).strftime("%Y%m%d")
+
+
+class TelemetryLog:
+    """Append-only on-disk history of telemetry samples, notifications and task changes."""
+
+    def __init__(self, directory, channels, flush_interval=1.0, max_pending=65536, retention_days=None):
+        self.directory = directory
+        self.channels = tuple(channels)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.retention_days = retention_days
+        self.record_dtype = np.dtype([("timestamp", "<f8"), ("values", "<f8", (len(self.channels),))])
+        self.written = 0
+        os.makedirs(directory, exist_ok=True)
+
+        self._db_path = os.path.join(directory, "events.sqlite")
+        self._db = self._connect()
+        with self._db:
+            self._db.executescript(SCHEMA)
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'channels'").fetchone()
+            if row is None:
+                self._db.execute("INSERT INTO meta VALUES ('channels', ?)", (json.dumps(self.channels),))
+            elif tuple(json.loads(row[0])) != self.channels:
+                raise ValueError(f"Telemetry log in {directory} was written with different channels")
+        for path in self._segments():
+            self._truncate_partial(path)
+
+        self._samples = []
+        self._pending_samples = 0
+        self._notifications = []
+        self._task_changes = []
+        # (UTC day, open append handle) of the segment being written
+        self._segment = (None, None)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="telemetry-log", daemon=True)
+        self._thread.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self._db_path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def _segments(self):
+        return sorted(glob.glob(os.path.join(self.directory, "telemetry-*.bin")))
+
+    def _truncate_partial(self, path):
+        size = os.path.getsize(path)
+        if size % self.record_dtype.itemsize:
+            with open(path, "r+b") as f:
+                f.truncate(size - size % self.record_dtype.itemsize)
+
+    def append(self, timestamp, values):
+        """Queue one sample given as a {channel: value} mapping."""
+        row = [values.get(name, np.nan) for name in self.channels]
+        self.extend([timestamp], [row])
+
+    def extend(self, timestamps, rows):
+        """Queue a batch of samples; rows has one column per channel."""
+        records = np.empty(len(timestamps), dtype=self.record_dtype)
+        records["timestamp"] = timestamps
+        records["values"] = rows
+        with self._lock:
+            self._samples.append(records)
+            self._pending_samples += len(records)
+            full = self._pending_samples >= self.max_pending
+        if full:
+            self._wake.set()
+
+    def log_notification(self, message, severity="info", timestamp=None):
+        """Queue a notification."""
+        with self._lock:
+            self._notifications.append((time.time() if timestamp is None else timestamp, message, severity))
+
+    def log_task_change(self, task_id, changes, timestamp=None):
+        """Queue a change to a maintenance task, given as a {field: new value} mapping."""
+        with self._lock:
+            self._task_changes.append((time.time() if timestamp is None else timestamp, task_id, json.dumps(changes)))
+
+    def flush(self):
+        """Write every queued sample and event to disk."""
+        with self._flush_lock:
+            with self._lock:
+                samples, self._samples, self._pending_samples = self._samples, [], 0
+                notifications, self._notifications = self._notifications, []
+                task_changes, self._task_changes = self._task_changes, []
+            if samples:
+                self._write_samples(np.concatenate(samples))
+            if notifications or task_changes:
+                with self._db:
+                    self._db.executemany("INSERT INTO notifications VALUES (?, ?, ?)", notifications)
+                    self._db.executemany("INSERT INTO task_changes VALUES (?, ?, ?)", task_changes)
+
+    def _write_samples(self, records):
+        # Split the batch at UTC day boundaries, one write per segment
+        days = (records["timestamp"] // 86400).astype(np.int64)
+        boundaries = np.flatnonzero(np.diff(days)) + 1
+        for chunk in np.split(records, boundaries):
+            day = segment_day(chunk["timestamp"][0])
+            current, f = self._segment
+            if day != current:
+                if f is not None:
+                    f.close()
+                f = open(os.path.join(self.directory, f"telemetry-{day}.bin"), "ab")
+                self._segment = (day, f)
+                self._expire()
+            f.write(chunk.tobytes())
+            f.flush()
+        self.written += len(records)
+
+    def _expire(self):
+        if self.retention_days is None:
+            return
+        oldest = segment_day(time.time() - self.retention_days * 86400)
+        for path in self._segments():
+            if os.path.basename(path)[len("telemetry-"):-len(".bin")] < oldest:
+                os.remove(path)
+
+    def window(self, start=None, end=None):
+        """Return (times, values) arrays of the flushed samples with start <= time <= end.
+
+        Segments are memory-mapped; a window inside one segment is returned as
+        views of the mapping, a longer one is concatenated into new arrays.
+        """
+        first_day = None if start is None else segment_day(start)
+        last_day = None if end is None else segment_day(end)
+        times, values = [], []
+        for path in self._segments():
+            day = os.path.basename(path)[len("telemetry-"):-len(".bin")]
+            if (first_day is not None and day < first_day) or (last_day is not None and day > last_day):
+                continue
+            count = os.path.getsize(path) // self.record_dtype.itemsize
+            if not count:
+                continue
+            records = np.memmap(path, dtype=self.record_dtype, mode="r", shape=(count,))
+            stamps = records["timestamp"]
+            lo = 0 if start is None else np.searchsorted(stamps, start, side="left")
+            hi = count if end is None else np.searchsorted(stamps, end, side="right")
+            if lo < hi:
+                times.append(stamps[lo:hi])
+                values.append(records["values"][lo:hi])
+        if not times:
+            return np.empty(0), np.empty((0, len(self.channels)))
+        if len(times) == 1:
+            return times[0], values[0]
+        return np.concatenate(times), np.concatenate(values)
+
+    def notifications(self, since=None, limit=100):
+        """Return the most recent (timestamp, message, severity) rows, oldest first."""
+        with self._flush_lock:
+            rows = self._db.execute(
+                "SELECT timestamp, message, severity FROM notifications WHERE timestamp >= ? "
+                "ORDER BY timestamp DESC LIMIT ?", (since or 0, limit)).fetchall()
+        return rows[::-1]
+
+    def task_changes(self, task_id=None):
+        """Return (timestamp, task_id, changes) rows, oldest first."""
+        query = "SELECT timestamp, task_id, changes FROM task_changes"
+        parameters = ()
+        if task_id is not None:
+            query += " WHERE task_id = ?"
+            parameters = (task_id,)
+        with self._flush_lock:
+            rows = self._db.execute(query + " ORDER BY timestamp", parameters).fetchall()
+        return [(timestamp, task, json.loads(changes)) for timestamp, task, changes in rows]
+
+    def close(self):
+        """Flush, stop the writer thread and close files."""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        self.flush()
+        _, f = self._segment
+        if f is not None:
+            f.close()
+        self._segment = (None, None)
+        self._db.close()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
@@ -0,0 +1,46 @@
+import os
+import sys
+import threading
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from history import TimeSeriesStore  # noqa: E402
+
+
+def test_window_is_consistent_while_appending():
+    store = TimeSeriesStore(["a", "b"], capacity=64)
+    stop = threading.Event()
+
+    def produce():
+        timestamp = 0.0
+        while not stop.is_set():
+            timestamps = timestamp + np.arange(7)
+            store.extend(timestamps, np.column_stack([timestamps, -timestamps]))
+            timestamp += 7
+            store.append(timestamp, {"a": timestamp, "b": -timestamp})
+            timestamp += 1
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    try:
+        for _ in range(2000):
+            times, values = store.window()
+            assert np.all(np.diff(times) == 1)
+            assert np.array_equal(values[:, 0], times)
+            assert np.array_equal(values[:, 1], -times)
+            times, series = store.series("b")
+            assert np.array_equal(series, -times)
+    finally:
+        stop.set()
+        producer.join()
+
+
+def test_window_returns_copies():
+    store = TimeSeriesStore(["a"], capacity=4)
+    store.extend([1.0, 2.0], [[1.0], [2.0]])
+    times, values = store.window()
+    store.extend([3.0, 4.0, 5.0, 6.0], [[3.0], [4.0], [5.0], [6.0]])
+    assert times.tolist() == [1.0, 2.0]
+    assert values[:, 0].tolist() == [1.0, 2.0]
@@ -0,0 +1,92 @@
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest import RECORD_DTYPE, Decoder, TelemetryIngestor  # noqa: E402
+
+
+class RecordingProducer:
+    simulate_channels = True
+
+    def __init__(self):
+        self.readings = {}
+
+    def ingest(self, timestamp, readings, samples):
+        self.readings.update(readings)
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def append(path, *records):
+    with open(path, "a") as f:
+        f.write("".join(json.dumps(record) + "\n" for record in records))
+
+
+def test_json_decoder_counts_non_finite_records():
+    decoder = Decoder("json")
+    timestamps, channels, values = decoder.feed(
+        b'{"timestamp": NaN, "Oxygen": 90}\n{"timestamp": 5, "Oxygen": Infinity, "Water": 80}\n')
+    assert timestamps.tolist() == [5.0]
+    assert values.tolist() == [80.0]
+    assert decoder.errors == 2
+
+
+def test_binary_decoder_counts_non_finite_records():
+    records = np.zeros(3, dtype=RECORD_DTYPE)
+    records["timestamp"] = [1.0, np.nan, 3.0]
+    records["value"] = [1.0, 2.0, np.inf]
+    decoder = Decoder("binary")
+    timestamps, _, _ = decoder.feed(records.tobytes())
+    assert timestamps.tolist() == [1.0]
+    assert decoder.errors == 2
+
+
+def test_tail_follows_rename_and_recreate_rotation(tmp_path):
+    path = tmp_path / "telemetry.ndjson"
+    path.touch()
+    producer = RecordingProducer()
+    ingestor = TelemetryIngestor(producer, f"file://{path}", apply_interval=0.05).start()
+    try:
+        time.sleep(0.2)
+        append(path, {"Oxygen": 90.0}, {"Oxygen": 91.0})
+        assert wait_for(lambda: producer.readings.get("Oxygen") == 91.0)
+
+        # logrotate's default: rename the live file, then create a new one
+        append(path, {"Water": 70.0})
+        os.rename(path, tmp_path / "telemetry.ndjson.1")
+        append(path, {"Oxygen": 12.5})
+        assert wait_for(lambda: producer.readings.get("Oxygen") == 12.5)
+        assert producer.readings["Water"] == 70.0
+
+        # The rotated file is not replayed
+        time.sleep(0.5)
+        assert ingestor.received == 4
+    finally:
+        ingestor.stop()
+
+
+def test_tail_restarts_after_truncation(tmp_path):
+    path = tmp_path / "telemetry.ndjson"
+    path.touch()
+    producer = RecordingProducer()
+    ingestor = TelemetryIngestor(producer, f"file://{path}", apply_interval=0.05).start()
+    try:
+        time.sleep(0.2)
+        append(path, {"Oxygen": 90.0}, {"Oxygen": 91.0})
+        assert wait_for(lambda: producer.readings.get("Oxygen") == 91.0)
+        path.write_text("")
+        time.sleep(0.3)
+        append(path, {"Oxygen": 50.0})
+        assert wait_for(lambda: producer.readings.get("Oxygen") == 50.0)
+    finally:
+        ingestor.stop()